@@ -0,0 +1,189 @@
+from flask.cli import AppGroup
+from models import db, FeedbackRequest, Question, Response, TargetQuestionStats, TargetGiverStats
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import click
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+AGREEMENT_VALUES = ('strongly_agree', 'agree', 'disagree', 'strongly_disagree', 'na')
+
+# Counter columns on TargetQuestionStats
+QUESTION_STAT_COLUMNS = ('response_count', 'rating_count', 'rating_sum') + \
+    tuple(f'rating_{value}' for value in RATING_VALUES) + \
+    tuple(f'agreement_{value}' for value in AGREEMENT_VALUES)
+
+def add_answer(totals, rating_value, agreement_value):
+    """Add one submitted answer to a dict of question stat increments."""
+    increments = [('response_count', 1)]
+    if rating_value in RATING_VALUES:
+        increments += [('rating_count', 1), ('rating_sum', rating_value), (f'rating_{rating_value}', 1)]
+    if agreement_value in AGREEMENT_VALUES:
+        increments.append((f'agreement_{agreement_value}', 1))
+    for column, amount in increments:
+        totals[column] = totals.get(column, 0) + amount
+
+def increment_stats(model, keys, increments):
+    """Add increments to the stats row for keys in SQL, creating the row on first use. Caller commits."""
+    values = {getattr(model, column): getattr(model, column) + amount for column, amount in increments.items()}
+    if model.query.filter_by(**keys).update(values, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(model(**keys, **increments))
+    except IntegrityError:
+        # A concurrent submission created the row first
+        model.query.filter_by(**keys).update(values, synchronize_session=False)
+
+def record_submission(feedback_request, responses, new_session):
+    """Fold newly submitted responses into the target's stats. Caller commits.
+
+    new_session is True when these are the request's first submitted
+    responses, so the request counts once as a feedback session.
+    """
+    if not responses:
+        return
+    period = (feedback_request.created_at or datetime.utcnow()).date()
+    by_question = {}
+    for response in responses:
+        add_answer(by_question.setdefault(response.question_id, {}), response.rating_value, response.agreement_value)
+
+    for question_id, totals in by_question.items():
+        increment_stats(TargetQuestionStats, {
+            'target_email': feedback_request.target_email, 'period': period, 'question_id': question_id
+        }, totals)
+    increment_stats(TargetGiverStats, {
+        'target_email': feedback_request.target_email, 'period': period,
+        'giver_email': feedback_request.assigned_to_email
+    }, {'session_count': int(new_session), 'response_count': len(responses)})
+
+def target_stats(target_email, start_date=None, end_date=None):
+    """Totals and per-question distributions for a target from the stats tables.
+
+    start_date and end_date are inclusive dates matched against the day each
+    request was created. Runs two grouped queries regardless of history size.
+    """
+    def period_filters(model):
+        filters = [model.target_email == target_email]
+        if start_date:
+            filters.append(model.period >= start_date)
+        if end_date:
+            filters.append(model.period <= end_date)
+        return filters
+
+    sessions, responses, givers = db.session.query(
+        func.coalesce(func.sum(TargetGiverStats.session_count), 0),
+        func.coalesce(func.sum(TargetGiverStats.response_count), 0),
+        func.count(func.distinct(TargetGiverStats.giver_email))
+    ).filter(*period_filters(TargetGiverStats)).one()
+
+    rows = db.session.query(
+        Question, *[func.sum(getattr(TargetQuestionStats, column)) for column in QUESTION_STAT_COLUMNS]
+    ).join(TargetQuestionStats, TargetQuestionStats.question_id == Question.id)\
+        .filter(*period_filters(TargetQuestionStats))\
+        .group_by(Question.id)\
+        .order_by(Question.template_id, Question.order_index)\
+        .all()
+
+    return {'sessions': sessions, 'responses': responses, 'givers': givers, 'questions': question_summaries(rows)}
+
+def question_summaries(rows):
+    """Per-question distributions from (question, *sums of QUESTION_STAT_COLUMNS) rows."""
+    questions = []
+    for question, *sums in rows:
+        totals = dict(zip(QUESTION_STAT_COLUMNS, sums))
+        questions.append({
+            'question': question,
+            'response_count': totals['response_count'],
+            'rating_count': totals['rating_count'],
+            'rating_mean': totals['rating_sum'] / totals['rating_count'] if totals['rating_count'] else None,
+            'rating_histogram': [totals[f'rating_{value}'] for value in RATING_VALUES],
+            'agreement': {value: totals[f'agreement_{value}'] for value in AGREEMENT_VALUES}
+        })
+    return questions
+
+def scoped_target_stats(target_email, condition, start_date=None, end_date=None):
+    """target_stats over only the target's requests matching condition, computed from the responses.
+
+    The stats tables hold target-wide totals, so viewers who can access just
+    some of a target's requests get their numbers from the submitted
+    responses instead. Runs two grouped queries.
+    """
+    filters = [FeedbackRequest.target_email == target_email, Response.is_draft == False, condition]
+    if start_date:
+        filters.append(FeedbackRequest.created_at >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        filters.append(FeedbackRequest.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+
+    sessions, responses, givers = db.session.query(
+        func.count(func.distinct(FeedbackRequest.id)),
+        func.count(Response.id),
+        func.count(func.distinct(FeedbackRequest.assigned_to_email))
+    ).select_from(FeedbackRequest)\
+        .join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+        .filter(*filters).one()
+
+    def count_where(when, value=1):
+        return func.sum(case((when, value), else_=0))
+
+    rated = Response.rating_value.in_(RATING_VALUES)
+    sums = {
+        'response_count': func.count(Response.id),
+        'rating_count': count_where(rated),
+        'rating_sum': count_where(rated, Response.rating_value),
+        **{f'rating_{value}': count_where(Response.rating_value == value) for value in RATING_VALUES},
+        **{f'agreement_{value}': count_where(Response.agreement_value == value) for value in AGREEMENT_VALUES}
+    }
+    rows = db.session.query(Question, *[sums[column] for column in QUESTION_STAT_COLUMNS])\
+        .join(Response, Response.question_id == Question.id)\
+        .join(FeedbackRequest, Response.feedback_request_id == FeedbackRequest.id)\
+        .filter(*filters)\
+        .group_by(Question.id)\
+        .order_by(Question.template_id, Question.order_index)\
+        .all()
+
+    return {'sessions': sessions, 'responses': responses, 'givers': givers, 'questions': question_summaries(rows)}
+
+def rebuild_target_stats():
+    """Recompute the stats tables from all submitted responses. Returns the number of stat rows."""
+    TargetQuestionStats.query.delete()
+    TargetGiverStats.query.delete()
+
+    rows = db.session.query(
+        FeedbackRequest.id, FeedbackRequest.target_email, FeedbackRequest.assigned_to_email, FeedbackRequest.created_at,
+        Response.question_id, Response.rating_value, Response.agreement_value
+    ).join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+        .filter(Response.is_draft == False)\
+        .all()
+
+    question_totals = {}
+    giver_totals = {}
+    sessions = {}
+    for request_id, target_email, giver_email, created_at, question_id, rating_value, agreement_value in rows:
+        period = (created_at or datetime.utcnow()).date()
+        add_answer(question_totals.setdefault((target_email, period, question_id), {}), rating_value, agreement_value)
+        giver = giver_totals.setdefault((target_email, period, giver_email), {'session_count': 0, 'response_count': 0})
+        giver['response_count'] += 1
+        sessions.setdefault(request_id, giver)
+    for giver in sessions.values():
+        giver['session_count'] += 1
+
+    db.session.bulk_insert_mappings(TargetQuestionStats, [
+        {'target_email': target_email, 'period': period, 'question_id': question_id,
+         **{column: totals.get(column, 0) for column in QUESTION_STAT_COLUMNS}}
+        for (target_email, period, question_id), totals in question_totals.items()
+    ])
+    db.session.bulk_insert_mappings(TargetGiverStats, [
+        {'target_email': target_email, 'period': period, 'giver_email': giver_email, **totals}
+        for (target_email, period, giver_email), totals in giver_totals.items()
+    ])
+    db.session.commit()
+    return len(question_totals) + len(giver_totals)
+
+aggregates_cli = AppGroup('aggregates', help='Manage precomputed aggregate report statistics.')
+
+@aggregates_cli.command('rebuild')
+def rebuild_command():
+    """Recompute aggregate report statistics from submitted responses."""
+    count = rebuild_target_stats()
+    click.echo(f"Rebuilt {count} aggregate rows.")
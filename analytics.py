@@ -0,0 +1,157 @@
+from models import db, FeedbackRequest, Response
+from sqlalchemy import String, case, cast, func
+
+try:
+    import numpy as np
+except ImportError:  # Optional: analytics are unavailable without numpy
+    np = None
+
+AGREEMENT_VALUES = ('strongly_agree', 'agree', 'disagree', 'strongly_disagree', 'na')
+PERCENTILES = (10, 25, 50, 75, 90)
+BUCKETS = ('week', 'month')
+
+def analytics_available():
+    return np is not None
+
+def scoped_answers(query, target_email=None, start=None, end=None, condition=None):
+    """Limit an answer query to submitted answers in scope, on requests matching condition if given."""
+    query = query.join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+        .filter(Response.is_draft == False)
+    if condition is not None:
+        query = query.filter(condition)
+    if target_email:
+        query = query.filter(FeedbackRequest.target_email == target_email)
+    if start:
+        query = query.filter(FeedbackRequest.created_at >= start)
+    if end:
+        query = query.filter(FeedbackRequest.created_at < end)
+    return query
+
+def load_answers(target_email=None, start=None, end=None, condition=None):
+    """Fetch the submitted rating and agreement answers in scope as column arrays in one query.
+
+    Everything is converted in SQL so rows arrive as plain numbers and
+    strings: the request's creation day as YYYY-MM-DD text, and agreement
+    values as their index in AGREEMENT_VALUES (-1 for none). Missing
+    ratings become NaN. start and end are datetimes bounding the request's
+    created_at, end exclusive.
+    """
+    agreement_code = case(
+        {value: code for code, value in enumerate(AGREEMENT_VALUES)},
+        value=Response.agreement_value, else_=-1
+    )
+    day = func.substr(cast(FeedbackRequest.created_at, String), 1, 10)
+    query = db.session.query(day, Response.rating_value, agreement_code)\
+        .filter((Response.rating_value != None) | (Response.agreement_value != None))
+    # Executed on the connection so rows skip ORM result processing
+    rows = db.session.connection().execute(scoped_answers(query, target_email, start, end, condition).statement).fetchall()
+
+    days, ratings, agreements = zip(*rows) if rows else ((), (), ())
+    return {
+        'created': np.array(days, dtype='datetime64[D]'),
+        'ratings': np.array(ratings, dtype=float),
+        'agreements': np.array(agreements, dtype=np.int8)
+    }
+
+def load_target_means(start=None, end=None):
+    """Mean rating of every target with ratings in the period, from one grouped query."""
+    query = db.session.query(FeedbackRequest.target_email, func.avg(Response.rating_value))\
+        .filter(Response.rating_value != None)
+    rows = scoped_answers(query, start=start, end=end).group_by(FeedbackRequest.target_email).all()
+    targets, means = zip(*rows) if rows else ((), ())
+    return np.array(targets, dtype=object), np.array(means, dtype=float)
+
+def rating_stats(ratings):
+    """Count, mean, spread, percentiles and 1-5 histogram of an array of ratings."""
+    ratings = ratings[~np.isnan(ratings)]
+    if not ratings.size:
+        return {'count': 0, 'mean': None, 'std': None, 'percentiles': None, 'histogram': [0] * 5}
+    return {
+        'count': int(ratings.size),
+        'mean': float(ratings.mean()),
+        'std': float(ratings.std()),
+        'percentiles': dict(zip((f'p{p}' for p in PERCENTILES), np.percentile(ratings, PERCENTILES).tolist())),
+        'histogram': np.bincount(ratings.astype(np.int64).clip(0, 5), minlength=6)[1:].tolist()
+    }
+
+def agreement_stats(codes):
+    """Distribution of agreement answers and net agreement, ignoring N/A."""
+    counts = np.bincount(codes[codes >= 0], minlength=len(AGREEMENT_VALUES))
+    answered = counts[:4].sum()
+    return {
+        'count': int(counts.sum()),
+        'distribution': dict(zip(AGREEMENT_VALUES, counts.tolist())),
+        # Share agreeing minus share disagreeing, from -1 to 1
+        'net_agreement': float((counts[0] + counts[1] - counts[2] - counts[3]) / answered) if answered else None
+    }
+
+def bucket_starts(created, bucket):
+    """Start date of the week (Monday) or month containing each date."""
+    if bucket == 'month':
+        return created.astype('datetime64[M]').astype('datetime64[D]')
+    days = created.astype(np.int64)
+    # 1970-01-01 was a Thursday, three days after a Monday
+    return (days - (days + 3) % 7).astype('datetime64[D]')
+
+def trend(created, ratings, codes, bucket):
+    """Per-period answer counts, mean rating and net agreement, oldest first."""
+    if not created.size:
+        return []
+    periods, index = np.unique(bucket_starts(created, bucket), return_inverse=True)
+    rated = ~np.isnan(ratings)
+    rating_counts = np.bincount(index[rated], minlength=periods.size)
+    rating_sums = np.bincount(index[rated], weights=ratings[rated], minlength=periods.size)
+    agreeing = np.bincount(index, weights=(codes == 0) | (codes == 1), minlength=periods.size)
+    disagreeing = np.bincount(index, weights=(codes == 2) | (codes == 3), minlength=periods.size)
+    answered = agreeing + disagreeing
+    counts = np.bincount(index, minlength=periods.size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = rating_sums / rating_counts
+        net = (agreeing - disagreeing) / answered
+    return [
+        {
+            'period': str(period),
+            'count': int(count),
+            'mean_rating': None if np.isnan(mean) else float(mean),
+            'net_agreement': None if np.isnan(n) else float(n)
+        }
+        for period, count, mean, n in zip(periods, counts, means, net)
+    ]
+
+def cohort_comparison(targets, means, target_email):
+    """Compare a target's mean rating with every other target's.
+
+    org_mean_rating averages the per-person means, so people with many
+    answers don't dominate. target_percentile is the share of rated
+    targets with a lower mean.
+    """
+    comparison = {
+        'targets': int(means.size),
+        'org_mean_rating': float(means.mean()) if means.size else None,
+        'target_mean_rating': None,
+        'target_percentile': None
+    }
+    position = np.flatnonzero(targets == target_email)
+    if position.size:
+        target_mean = means[position[0]]
+        comparison['target_mean_rating'] = float(target_mean)
+        comparison['target_percentile'] = float((means < target_mean).mean() * 100)
+    return comparison
+
+def feedback_analytics(target_email=None, start=None, end=None, bucket='month', condition=None):
+    """Rating and agreement analytics for one target, or the whole org when target_email is None.
+
+    condition limits the answers to the requests a viewer can access. The
+    cohort comparison needs every target's answers, so it is left out then.
+    """
+    answers = load_answers(target_email, start, end, condition)
+    result = {
+        'target_email': target_email,
+        'ratings': rating_stats(answers['ratings']),
+        'agreement': agreement_stats(answers['agreements']),
+        'trend': trend(answers['created'], answers['ratings'], answers['agreements'], bucket)
+    }
+    if target_email and condition is None:
+        result['cohort'] = cohort_comparison(*load_target_means(start, end), target_email)
+    return result
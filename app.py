@@ -1,20 +1,75 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, stream_with_context, current_app, abort
 from flask_migrate import Migrate
 from flask_login import login_required, current_user, login_user, logout_user
 from config import Config
-from models import db, FeedbackTemplate, FeedbackRequest, Question, Response, User
-from auth import init_auth, auto_login_dev_user, require_permission, ensure_authenticated, can_access_request, can_complete_request, get_users_for_assignment, get_or_create_dev_user
-from datetime import datetime
+from models import db, FeedbackTemplate, FeedbackRequest, Question, Response, User, CoachingCache, Job, DiscussionSummary, TargetQuestionStats, TargetGiverStats
+from auth import init_auth, auto_login_dev_user, require_permission, ensure_authenticated, get_users_for_assignment, get_or_create_dev_user, record_login, access_condition, check_request_access, check_response_access, can_view_target, sees_all_target_requests
+from llm import LLMClientRegistry, get_llm_client
+from jobs import job_handler, enqueue_job, job_status
+from pagination import keyset_page, page_size, count_label
+from chat_sessions import ChatSequenceError, conversation_key, load_history, begin_turn, record_turn, replace_conversation, delete_conversations, load_summary, save_summary
+from token_budget import compact_history, token_metrics
+from summary_cache import summary_cache_cli, summary_cache_stats, get_cached_summaries, store_summaries
+from contacts import ContactIndex, contacts_cli, record_contacts
+from fragment_cache import FragmentCache
+from assets import Assets, assets_cli
+from aggregates import aggregates_cli, record_submission, target_stats, scoped_target_stats
+from analytics import BUCKETS, analytics_available, feedback_analytics
+from bulk_requests import normalize_request_row, parse_requests_csv, validate_request_rows, create_requests_bulk, share_links_csv
+from sqlalchemy import case, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import hashlib
 import json
-import openai
+import math
+import threading
+import time
+import uuid
 import os
 import base64
 
+# Bump when the safety analysis or coaching prompts change to regenerate cached guides
+COACHING_PROMPT_VERSION = '1'
+
+# Bump when the discussion summary prompt changes to stop reusing cached summaries
+SUMMARY_PROMPT_VERSION = '1'
+
+def fallback_coaching_guide(feedback_request):
+    """Basic coaching guidance used when the LLM is unavailable."""
+    relationship_type = "supervisor" if feedback_request.template.is_supervisor_feedback else "colleague"
+    return f"""# Personalized Coaching Guide
+
+## Your Situation
+You have feedback to deliver to {feedback_request.target_name}, your {relationship_type}. Based on your feedback content, approach this conversation thoughtfully.
+
+## Preparation
+- Choose a private, comfortable setting
+- Plan for 20-30 minutes of conversation
+- Review your specific feedback points beforehand
+- Prepare to listen to their perspective
+
+## Opening the Conversation
+"Hi {feedback_request.target_name}, I'd like to share some observations about our working relationship. My goal is to improve how we collaborate together. Would you be open to hearing my perspective?"
+
+## Delivery Approach
+- Share your specific observations using "I" statements
+- Focus on behaviors and impacts, not personality
+- Ask for their perspective after each point
+- Be prepared to listen and understand their viewpoint
+
+## Next Steps
+- Summarize any agreements or insights
+- Identify specific actions you can both take
+- Schedule follow-up if needed
+- Thank them for their openness"""
+
 def generate_personalized_coaching(feedback_request, responses, safety_analysis):
     """Generate personalized coaching content based on actual feedback and relationship dynamics."""
     try:
         from config import Config
-        client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        client = get_llm_client()
         
         # Collect feedback content with context
         feedback_items = []
@@ -89,38 +144,47 @@ Please provide personalized coaching for delivering this specific feedback in th
     except Exception as e:
         print(f"Error generating personalized coaching: {e}")
         # Fallback to basic guidance
-        relationship_type = "supervisor" if feedback_request.template.is_supervisor_feedback else "colleague"
-        return f"""# Personalized Coaching Guide
-
-## Your Situation
-You have feedback to deliver to {feedback_request.target_name}, your {relationship_type}. Based on your feedback content, approach this conversation thoughtfully.
-
-## Preparation
-- Choose a private, comfortable setting
-- Plan for 20-30 minutes of conversation
-- Review your specific feedback points beforehand
-- Prepare to listen to their perspective
-
-## Opening the Conversation
-"Hi {feedback_request.target_name}, I'd like to share some observations about our working relationship. My goal is to improve how we collaborate together. Would you be open to hearing my perspective?"
+        return fallback_coaching_guide(feedback_request)
 
-## Delivery Approach
-- Share your specific observations using "I" statements
-- Focus on behaviors and impacts, not personality
-- Ask for their perspective after each point
-- Be prepared to listen and understand their viewpoint
+def concerns_coaching_section(feedback_request, safety_analysis):
+    """Short coaching section on the safety analysis's specific concerns, appended to a guide."""
+    concerns = safety_analysis.get('concerns', [])
+    try:
+        from config import Config
+        client = get_llm_client()
+        relationship_type = "supervisor" if feedback_request.template.is_supervisor_feedback else "peer/colleague"
+        
+        response = client.chat.completions.create(
+            model=Config.OPENAI_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are an expert executive coach. Write one short section of a coaching guide, titled "## Addressing Specific Concerns", with practical advice for each concern raised about a feedback conversation. Write in second person. Use at most two sentences per concern."""
+                },
+                {
+                    "role": "user",
+                    "content": f"""I'm delivering feedback to {feedback_request.target_name}, who is my {relationship_type}.
 
-## Next Steps
-- Summarize any agreements or insights
-- Identify specific actions you can both take
-- Schedule follow-up if needed
-- Thank them for their openness"""
+Safety assessment: {safety_analysis['safety_level']} risk level
+Specific concerns: {", ".join(concerns)}"""
+                }
+            ],
+            max_tokens=400,
+            temperature=0.4
+        )
+        
+        return response.choices[0].message.content.strip()
+        
+    except Exception as e:
+        print(f"Error generating concerns coaching: {e}")
+        suggestions = safety_analysis.get('suggestions', [])
+        return "## Addressing Specific Concerns\n" + "\n".join(f"- {item}" for item in concerns + suggestions)
 
 def analyze_feedback_safety(responses, is_supervisor_feedback=False):
     """Analyze feedback content to assess psychological safety and relationship dynamics."""
     try:
         from config import Config
-        client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        client = get_llm_client()
         
         # Collect all feedback content
         feedback_content = []
@@ -175,22 +239,414 @@ Respond with a JSON object containing:
         
     except Exception as e:
         print(f"Error analyzing feedback safety: {e}")
-        # Conservative fallback
-        return {
-            'safety_level': 'medium',
-            'concerns': ['Unable to assess feedback content automatically'],
-            'suggestions': ['Consider having this conversation in a private, comfortable setting']
-        }
+        return fallback_safety_analysis()
+
+def fallback_safety_analysis():
+    """Conservative safety analysis used when the LLM is unavailable."""
+    return {
+        'safety_level': 'medium',
+        'concerns': ['Unable to assess feedback content automatically'],
+        'suggestions': ['Consider having this conversation in a private, comfortable setting'],
+        'fallback': True
+    }
+
+def estimate_feedback_safety(responses):
+    """Cheaply guess the safety level from ratings and agreement answers, without the LLM."""
+    critical_count = sum(
+        1 for response in responses
+        if (response.rating_value and response.rating_value <= 2) or
+        response.agreement_value in ['disagree', 'strongly_disagree']
+    )
+    if not critical_count and not any(response.discussion_summary for response in responses):
+        return 'high'
+    return 'low' if critical_count >= 2 else 'medium'
+
+def generate_coaching_with_safety(feedback_request, responses):
+    """Run safety analysis and coaching generation concurrently.
+    
+    Coaching starts immediately with an estimated safety level while the real
+    analysis runs. When the analysis lands on the same level, the guide is
+    kept and any concerns it lists get a short section of their own, written
+    while the main guide is still generating. Only a different level means
+    regenerating the guide with the full result.
+    Returns (safety_analysis, coaching_content).
+    """
+    app = current_app._get_current_object()
+    is_supervisor_feedback = feedback_request.template.is_supervisor_feedback
+    estimated_level = estimate_feedback_safety(responses)
+    
+    def in_app_context(generate, *args):
+        with app.app_context():
+            return generate(*args)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        coaching_future = executor.submit(in_app_context, generate_personalized_coaching,
+                                          feedback_request, responses, {'safety_level': estimated_level})
+        safety_analysis = analyze_feedback_safety(responses, is_supervisor_feedback)
+        if safety_analysis.get('safety_level') != estimated_level:
+            coaching_content = generate_personalized_coaching(feedback_request, responses, safety_analysis)
+        else:
+            # The fallback analysis's concern is only that the LLM is unavailable
+            concerns_future = None
+            if safety_analysis.get('concerns') and not safety_analysis.get('fallback'):
+                concerns_future = executor.submit(in_app_context, concerns_coaching_section, feedback_request, safety_analysis)
+            coaching_content = coaching_future.result()
+            # Leave the fallback guide as-is so it is recognised and not cached
+            if concerns_future and coaching_content != fallback_coaching_guide(feedback_request):
+                coaching_content += "\n\n" + concerns_future.result()
+    
+    return safety_analysis, coaching_content
+
+def coaching_content_hash(feedback_request, responses):
+    """Hash everything that feeds the safety and coaching prompts for a request."""
+    payload = {
+        'model': current_app.config['OPENAI_MODEL'],
+        'target_name': feedback_request.target_name,
+        'context': feedback_request.context or '',
+        'is_supervisor_feedback': bool(feedback_request.template.is_supervisor_feedback),
+        'responses': sorted(
+            [r.question_id, r.rating_value, r.agreement_value, r.discussion_summary]
+            for r in responses
+        )
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+def get_cached_coaching_guide(feedback_request, responses):
+    """Return a cached (safety_analysis, coaching_content) for these responses, or None."""
+    cached = CoachingCache.query.filter_by(
+        feedback_request_id=feedback_request.id,
+        content_hash=coaching_content_hash(feedback_request, responses),
+        prompt_version=COACHING_PROMPT_VERSION
+    ).first()
+    if cached:
+        return json.loads(cached.safety_analysis), cached.coaching_content
+    return None
+
+def is_fallback_coaching(feedback_request, safety_analysis, coaching_content):
+    return bool(safety_analysis.get('fallback')) or coaching_content == fallback_coaching_guide(feedback_request)
+
+def recent_coaching_fallback(feedback_request, responses):
+    """Return the fallback (safety_analysis, coaching_content) from a coaching job that just gave up, or None.
+    
+    Fallbacks aren't cached, so without this every view of a queued request
+    would enqueue another job while the LLM is down. A job that fell back for
+    these responses, or failed outright, is shown for COACHING_RETRY_SECONDS
+    before a view queues a retry.
+    """
+    since = datetime.utcnow() - timedelta(seconds=current_app.config['COACHING_RETRY_SECONDS'])
+    job = Job.query.filter(
+        Job.job_type == 'coaching_guide',
+        Job.key == feedback_request.id,
+        Job.status.in_(['succeeded', 'failed']),
+        Job.finished_at >= since
+    ).order_by(Job.finished_at.desc()).first()
+    if job is None:
+        return None
+    if job.status == 'failed':
+        return fallback_safety_analysis(), fallback_coaching_guide(feedback_request)
+    result = json.loads(job.result or '{}')
+    fallback = result.get('fallback')
+    if not fallback or result.get('content_hash') != coaching_content_hash(feedback_request, responses):
+        return None
+    return fallback['safety_analysis'], fallback['coaching_content']
+
+def get_coaching_guide(feedback_request, responses):
+    """Serve the safety analysis and coaching guide from the cache, generating on a miss.
+    
+    Submitted responses don't change, so a guide is reused until the responses
+    (e.g. a regenerated summary) or COACHING_PROMPT_VERSION change.
+    Returns (safety_analysis, coaching_content).
+    """
+    cached = get_cached_coaching_guide(feedback_request, responses)
+    if cached:
+        return cached
+    
+    safety_analysis, coaching_content = generate_coaching_with_safety(feedback_request, responses)
+    
+    # Don't persist fallbacks so the next view retries the LLM
+    if is_fallback_coaching(feedback_request, safety_analysis, coaching_content):
+        return safety_analysis, coaching_content
+    
+    try:
+        invalidate_coaching_cache(feedback_request.id)
+        db.session.add(CoachingCache(
+            feedback_request_id=feedback_request.id,
+            content_hash=coaching_content_hash(feedback_request, responses),
+            prompt_version=COACHING_PROMPT_VERSION,
+            safety_analysis=json.dumps(safety_analysis),
+            coaching_content=coaching_content
+        ))
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent view cached the same guide first
+        db.session.rollback()
+    
+    return safety_analysis, coaching_content
+
+def invalidate_coaching_cache(feedback_request_id):
+    """Drop cached coaching guides for a request. Caller commits."""
+    CoachingCache.query.filter_by(feedback_request_id=feedback_request_id).delete()
+
+# Prior-context strings memoized per (feedback request, question) across chat turns
+_prior_context_cache = {}
+_prior_context_lock = threading.Lock()
+
+def build_prior_context(feedback_request_id, question):
+    """Format the draft answers to the questions before this one with a single joined query."""
+    rows = db.session.query(
+        Question.id, Question.question_text, Question.question_type,
+        Response.rating_value, Response.discussion_summary
+    ).join(Response, Response.question_id == Question.id)\
+        .filter(
+            Question.template_id == question.template_id,
+            Question.order_index < question.order_index,
+            Response.feedback_request_id == feedback_request_id,
+            Response.is_draft == True
+        )\
+        .order_by(Question.order_index, Response.created_at).all()
+    
+    prior_context = []
+    seen = set()
+    for question_id, question_text, question_type, rating_value, discussion_summary in rows:
+        # Only the first draft answer to each question counts
+        if question_id in seen:
+            continue
+        seen.add(question_id)
+        if question_type == 'rating' and rating_value is not None:
+            prior_context.append(f"Q: {question_text}\nA: {rating_value}/5")
+        elif question_type == 'discussion' and discussion_summary:
+            prior_context.append(f"Q: {question_text}\nA: {discussion_summary}")
+    
+    if not prior_context:
+        return ""
+    return f"\n\nPrevious questions and responses in this feedback session:\n" + "\n\n".join(prior_context) + "\n\nUse this context to ask more relevant and connected follow-up questions."
+
+def get_prior_context(feedback_request_id, question, ttl=300):
+    """Get the prior-context string for a chat turn, memoized for ttl seconds."""
+    key = (feedback_request_id, question.id)
+    now = time.monotonic()
+    with _prior_context_lock:
+        cached = _prior_context_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    context = build_prior_context(feedback_request_id, question)
+    if ttl > 0:
+        with _prior_context_lock:
+            # Drop expired entries so abandoned sessions don't accumulate
+            for expired in [k for k, (expires_at, _) in _prior_context_cache.items() if expires_at <= now]:
+                del _prior_context_cache[expired]
+            _prior_context_cache[key] = (now + ttl, context)
+    return context
+
+def invalidate_prior_context(feedback_request_id):
+    """Forget memoized prior context after a request's draft answers change."""
+    with _prior_context_lock:
+        for key in [k for k in _prior_context_cache if k[0] == feedback_request_id]:
+            del _prior_context_cache[key]
+
+def fallback_chat_summary(previous_summary, messages):
+    """Extractive summary used when the OpenAI call fails: earlier summary plus clipped user messages."""
+    points = [m['content'][:200] for m in messages if m['role'] == 'user']
+    return "\n".join(([previous_summary] if previous_summary else []) + [f"- {point}" for point in points])
+
+def summarize_chat_turns(previous_summary, messages):
+    """Fold older chat messages into a running summary of the conversation."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    prompt = f"""Update the running summary of a feedback conversation with the new messages below. Keep every concrete example, topic and opinion the person shared; drop pleasantries. Write brief bullet points.
+
+Current summary:
+{previous_summary or '(none yet)'}
+
+New messages:
+{transcript}"""
+    
+    try:
+        client = get_llm_client()
+        response = client.chat.completions.create(
+            model=current_app.config['OPENAI_MODEL'],
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=current_app.config['CHAT_SUMMARY_MAX_TOKENS'],
+            temperature=0.3
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"Error summarizing chat history: {e}")
+        return fallback_chat_summary(previous_summary, messages)
 
-def generate_feedback_summary(question_text, chat_history, is_supervisor_feedback=False):
+def fit_chat_history(endpoint, budget, prompt_messages, chat_history, user_message, conversation=None):
+    """Apply a prompt token budget to a chat history and record the savings.
+    
+    The rolling summary of older turns is stored with server-side
+    conversations so each turn only summarizes newly evicted messages.
+    """
+    state = load_summary(conversation) if conversation else None
+    history, new_state, stats = compact_history(
+        prompt_messages, chat_history, user_message,
+        budget=budget,
+        keep_recent=current_app.config['CHAT_KEEP_RECENT_MESSAGES'],
+        summarize=summarize_chat_turns,
+        state=state
+    )
+    if conversation and new_state and new_state != state:
+        save_summary(conversation, *new_state)
+    token_metrics.record(endpoint, stats['full_tokens'], stats['sent_tokens'], stats['compacted'])
+    return history
+
+def generate_feedback_summary(question_text, chat_history, is_supervisor_feedback=False, timeout=None):
     """Generate a professional, organized feedback summary from chat conversation using LLM."""
-    return generate_feedback_summary_with_custom_prompt(question_text, chat_history, is_supervisor_feedback, "")
+    return generate_feedback_summary_with_custom_prompt(question_text, chat_history, is_supervisor_feedback, "", timeout=timeout)
+
+def fallback_feedback_summary(chat_history):
+    """Concatenate the user's messages when the LLM summary is unavailable."""
+    user_messages = [msg['content'] for msg in chat_history if msg['role'] == 'user']
+    return ' '.join(user_messages) if user_messages else 'No response provided'
+
+def generate_feedback_summaries(discussions, max_workers=4, timeout=30):
+    """Generate summaries for several discussions concurrently.
+    
+    discussions maps a key (e.g. question id) to a tuple of
+    (question_text, chat_history, is_supervisor_feedback). At most max_workers
+    LLM calls run at once and each call is cut off by the client after
+    timeout seconds; calls that time out fall back to the user's own messages. Discussions summarized before are
+    served from the summary cache. Returns a dict of key -> summary.
+    """
+    if not discussions:
+        return {}
+    
+    hashes = {key: discussion_hash(*args) for key, args in discussions.items()}
+    cached = get_cached_summaries(hashes.values())
+    summaries = {key: cached[h] for key, h in hashes.items() if h in cached}
+    discussions = {key: args for key, args in discussions.items() if key not in summaries}
+    if not discussions:
+        return summaries
+    
+    app = current_app._get_current_object()
+    
+    def summarize(question_text, chat_history, is_supervisor_feedback):
+        # Worker threads need their own app context for config and the LLM client
+        with app.app_context():
+            return generate_feedback_summary(question_text, chat_history, is_supervisor_feedback, timeout=timeout)
+    
+    workers = max(1, min(max_workers, len(discussions)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {key: executor.submit(summarize, *args) for key, args in discussions.items()}
+    
+    # Each call stops itself after timeout; this only bounds the wait if one
+    # doesn't. Calls run in waves of `workers`, so the last may start this late.
+    deadline = time.monotonic() + timeout * math.ceil(len(discussions) / workers)
+    
+    for key, future in futures.items():
+        try:
+            summaries[key] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except Exception as e:
+            print(f"Error generating feedback summary for {key}: {e}")
+            future.cancel()
+            summaries[key] = fallback_feedback_summary(discussions[key][1])
+    
+    executor.shutdown(wait=False, cancel_futures=True)
+    return summaries
+
+def remember_summaries(discussions, summaries):
+    """Add newly generated summaries to the summary cache, skipping fallbacks.
+    
+    Commits on its own, so call it after saving the responses.
+    """
+    store_summaries({
+        discussion_hash(*discussions[key]): summary
+        for key, summary in summaries.items()
+        if key in discussions and summary != fallback_feedback_summary(discussions[key][1])
+    }, max_entries=current_app.config['SUMMARY_CACHE_MAX_ENTRIES'])
+
+def discussion_hash(question_text, chat_history, is_supervisor_feedback):
+    """Hash everything that feeds the summary prompt for one discussion."""
+    payload = {
+        'model': current_app.config['OPENAI_MODEL'],
+        'prompt_version': SUMMARY_PROMPT_VERSION,
+        'question_text': question_text,
+        'is_supervisor_feedback': bool(is_supervisor_feedback),
+        'chat_history': [[m['role'], m['content']] for m in chat_history]
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+def update_rolling_summary(feedback_request_id, question_id):
+    """Regenerate a discussion's stored summary from its server-side transcript if it changed.
+    
+    Returns the current summary, or None if nothing was stored.
+    """
+    feedback_request = FeedbackRequest.query.get(feedback_request_id)
+    question = Question.query.get(question_id)
+    if not feedback_request or not question:
+        return None
+    
+    key = conversation_key('survey', feedback_request_id, question_id)
+    history = load_history(key)
+    if not history:
+        return None
+    
+    is_supervisor_feedback = feedback_request.template.is_supervisor_feedback
+    content_hash = discussion_hash(question.question_text, history, is_supervisor_feedback)
+    row = DiscussionSummary.query.filter_by(feedback_request_id=feedback_request_id, question_id=question_id).first()
+    if row and row.content_hash == content_hash:
+        return row.summary
+    
+    summary = get_cached_summaries([content_hash]).get(content_hash)
+    if summary is None:
+        summary = generate_feedback_summary(question.question_text, history, is_supervisor_feedback)
+    if summary == fallback_feedback_summary(history):
+        # Don't store the fallback; review will try the LLM again
+        return None
+    if load_history(key) != history:
+        # A newer turn arrived while summarizing; its own update will store the summary
+        return None
+    
+    if row is None:
+        row = DiscussionSummary(feedback_request_id=feedback_request_id, question_id=question_id)
+        db.session.add(row)
+    row.content_hash = content_hash
+    row.summary = summary
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    store_summaries({content_hash: summary}, max_entries=current_app.config['SUMMARY_CACHE_MAX_ENTRIES'])
+    return summary
+
+_rolling_summary_executor = None
+_rolling_summary_lock = threading.Lock()
+
+def schedule_rolling_summary(feedback_request_id, question_id):
+    """Refresh a discussion's rolling summary off the request thread."""
+    global _rolling_summary_executor
+    if current_app.config['JOB_QUEUE_ENABLED']:
+        enqueue_job(
+            'rolling_summary',
+            {'feedback_request_id': feedback_request_id, 'question_id': question_id},
+            key=f"{feedback_request_id}:{question_id}"
+        )
+        return
+    
+    with _rolling_summary_lock:
+        if _rolling_summary_executor is None:
+            _rolling_summary_executor = ThreadPoolExecutor(max_workers=current_app.config['SUMMARY_MAX_WORKERS'])
+    
+    app = current_app._get_current_object()
+    
+    def run():
+        with app.app_context():
+            try:
+                update_rolling_summary(feedback_request_id, question_id)
+            except Exception as e:
+                print(f"Error updating rolling summary for {question_id}: {e}")
+    
+    return _rolling_summary_executor.submit(run)
 
 def generate_feedback_summary_with_edited_prompt(question_text, chat_history, edited_prompt):
     """Generate a professional, organized feedback summary using a user-edited prompt."""
     try:
         from config import Config
-        client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        client = get_llm_client()
         
         # Build the conversation context - focus on user responses
         user_responses = []
@@ -238,14 +694,19 @@ Provide a well-organized, comprehensive feedback summary that preserves ALL the
     except Exception as e:
         print(f"Error generating feedback summary with edited prompt: {e}")
         # Fallback to simple concatenation
-        user_messages = [msg['content'] for msg in chat_history if msg['role'] == 'user']
-        return ' '.join(user_messages) if user_messages else 'No response provided'
+        return fallback_feedback_summary(chat_history)
 
-def generate_feedback_summary_with_custom_prompt(question_text, chat_history, is_supervisor_feedback=False, custom_prompt=""):
-    """Generate a professional, organized feedback summary with optional custom instructions."""
+def generate_feedback_summary_with_custom_prompt(question_text, chat_history, is_supervisor_feedback=False, custom_prompt="", timeout=None):
+    """Generate a professional, organized feedback summary with optional custom instructions.
+    
+    timeout (seconds) bounds the LLM call itself, without retries, instead
+    of the client's OPENAI_TIMEOUT.
+    """
     try:
         from config import Config
-        client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+        client = get_llm_client()
+        if timeout is not None:
+            client = client.with_options(timeout=timeout, max_retries=0)
         
         # Build the conversation context - focus on user responses
         user_responses = []
@@ -327,8 +788,348 @@ Provide a well-organized, comprehensive feedback summary that preserves ALL the
     except Exception as e:
         print(f"Error generating feedback summary: {e}")
         # Fallback to simple concatenation
-        user_messages = [msg['content'] for msg in chat_history if msg['role'] == 'user']
-        return ' '.join(user_messages) if user_messages else 'No response provided'
+        return fallback_feedback_summary(chat_history)
+
+DASHBOARD_ROLES = ('created_by_me', 'assigned_to_me', 'about_me')
+
+def dashboard_role_query(user, role):
+    """Base query for one dashboard bucket (email-first), or None if it is always empty for this user."""
+    if user.is_admin:
+        # Admins see all requests
+        return FeedbackRequest.query if role == 'created_by_me' else None
+    
+    if role == 'created_by_me':
+        # Requests I created (as manager/HR)
+        return FeedbackRequest.query.filter(FeedbackRequest.created_by_id == user.id)
+    
+    if role == 'assigned_to_me':
+        # Requests assigned to me (feedback I need to give)
+        return FeedbackRequest.query.filter(
+            (FeedbackRequest.assigned_to_email == user.email) |
+            # Legacy fallback
+            (FeedbackRequest.assigned_to_id == user.id)
+        ).filter(
+            FeedbackRequest.created_by_id != user.id  # Exclude my own requests
+        )
+    
+    if role == 'about_me':
+        # Feedback about me (I'm the target)
+        return FeedbackRequest.query.filter(
+            FeedbackRequest.target_email == user.email
+        ).filter(
+            FeedbackRequest.created_by_id != user.id  # Exclude my own requests
+        )
+    
+    return None
+
+def load_dashboard_page(query, cursor=None, limit=25):
+    """Fetch a keyset page of requests, eager-loading what dashboard rows display."""
+    query = query.options(
+        joinedload(FeedbackRequest.template),
+        joinedload(FeedbackRequest.creator)
+    )
+    return keyset_page(query, FeedbackRequest, cursor, limit)
+
+def dashboard_rows(requests, submitted_counts):
+    """Pair each request with its submitted response count for the dashboard templates."""
+    return [
+        {
+            'request': feedback_request,
+            'submitted_count': submitted_counts.get(feedback_request.id, 0)
+        }
+        for feedback_request in requests
+    ]
+
+def count_submitted_responses(request_ids):
+    """Count submitted responses per feedback request in a single grouped query."""
+    if not request_ids:
+        return {}
+    rows = db.session.query(Response.feedback_request_id, func.count(Response.id))\
+        .filter(Response.feedback_request_id.in_(request_ids), Response.is_draft == False)\
+        .group_by(Response.feedback_request_id).all()
+    return dict(rows)
+
+def count_template_usage(template_ids):
+    """Count questions and feedback requests per template. Returns (question_counts, request_counts)."""
+    if not template_ids:
+        return {}, {}
+    question_counts = dict(
+        db.session.query(Question.template_id, func.count(Question.id))
+        .filter(Question.template_id.in_(template_ids))
+        .group_by(Question.template_id).all()
+    )
+    request_counts = dict(
+        db.session.query(FeedbackRequest.template_id, func.count(FeedbackRequest.id))
+        .filter(FeedbackRequest.template_id.in_(template_ids))
+        .group_by(FeedbackRequest.template_id).all()
+    )
+    return question_counts, request_counts
+
+def regenerate_response_summary(response, custom_prompt="", edited_prompt=""):
+    """Regenerate a discussion summary from its chat history and save it."""
+    question = Question.query.get_or_404(response.question_id)
+    template = FeedbackTemplate.query.get_or_404(question.template_id)
+    chat_history = json.loads(response.chat_history)
+    
+    # Use edited prompt if provided, otherwise use custom prompt
+    if edited_prompt:
+        new_summary = generate_feedback_summary_with_edited_prompt(
+            question.question_text, 
+            chat_history,
+            edited_prompt
+        )
+    else:
+        # Fallback to custom prompt approach
+        new_summary = generate_feedback_summary_with_custom_prompt(
+            question.question_text, 
+            chat_history,
+            template.is_supervisor_feedback,
+            custom_prompt
+        )
+    
+    # Update the response
+    response.discussion_summary = new_summary
+    invalidate_coaching_cache(response.feedback_request_id)
+    db.session.commit()
+    invalidate_prior_context(response.feedback_request_id)
+    invalidate_report_fragments(response)
+    return new_summary
+
+def invalidate_report_fragments(response):
+    """Drop the cached report blocks that show a response (keys as used in report.html and aggregate_report.html)."""
+    fragment_cache = current_app.extensions.get('fragment_cache')
+    if fragment_cache:
+        fragment_cache.delete(f"report-response:{response.id}", f"aggregate-request:{response.feedback_request_id}")
+
+def template_fingerprint(app):
+    """Hash of the app's template sources and built assets, so page ETags change when a deploy changes the markup."""
+    digest = hashlib.sha256(json.dumps(app.extensions['assets'].manifest, sort_keys=True).encode('utf-8'))
+    for name in sorted(app.jinja_loader.list_templates()):
+        source, _, _ = app.jinja_loader.get_source(app.jinja_env, name)
+        digest.update(name.encode('utf-8') + b'\0' + source.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+def page_etag(user, *parts):
+    """Strong ETag for a page rendered for user from data at the version given by parts.
+    
+    Returns None while flash messages are pending: that render shows them once,
+    so it must not be answered with 304 later.
+    """
+    if '_flashes' in session:
+        return None
+    viewer = None
+    if user is not None:
+        # base.html shows the user's name, email and permission-dependent links
+        viewer = [user.id, user.name, user.email, user.is_admin,
+                  user.can_create_templates, user.can_create_requests_for_others]
+    key = json.dumps([current_app.extensions.get('template_fingerprint'), viewer, *parts], default=str)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def not_modified(etag):
+    """A bodyless 304 if the client's cached copy matches etag, otherwise None."""
+    if etag is None or etag not in request.if_none_match:
+        return None
+    return with_etag(current_app.response_class(status=304), etag)
+
+def with_etag(rv, etag):
+    """Attach etag to a rendered page; no-cache makes browsers revalidate on every visit."""
+    response = current_app.make_response(rv)
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def report_version(request_id, user):
+    """Authorize a user for a request's report and read its version in one query.
+    
+    Returns None if the request doesn't exist, otherwise (allowed, version)
+    where version changes whenever the request or one of its submitted
+    responses is saved.
+    """
+    row = db.session.query(
+        case((access_condition(user), 1), else_=0),
+        func.coalesce(FeedbackRequest.updated_at, FeedbackRequest.created_at),
+        func.count(Response.id),
+        func.max(func.coalesce(Response.updated_at, Response.submitted_at))
+    ).outerjoin(Response, (Response.feedback_request_id == FeedbackRequest.id) & (Response.is_draft == False))\
+        .filter(FeedbackRequest.id == request_id)\
+        .group_by(FeedbackRequest.id).first()
+    if row is None:
+        return None
+    allowed, *version = row
+    return bool(allowed), version
+
+def aggregate_version(user, target_email=''):
+    """Version of the aggregate report page for a user, from indexed aggregates in one query.
+    
+    Covers exactly what the page renders: the target picker (the newest
+    request the user can pick from) and, with a target, the count and newest
+    change of the target's submitted responses and requests the user can
+    see. Viewers shown the target-wide stats tables also get those tables'
+    totals, which `flask aggregates rebuild` can change on its own.
+    """
+    picker_scope = [] if user.is_admin else [
+        or_(FeedbackRequest.created_by_id == user.id, FeedbackRequest.target_email == user.email)
+    ]
+    columns = [
+        db.session.query(func.max(FeedbackRequest.created_at)).filter(*picker_scope).scalar_subquery()
+    ]
+    if target_email:
+        submitted = db.session.query(FeedbackRequest)\
+            .join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+            .filter(FeedbackRequest.target_email == target_email, Response.is_draft == False)\
+            .filter(access_condition(user))
+        columns += [
+            submitted.with_entities(func.count(Response.id)).scalar_subquery(),
+            submitted.with_entities(func.max(func.coalesce(Response.updated_at, Response.submitted_at))).scalar_subquery(),
+            submitted.with_entities(func.max(func.coalesce(FeedbackRequest.updated_at, FeedbackRequest.created_at))).scalar_subquery()
+        ]
+        if sees_all_target_requests(user, target_email):
+            givers = db.session.query(TargetGiverStats).filter(TargetGiverStats.target_email == target_email)
+            questions = db.session.query(TargetQuestionStats).filter(TargetQuestionStats.target_email == target_email)
+            columns += [
+                givers.with_entities(func.sum(TargetGiverStats.session_count)).scalar_subquery(),
+                givers.with_entities(func.sum(TargetGiverStats.response_count)).scalar_subquery(),
+                questions.with_entities(func.sum(TargetQuestionStats.response_count)).scalar_subquery(),
+                questions.with_entities(func.sum(TargetQuestionStats.rating_sum)).scalar_subquery()
+            ]
+    return list(db.session.query(*columns).one())
+
+def draft_answer_fields(answer):
+    """Response column values for one answer as posted by the survey page.
+    
+    Every answer sets the same columns so bulk writes batch into one statement.
+    """
+    fields = {'rating_value': None, 'agreement_value': None, 'chat_history': None, 'discussion_summary': None}
+    if answer['type'] == 'rating':
+        fields['rating_value'] = None if answer['value'] in ('', 'na') else int(answer['value'])
+    elif answer['type'] == 'agreement':
+        fields['agreement_value'] = None if answer['value'] in ('', 'na') else answer['value']
+    else:  # discussion; a changed chat needs a new summary
+        chat_history = answer.get('chat_history', [])
+        fields['chat_history'] = json.dumps(chat_history)
+        fields['discussion_summary'] = None if chat_history else 'No response provided'
+    return fields
+
+def save_draft_answers(feedback_request_id, answers, replace=False):
+    """Upsert draft answers, writing only the rows whose answer changed.
+    
+    answers maps question id -> answer as posted by the survey page. With
+    replace, drafts for questions missing from answers are deleted, as the
+    review save sends the whole survey. Changed rows go out as one bulk
+    UPDATE and one bulk INSERT. Returns question id -> (response id,
+    chat_history) for discussions that still need a summary. Caller commits.
+    """
+    existing = {}
+    stale_ids = []
+    for response in Response.query.filter_by(feedback_request_id=feedback_request_id, is_draft=True):
+        if response.question_id in existing:
+            stale_ids.append(response.id)
+        else:
+            existing[response.question_id] = response
+    if replace:
+        stale_ids += [r.id for question_id, r in existing.items() if question_id not in answers]
+    if stale_ids:
+        Response.query.filter(Response.id.in_(stale_ids)).delete(synchronize_session=False)
+    
+    inserts = []
+    updates = []
+    needs_summary = {}
+    for question_id, answer in answers.items():
+        fields = draft_answer_fields(answer)
+        current = existing.get(question_id)
+        if current is None:
+            response_id = str(uuid.uuid4())
+            inserts.append(dict(fields, id=response_id, feedback_request_id=feedback_request_id,
+                                question_id=question_id, is_draft=True))
+            summary = fields.get('discussion_summary')
+        elif any(getattr(current, column) != value for column, value in fields.items() if column != 'discussion_summary'):
+            response_id = current.id
+            updates.append(dict(fields, id=response_id))
+            summary = fields.get('discussion_summary')
+        else:
+            # Unchanged; keep the row and its summary
+            response_id = current.id
+            summary = current.discussion_summary
+        
+        if answer['type'] == 'discussion' and summary is None:
+            needs_summary[question_id] = (response_id, answer.get('chat_history', []))
+    
+    if inserts:
+        db.session.bulk_insert_mappings(Response, inserts, render_nulls=True)
+    if updates:
+        db.session.bulk_update_mappings(Response, updates)
+    return needs_summary
+
+def set_draft_summaries(summaries):
+    """Write discussion summaries by response id in one bulk UPDATE. Caller commits."""
+    if summaries:
+        db.session.bulk_update_mappings(Response, [
+            {'id': response_id, 'discussion_summary': summary} for response_id, summary in summaries.items()
+        ])
+
+@job_handler('review_summaries')
+def summarize_draft_discussions(payload):
+    """Fill in missing discussion summaries for a request's draft responses."""
+    feedback_request = FeedbackRequest.query.get(payload['feedback_request_id'])
+    if not feedback_request:
+        return {'summarized': 0}
+    
+    pending = {
+        r.id: r for r in Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=True)
+        if r.chat_history and r.discussion_summary is None
+    }
+    discussions = {
+        response_id: (r.question.question_text, json.loads(r.chat_history), feedback_request.template.is_supervisor_feedback)
+        for response_id, r in pending.items()
+    }
+    summaries = generate_feedback_summaries(
+        discussions,
+        max_workers=current_app.config['SUMMARY_MAX_WORKERS'],
+        timeout=current_app.config['SUMMARY_TIMEOUT']
+    )
+    for response_id, summary in summaries.items():
+        pending[response_id].discussion_summary = summary
+    db.session.commit()
+    invalidate_prior_context(feedback_request.id)
+    remember_summaries(discussions, summaries)
+    return {'summarized': len(summaries)}
+
+@job_handler('rolling_summary')
+def rolling_summary_job(payload):
+    """Bring one discussion's rolling summary up to date with its transcript."""
+    summary = update_rolling_summary(payload['feedback_request_id'], payload['question_id'])
+    return {'updated': summary is not None}
+
+@job_handler('coaching_guide')
+def build_coaching_guide(payload):
+    """Generate and cache the coaching guide for a request's submitted responses.
+    
+    A fallback guide isn't cached, so it is kept in the job result for the
+    coaching page to show (see recent_coaching_fallback).
+    """
+    feedback_request = FeedbackRequest.query.get(payload['feedback_request_id'])
+    if not feedback_request:
+        return {'generated': False}
+    responses = Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=False).all()
+    safety_analysis, coaching_content = get_coaching_guide(feedback_request, responses)
+    result = {'generated': True, 'content_hash': coaching_content_hash(feedback_request, responses)}
+    if is_fallback_coaching(feedback_request, safety_analysis, coaching_content):
+        result['fallback'] = {'safety_analysis': safety_analysis, 'coaching_content': coaching_content}
+    return result
+
+@job_handler('regenerate_summary')
+def regenerate_summary_job(payload):
+    """Regenerate one discussion summary with custom or edited instructions."""
+    response = Response.query.get(payload['response_id'])
+    if not response or not response.chat_history:
+        raise ValueError('No chat history available')
+    new_summary = regenerate_response_summary(
+        response,
+        payload.get('custom_prompt', ''),
+        payload.get('edited_prompt', '')
+    )
+    return {'new_summary': new_summary}
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -337,6 +1138,15 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate = Migrate(app, db)
     init_auth(app)
+    LLMClientRegistry(app)
+    ContactIndex(app)
+    FragmentCache(app)
+    Assets(app)
+    app.extensions['template_fingerprint'] = template_fingerprint(app)
+    app.cli.add_command(summary_cache_cli)
+    app.cli.add_command(contacts_cli)
+    app.cli.add_command(aggregates_cli)
+    app.cli.add_command(assets_cli)
     
     # Add custom template filters
     @app.template_filter('from_json')
@@ -374,8 +1184,7 @@ def register_routes(app):
             user = get_or_create_dev_user()
             if user:
                 login_user(user)
-                user.last_login = datetime.utcnow()
-                db.session.commit()
+                record_login(user)
                 flash(f'Logged in as {user.name} (dev mode)', 'success')
                 return redirect(url_for('dashboard'))
         
@@ -398,8 +1207,32 @@ def register_routes(app):
         if not user:
             return redirect(url_for('auth_login'))
         
-        templates = FeedbackTemplate.query.order_by(FeedbackTemplate.created_at.desc()).all()
-        return render_template('templates/list.html', templates=templates, user=user)
+        limit = page_size(request.args.get('limit'), app.config['TEMPLATES_PAGE_SIZE'], app.config['MAX_PAGE_SIZE'])
+        templates, next_cursor = keyset_page(FeedbackTemplate.query, FeedbackTemplate, limit=limit)
+        question_counts, request_counts = count_template_usage({t.id for t in templates})
+        return render_template('templates/list.html', templates=templates, next_cursor=next_cursor,
+                             question_counts=question_counts, request_counts=request_counts, user=user)
+
+    @app.route('/api/templates')
+    @login_required
+    def templates_more():
+        """Load the next page of templates as rendered cards."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        limit = page_size(request.args.get('limit'), app.config['TEMPLATES_PAGE_SIZE'], app.config['MAX_PAGE_SIZE'])
+        try:
+            templates, next_cursor = keyset_page(FeedbackTemplate.query, FeedbackTemplate, request.args.get('cursor'), limit)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        question_counts, request_counts = count_template_usage({t.id for t in templates})
+        return jsonify({
+            'html': render_template('templates/list_cards.html', templates=templates,
+                                    question_counts=question_counts, request_counts=request_counts),
+            'next_cursor': next_cursor
+        })
 
     @app.route('/templates/create', methods=['GET', 'POST'])
     @require_permission('create_templates')
@@ -483,6 +1316,10 @@ def register_routes(app):
                 assigned_to_id=assigned_user.id if assigned_user else None
             )
             db.session.add(feedback_request)
+            record_contacts([
+                (target_email, target_name, 'target'),
+                (assigned_to_email, assigned_to_email, 'assignee')
+            ])
             db.session.commit()
             
             flash('Feedback request created successfully!')
@@ -493,10 +1330,99 @@ def register_routes(app):
         users = get_users_for_assignment() if user.can_create_requests_for_others or user.is_admin else [user]
         return render_template('create.html', templates=templates, users=users, current_user=user)
 
+    def share_links_response(created):
+        """Return survey links for newly created requests as a CSV download."""
+        return app.response_class(
+            share_links_csv(created, request.url_root),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=share_links.csv'}
+        )
+
+    @app.route('/api/requests/bulk', methods=['POST'])
+    @login_required
+    def create_requests_bulk_api():
+        """Create many feedback requests at once from a JSON list of rows."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        
+        data = request.get_json() or {}
+        rows = data.get('requests') or []
+        default_template_id = data.get('template_id')
+        if not rows:
+            return jsonify({'success': False, 'error': 'No requests provided'}), 400
+        if len(rows) > app.config['MAX_BULK_REQUESTS']:
+            return jsonify({'success': False, 'error': f"At most {app.config['MAX_BULK_REQUESTS']} requests per upload"}), 400
+        
+        rows = [normalize_request_row(row) for row in rows]
+        errors = validate_request_rows(rows, user, default_template_id)
+        if errors:
+            return jsonify({'success': False, 'errors': errors}), 400
+        
+        created = create_requests_bulk(rows, user, default_template_id, chunk_size=app.config['BULK_INSERT_CHUNK_SIZE'])
+        if request.args.get('format') == 'csv':
+            return share_links_response(created)
+        
+        return jsonify({
+            'success': True,
+            'created': len(created),
+            'requests': [{
+                'id': row['id'],
+                'target_email': row['target_email'],
+                'assigned_to_email': row['assigned_to_email'],
+                'survey_link': f"{request.url_root}survey/{row['id']}"
+            } for row in created]
+        }), 201
+
+    @app.route('/create/bulk', methods=['GET', 'POST'])
+    @login_required
+    def create_requests_from_csv():
+        """Upload a CSV of feedback requests and download their share links."""
+        user = ensure_authenticated()
+        if not user:
+            return redirect(url_for('auth_login'))
+        
+        templates = FeedbackTemplate.query.order_by(FeedbackTemplate.name).all()
+        
+        if request.method == 'POST':
+            upload = request.files.get('csv_file')
+            if not upload or not upload.filename:
+                flash('Please choose a CSV file to upload.', 'error')
+                return redirect(url_for('create_requests_from_csv'))
+            
+            try:
+                rows = parse_requests_csv(upload.stream)
+            except (UnicodeDecodeError, ValueError):
+                flash('Could not read the CSV file. Please upload a UTF-8 CSV with a header row.', 'error')
+                return redirect(url_for('create_requests_from_csv'))
+            
+            default_template_id = request.form.get('template_id') or None
+            errors = [] if rows else ['The CSV file has no rows.']
+            if len(rows) > app.config['MAX_BULK_REQUESTS']:
+                errors.append(f"At most {app.config['MAX_BULK_REQUESTS']} requests per upload.")
+            errors = errors or validate_request_rows(rows, user, default_template_id)
+            if errors:
+                return render_template('create_bulk.html', templates=templates, errors=errors), 400
+            
+            created = create_requests_bulk(rows, user, default_template_id, chunk_size=app.config['BULK_INSERT_CHUNK_SIZE'])
+            return share_links_response(created)
+        
+        return render_template('create_bulk.html', templates=templates, errors=[])
+
     @app.route('/share/<request_id>')
     def share_link(request_id):
-        feedback_request = FeedbackRequest.query.get_or_404(request_id)
-        return render_template('share.html', feedback_request=feedback_request)
+        version = db.session.query(FeedbackRequest.created_at, FeedbackRequest.updated_at)\
+            .filter(FeedbackRequest.id == request_id).first()
+        if version is None:
+            abort(404)
+        viewer = current_user if current_user.is_authenticated else None
+        # The page shows absolute survey links, so the host is part of its version
+        etag = page_etag(viewer, 'share', request_id, request.url_root, *version)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        feedback_request = db.session.get(FeedbackRequest, request_id)
+        return with_etag(render_template('share.html', feedback_request=feedback_request), etag)
 
     @app.route('/survey/<request_id>')
     @login_required
@@ -505,68 +1431,29 @@ def register_routes(app):
         if not user:
             return redirect(url_for('auth_login'))
             
-        feedback_request = FeedbackRequest.query.get_or_404(request_id)
-        
-        # Check if user can complete this request
-        if not can_complete_request(feedback_request, user):
+        # Check if user can complete this request before loading it
+        allowed = check_request_access(request_id, user, complete=True)
+        if allowed is None:
+            abort(404)
+        if not allowed:
             flash('You are not assigned to complete this feedback request.', 'error')
             return redirect(url_for('dashboard'))
         
+        feedback_request = db.session.get(FeedbackRequest, request_id)
         questions = Question.query.filter_by(template_id=feedback_request.template_id).order_by(Question.order_index).all()
         return render_template('survey.html', feedback_request=feedback_request, questions=questions, user=user)
 
-    @app.route('/api/chat/<question_id>', methods=['POST'])
-    def chat_response(question_id):
-        data = request.get_json()
-        user_message = data.get('message', '').strip()
-        chat_history = data.get('chat_history', [])
-        feedback_request_id = data.get('feedback_request_id')
+    def build_chat_messages(question, template, feedback_request, chat_history, user_message, conversation=None):
+        """Build the interviewer prompt and conversation for a survey chat turn."""
+        # Build context from all previous questions and responses
+        context_info = ""
+        if feedback_request:
+            context_info = get_prior_context(feedback_request.id, question, ttl=app.config['PRIOR_CONTEXT_TTL'])
         
-        # Get the original question and template to provide context
-        question = Question.query.get_or_404(question_id)
-        template = FeedbackTemplate.query.get_or_404(question.template_id)
-        
-        # Get feedback request for context
-        feedback_request = FeedbackRequest.query.get_or_404(feedback_request_id) if feedback_request_id else None
-        
-        try:
-            # Initialize OpenAI client
-            client = openai.OpenAI(api_key=app.config['OPENAI_API_KEY'])
-            
-            # Build context from all previous questions and responses
-            context_info = ""
-            if feedback_request_id:
-                # Get all questions for this feedback request in order
-                all_questions = Question.query.filter_by(template_id=question.template_id).order_by(Question.order_index).all()
-                
-                prior_context = []
-                current_question_reached = False
-                
-                for q in all_questions:
-                    if q.id == question_id:
-                        current_question_reached = True
-                        break
-                    
-                    # Look for existing responses to this question
-                    existing_response = Response.query.filter_by(
-                        feedback_request_id=feedback_request_id,
-                        question_id=q.id,
-                        is_draft=True
-                    ).first()
-                    
-                    if existing_response:
-                        if q.question_type == 'rating' and existing_response.rating_value is not None:
-                            prior_context.append(f"Q: {q.question_text}\nA: {existing_response.rating_value}/5")
-                        elif q.question_type == 'discussion' and existing_response.discussion_summary:
-                            prior_context.append(f"Q: {q.question_text}\nA: {existing_response.discussion_summary}")
-                
-                if prior_context:
-                    context_info = f"\n\nPrevious questions and responses in this feedback session:\n" + "\n\n".join(prior_context) + "\n\nUse this context to ask more relevant and connected follow-up questions."
-            
-            # Build supervisor-specific guidance
-            supervisor_guidance = ""
-            if template.is_supervisor_feedback:
-                supervisor_guidance = """
+        # Build supervisor-specific guidance
+        supervisor_guidance = ""
+        if template.is_supervisor_feedback:
+            supervisor_guidance = """
 
 IMPORTANT: This feedback is about someone's supervisor. Keep in mind:
 - Focus on management and leadership behaviors
@@ -575,20 +1462,20 @@ IMPORTANT: This feedback is about someone's supervisor. Keep in mind:
 - Be particularly thoughtful about constructive criticism (balance with positive aspects)
 - Consider questions about professional development support, delegation, and team dynamics"""
 
-            # Build relationship context guidance
-            relationship_context = ""
-            if feedback_request and feedback_request.context and feedback_request.context.strip():
-                relationship_context = f"""
+        # Build relationship context guidance
+        relationship_context = ""
+        if feedback_request and feedback_request.context and feedback_request.context.strip():
+            relationship_context = f"""
 
 RELATIONSHIP CONTEXT: {feedback_request.context.strip()}
 
 This describes the relationship between the feedback giver and {feedback_request.target_name}. Use this context to ask more relevant and specific follow-up questions. Tailor your questions based on this relationship dynamic and situation."""
 
-            # Build conversation history for the LLM
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"""You are a skilled feedback interviewer helping someone provide detailed, constructive feedback. Your goal is to help them give comprehensive and thoughtful responses about: "{question.question_text}"
+        # Build conversation history for the LLM
+        messages = [
+            {
+                "role": "system",
+                "content": f"""You are a skilled feedback interviewer helping someone provide detailed, constructive feedback. Your goal is to help them give comprehensive and thoughtful responses about: "{question.question_text}"
 
 Guidelines:
 - Ask ONE focused follow-up question at a time to encourage depth and specificity
@@ -600,21 +1487,182 @@ Guidelines:
 - Reference previous answers when relevant to create a cohesive feedback experience
 
 IMPORTANT: Always respond with just ONE question or acknowledgment. Keep responses concise and focused.{supervisor_guidance}{relationship_context}{context_info}"""
-                }
-            ]
-            
-            # Add chat history
-            for msg in chat_history:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-            
-            # Add current user message
+            }
+        ]
+        
+        # Add chat history, compacted to the prompt budget
+        for msg in fit_chat_history('chat', app.config['CHAT_TOKEN_BUDGET'], messages, chat_history, user_message, conversation):
             messages.append({
-                "role": "user", 
-                "content": user_message
+                "role": msg["role"],
+                "content": msg["content"]
             })
+        
+        # Add current user message
+        messages.append({
+            "role": "user", 
+            "content": user_message
+        })
+        
+        return messages
+
+    def is_final_chat_turn(ai_response, user_message):
+        """Check if this should be the final message of a discussion."""
+        return (
+            "thank you for that detailed feedback" in ai_response.lower() or
+            "done" in user_message.lower() or 
+            "nothing else" in user_message.lower() or
+            "that's all" in user_message.lower()
+        )
+
+    def fallback_chat_response(user_message):
+        """Simple follow-up used when the OpenAI call fails. Returns (response, is_final)."""
+        follow_up_questions = [
+            "Can you share a specific example?",
+            "How has this impacted the team or project?", 
+            "What made this particularly effective or challenging?",
+            "Is there anything else you'd like to add?"
+        ]
+        
+        # Simple fallback logic
+        if len(user_message) < 20:
+            response = follow_up_questions[0]
+        elif "example" not in user_message.lower():
+            response = follow_up_questions[0]
+        elif len(user_message) < 50:
+            response = follow_up_questions[1]
+        else:
+            response = follow_up_questions[3]
+        
+        return response, 'done' in user_message.lower() or 'nothing' in user_message.lower()
+
+    def sse_event(payload):
+        """Format a payload as a Server-Sent Events data frame."""
+        return f"data: {json.dumps(payload)}\n\n"
+
+    def stream_chat_response(client, messages, user_message, on_complete=None):
+        """Yield chat tokens as Server-Sent Events, then a final event with is_final.
+        
+        on_complete(ai_response) may return extra fields for the final event.
+        """
+        tokens = []
+        try:
+            stream = client.chat.completions.create(
+                model=app.config['OPENAI_MODEL'],
+                messages=messages,
+                max_tokens=100,
+                temperature=0.7,
+                stream=True
+            )
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    tokens.append(token)
+                    yield sse_event({'token': token})
+            
+            ai_response = "".join(tokens).strip()
+            is_final = is_final_chat_turn(ai_response, user_message)
+            
+        except Exception as e:
+            print(f"OpenAI streaming error: {e}")
+            if tokens:
+                # Keep whatever was already shown to the user
+                ai_response = "".join(tokens).strip()
+                is_final = is_final_chat_turn(ai_response, user_message)
+            else:
+                ai_response, is_final = fallback_chat_response(user_message)
+        
+        # is_final can only be decided once the whole completion is known
+        final_event = {'response': ai_response, 'is_final': is_final, 'done': True}
+        if on_complete:
+            final_event.update(on_complete(ai_response))
+        yield sse_event(final_event)
+
+    def chat_event_stream(events):
+        """Wrap an SSE generator in an unbuffered streaming response."""
+        return app.response_class(
+            stream_with_context(events),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @app.route('/api/chat/<question_id>', methods=['POST'])
+    def chat_response(question_id):
+        data = request.get_json()
+        user_message = data.get('message', '').strip()
+        chat_history = data.get('chat_history', [])
+        feedback_request_id = data.get('feedback_request_id')
+        
+        # Clients opt into token streaming; plain JSON stays the default
+        stream = bool(data.get('stream')) or request.accept_mimetypes.best == 'text/event-stream'
+        
+        # Get the original question and template to provide context
+        question = Question.query.get_or_404(question_id)
+        template = FeedbackTemplate.query.get_or_404(question.template_id)
+        
+        # A survey chat reads and rewrites the request's stored transcript, so only
+        # the assignee may use it, for the request's own questions, until submission
+        feedback_request = None
+        if feedback_request_id:
+            user = auto_login_dev_user()
+            if not user:
+                return jsonify({'success': False, 'error': 'Authentication required'}), 401
+            allowed = check_request_access(feedback_request_id, user, complete=True)
+            if allowed is None:
+                abort(404)
+            if not allowed:
+                return jsonify({'success': False, 'error': 'Permission denied'}), 403
+            feedback_request = db.session.get(FeedbackRequest, feedback_request_id)
+            if question.template_id != feedback_request.template_id:
+                abort(404)
+            submitted = db.session.query(Response.id)\
+                .filter_by(feedback_request_id=feedback_request.id, is_draft=False).first()
+            if feedback_request.status == 'completed' or submitted:
+                return jsonify({'success': False, 'error': 'Feedback has already been submitted'}), 403
+        
+        # Clients that send a sequence number get their history replayed from
+        # the server instead of uploading it every turn
+        seq = data.get('seq')
+        conversation = None
+        if seq is not None and feedback_request:
+            conversation = conversation_key('survey', feedback_request.id, question.id)
+            try:
+                chat_history = begin_turn(conversation, int(seq), data.get('chat_history'))
+            except ChatSequenceError as e:
+                return jsonify({'error': 'Chat history out of sync', 'expected_seq': e.expected_seq}), 409
+        
+        def finish_turn(ai_response):
+            """Store the turn server-side and report the next sequence number."""
+            if conversation is None:
+                return {}
+            try:
+                next_seq = record_turn(conversation, int(seq), user_message, ai_response)
+            except ChatSequenceError as e:
+                print(f"Chat turn not recorded: {e}")
+                return {}
+            # Keep the discussion draft in step with the stored transcript, so the
+            # page never has to upload the whole conversation to autosave it
+            save_draft_answers(feedback_request.id, {question.id: {
+                'type': 'discussion',
+                'chat_history': chat_history + [
+                    {'role': 'user', 'content': user_message},
+                    {'role': 'assistant', 'content': ai_response}
+                ]
+            }})
+            db.session.commit()
+            invalidate_prior_context(feedback_request.id)
+            if app.config['ROLLING_SUMMARIES_ENABLED']:
+                schedule_rolling_summary(feedback_request.id, question.id)
+            return {'seq': next_seq}
+        
+        try:
+            client = get_llm_client()
+            messages = build_chat_messages(question, template, feedback_request, chat_history, user_message, conversation)
+            
+            if stream:
+                return chat_event_stream(stream_chat_response(client, messages, user_message, on_complete=finish_turn))
             
             # Call OpenAI API
             response = client.chat.completions.create(
@@ -626,43 +1674,26 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
             
             ai_response = response.choices[0].message.content.strip()
             
-            # Check if this should be the final message
-            is_final = (
-                "thank you for that detailed feedback" in ai_response.lower() or
-                "done" in user_message.lower() or 
-                "nothing else" in user_message.lower() or
-                "that's all" in user_message.lower()
-            )
-            
             return jsonify({
                 'response': ai_response,
-                'is_final': is_final
+                'is_final': is_final_chat_turn(ai_response, user_message),
+                **finish_turn(ai_response)
             })
             
         except Exception as e:
             # Fallback to simple responses if OpenAI fails
             print(f"OpenAI API error: {e}")
             
-            follow_up_questions = [
-                "Can you share a specific example?",
-                "How has this impacted the team or project?", 
-                "What made this particularly effective or challenging?",
-                "Is there anything else you'd like to add?"
-            ]
+            response, is_final = fallback_chat_response(user_message)
+            turn = finish_turn(response)
             
-            # Simple fallback logic
-            if len(user_message) < 20:
-                response = follow_up_questions[0]
-            elif "example" not in user_message.lower():
-                response = follow_up_questions[0]
-            elif len(user_message) < 50:
-                response = follow_up_questions[1]
-            else:
-                response = follow_up_questions[3]
+            if stream:
+                return chat_event_stream(iter([sse_event({'response': response, 'is_final': is_final, 'done': True, **turn})]))
             
             return jsonify({
                 'response': response,
-                'is_final': 'done' in user_message.lower() or 'nothing' in user_message.lower()
+                'is_final': is_final,
+                **turn
             })
 
     @app.route('/review/<request_id>', methods=['GET', 'POST'])
@@ -671,47 +1702,58 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
         questions = Question.query.filter_by(template_id=feedback_request.template_id).order_by(Question.order_index).all()
         
         if request.method == 'POST':
-            # Save responses from the survey
+            # Save responses from the survey, touching only changed answers
             responses_data = request.get_json()
+            needs_summary = save_draft_answers(request_id, responses_data, replace=True)
+            
+            # Collect discussions to summarize together
+            questions_by_id = {q.id: q for q in questions}
+            rolling_summaries = {
+                s.question_id: s for s in DiscussionSummary.query.filter_by(feedback_request_id=request_id)
+            } if needs_summary else {}
+            is_supervisor_feedback = feedback_request.template.is_supervisor_feedback
+            summary_updates = {}
+            discussions = {}
+            
+            for question_id, (response_id, chat_history) in needs_summary.items():
+                # Get the question text for context
+                question_obj = questions_by_id.get(question_id) or Question.query.get(question_id)
+                rolling = rolling_summaries.get(question_id)
+                if rolling and rolling.content_hash == discussion_hash(question_obj.question_text, chat_history, is_supervisor_feedback):
+                    # Already summarized during the chat
+                    summary_updates[response_id] = rolling.summary
+                else:
+                    discussions[response_id] = (
+                        question_obj.question_text,
+                        chat_history,
+                        is_supervisor_feedback
+                    )
             
-            # Clear existing draft responses
-            Response.query.filter_by(feedback_request_id=request_id, is_draft=True).delete()
-            
-            # Save new responses
-            for question_id, response_data in responses_data.items():
-                response = Response(
-                    feedback_request_id=request_id,
-                    question_id=question_id,
-                    is_draft=True
+            if app.config['JOB_QUEUE_ENABLED']:
+                # Leave summaries pending and let a worker generate them
+                set_draft_summaries(summary_updates)
+                db.session.commit()
+                invalidate_prior_context(request_id)
+                job = enqueue_job(
+                    'review_summaries',
+                    {'feedback_request_id': request_id},
+                    key=request_id,
+                    created_by_id=current_user.id if current_user.is_authenticated else None
                 )
-                
-                if response_data['type'] == 'rating':
-                    response.rating_value = None if response_data['value'] == '' else (
-                        None if response_data['value'] == 'na' else int(response_data['value'])
-                    )
-                elif response_data['type'] == 'agreement':
-                    response.agreement_value = None if response_data['value'] == '' else (
-                        None if response_data['value'] == 'na' else response_data['value']
-                    )
-                else:  # discussion
-                    response.chat_history = json.dumps(response_data.get('chat_history', []))
-                    # Generate AI-powered summary from full conversation
-                    chat_history = response_data.get('chat_history', [])
-                    if chat_history:
-                        # Get the question text and template for context
-                        question_obj = Question.query.get(question_id)
-                        template_obj = FeedbackTemplate.query.get(question_obj.template_id)
-                        response.discussion_summary = generate_feedback_summary(
-                            question_obj.question_text, 
-                            chat_history,
-                            template_obj.is_supervisor_feedback
-                        )
-                    else:
-                        response.discussion_summary = 'No response provided'
-                
-                db.session.add(response)
+                return jsonify({'success': True, 'job_id': job.id})
+            
+            # Generate AI-powered summaries for all discussions concurrently
+            summaries = generate_feedback_summaries(
+                discussions,
+                max_workers=app.config['SUMMARY_MAX_WORKERS'],
+                timeout=app.config['SUMMARY_TIMEOUT']
+            )
+            summary_updates.update(summaries)
+            set_draft_summaries(summary_updates)
             
             db.session.commit()
+            invalidate_prior_context(request_id)
+            remember_summaries(discussions, summaries)
             return jsonify({'success': True})
         
         responses = Response.query.filter_by(feedback_request_id=request_id, is_draft=True).all()
@@ -742,14 +1784,50 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
                              questions=questions_dict, 
                              responses=responses_dict)
 
+    @app.route('/api/drafts/<request_id>/<question_id>', methods=['POST'])
+    @login_required
+    def autosave_answer(request_id, question_id):
+        """Save one survey answer as a draft as soon as it changes."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        
+        allowed = check_request_access(request_id, user, complete=True)
+        if allowed is None:
+            abort(404)
+        if not allowed:
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        Question.query.join(FeedbackRequest, FeedbackRequest.template_id == Question.template_id)\
+            .filter(Question.id == question_id, FeedbackRequest.id == request_id).first_or_404()
+        
+        answer = request.get_json() or {}
+        if answer.get('type') not in ('rating', 'agreement', 'discussion'):
+            return jsonify({'success': False, 'error': 'Invalid answer type'}), 400
+        try:
+            save_draft_answers(request_id, {question_id: answer})
+        except (KeyError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid answer'}), 400
+        
+        db.session.commit()
+        invalidate_prior_context(request_id)
+        return jsonify({'success': True})
+
     @app.route('/submit/<request_id>', methods=['POST'])
     def submit_feedback(request_id):
         # Update all draft responses to submitted
         responses = Response.query.filter_by(feedback_request_id=request_id, is_draft=True).all()
+        new_session = Response.query.filter_by(feedback_request_id=request_id, is_draft=False).first() is None
         for response in responses:
             response.is_draft = False
             response.submitted_at = datetime.utcnow()
         
+        feedback_request = db.session.get(FeedbackRequest, request_id)
+        if feedback_request:
+            record_submission(feedback_request, responses, new_session)
+        
+        # The survey transcripts now live on the submitted responses
+        delete_conversations(conversation_key('survey', request_id, ''))
+        DiscussionSummary.query.filter_by(feedback_request_id=request_id).delete()
         db.session.commit()
         flash('Feedback submitted successfully!')
         return redirect(url_for('thank_you'))
@@ -766,60 +1844,59 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
         if not user:
             return redirect(url_for('auth_login'))
         
-        # Organize requests by user role (email-first approach)
-        if user.is_admin:
-            # Admins see all requests
-            all_requests = FeedbackRequest.query.order_by(FeedbackRequest.created_at.desc()).all()
-            requests_by_role = {
-                'created_by_me': all_requests,
-                'assigned_to_me': [],
-                'about_me': []
-            }
-        else:
-            # Separate requests by the user's role
-            # 1. Requests I created (as manager/HR)
-            created_by_me = FeedbackRequest.query.filter(
-                FeedbackRequest.created_by_id == user.id
-            ).order_by(FeedbackRequest.created_at.desc()).all()
-            
-            # 2. Requests assigned to me (feedback I need to give)
-            assigned_to_me = FeedbackRequest.query.filter(
-                (FeedbackRequest.assigned_to_email == user.email) |
-                # Legacy fallback
-                (FeedbackRequest.assigned_to_id == user.id)
-            ).filter(
-                FeedbackRequest.created_by_id != user.id  # Exclude my own requests
-            ).order_by(FeedbackRequest.created_at.desc()).all()
-            
-            # 3. Feedback about me (I'm the target)
-            about_me = FeedbackRequest.query.filter(
-                FeedbackRequest.target_email == user.email
-            ).filter(
-                FeedbackRequest.created_by_id != user.id  # Exclude my own requests
-            ).order_by(FeedbackRequest.created_at.desc()).all()
-            
-            requests_by_role = {
-                'created_by_me': created_by_me,
-                'assigned_to_me': assigned_to_me,
-                'about_me': about_me
-            }
+        limit = page_size(request.args.get('limit'), app.config['DASHBOARD_PAGE_SIZE'], app.config['MAX_PAGE_SIZE'])
+        
+        # First page of each role bucket, plus totals for the badges and summary cards
+        requests_by_role = {}
+        role_totals = {}
+        next_cursors = {}
+        for role in DASHBOARD_ROLES:
+            query = dashboard_role_query(user, role)
+            if query is None:
+                requests_by_role[role], next_cursors[role], role_totals[role] = [], None, 0
+                continue
+            requests_by_role[role], next_cursors[role] = load_dashboard_page(query, limit=limit)
+            # Capped so an admin's bucket doesn't count the whole table
+            role_totals[role] = count_label(query, app.config['DASHBOARD_COUNT_CAP'])
+        
+        # Add submission counts for each role from one grouped query
+        submitted_counts = count_submitted_responses(
+            {feedback_request.id for requests in requests_by_role.values() for feedback_request in requests}
+        )
+        role_data = {
+            role: dashboard_rows(requests, submitted_counts)
+            for role, requests in requests_by_role.items()
+        }
         
-        # Add submission counts for each role
-        role_data = {}
-        for role, requests in requests_by_role.items():
-            requests_with_counts = []
-            for request in requests:
-                submitted_count = Response.query.filter_by(
-                    feedback_request_id=request.id, 
-                    is_draft=False
-                ).count()
-                requests_with_counts.append({
-                    'request': request,
-                    'submitted_count': submitted_count
-                })
-            role_data[role] = requests_with_counts
+        return render_template('dashboard.html', role_data=role_data, role_totals=role_totals,
+                             next_cursors=next_cursors, user=user)
+
+    @app.route('/api/dashboard/<role>')
+    @login_required
+    def dashboard_more(role):
+        """Load the next page of a dashboard role bucket as rendered table rows."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'error': 'Authentication required'}), 401
+        
+        if role not in DASHBOARD_ROLES:
+            return jsonify({'error': 'Unknown dashboard section'}), 404
+        
+        query = dashboard_role_query(user, role)
+        if query is None:
+            return jsonify({'html': '', 'next_cursor': None})
         
-        return render_template('dashboard.html', role_data=role_data, user=user)
+        limit = page_size(request.args.get('limit'), app.config['DASHBOARD_PAGE_SIZE'], app.config['MAX_PAGE_SIZE'])
+        try:
+            requests, next_cursor = load_dashboard_page(query, request.args.get('cursor'), limit)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        rows = dashboard_rows(requests, count_submitted_responses({r.id for r in requests}))
+        return jsonify({
+            'html': render_template('dashboard_rows.html', role=role, items=rows),
+            'next_cursor': next_cursor
+        })
 
     @app.route('/single-player', methods=['GET', 'POST'])
     @login_required
@@ -858,7 +1935,7 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
             
             # Process the form data immediately and redirect to chat with initial guidance
             try:
-                client = openai.OpenAI(api_key=app.config['OPENAI_API_KEY'])
+                client = get_llm_client()
                 
                 # Generate initial guidance immediately
                 initial_guidance = generate_initial_feedback_guidance(
@@ -873,6 +1950,12 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
                     'initial_guidance': initial_guidance
                 }
                 
+                # Start the server-side transcript with the initial guidance
+                replace_conversation(
+                    conversation_key('single-player', user.id),
+                    [{'role': 'assistant', 'content': initial_guidance}]
+                )
+                
                 return redirect(url_for('single_player_chat'))
                 
             except Exception as e:
@@ -895,7 +1978,7 @@ IMPORTANT: Always respond with just ONE question or acknowledgment. Keep respons
             base64_image = base64.b64encode(image_data).decode('utf-8')
             
             # Initialize OpenAI client
-            client = openai.OpenAI(api_key=app.config['OPENAI_API_KEY'])
+            client = get_llm_client()
             
             response = client.chat.completions.create(
                 model="gpt-4o",  # Use GPT-4o which has vision capabilities
@@ -1280,8 +2363,18 @@ Format as markdown with each question as a heading and the response below it."""
         if action != 'start' and not user_message:
             return jsonify({'error': 'Message required'}), 400
         
+        # Clients that send a sequence number get their history replayed from
+        # the server instead of uploading it every turn
+        seq = data.get('seq')
+        conversation = conversation_key('single-player', user.id)
+        if seq is not None and action != 'start':
+            try:
+                chat_history = begin_turn(conversation, int(seq), data.get('chat_history'))
+            except ChatSequenceError as e:
+                return jsonify({'error': 'Chat history out of sync', 'expected_seq': e.expected_seq}), 409
+        
         try:
-            client = openai.OpenAI(api_key=app.config['OPENAI_API_KEY'])
+            client = get_llm_client()
             
             if action == 'start':
                 # Return the pre-generated initial guidance
@@ -1293,12 +2386,17 @@ Format as markdown with each question as a heading and the response below it."""
                     chat_context['relationship_context'], 
                     chat_context.get('form_text'), 
                     user_message, 
-                    chat_history
+                    chat_history,
+                    conversation if seq is not None else None
                 )
             
-            return jsonify({
-                'response': response_text
-            })
+            result = {'response': response_text}
+            if seq is not None and action != 'start':
+                try:
+                    result['seq'] = record_turn(conversation, int(seq), user_message, response_text)
+                except ChatSequenceError as e:
+                    print(f"Chat turn not recorded: {e}")
+            return jsonify(result)
             
         except Exception as e:
             print(f"Single-player chat error: {e}")
@@ -1375,7 +2473,7 @@ TONE: Systematic interviewer who ensures comprehensive coverage of all feedback
         
         return response.choices[0].message.content.strip()
     
-    def handle_feedback_followup(client, relationship_context, form_text, user_message, chat_history):
+    def handle_feedback_followup(client, relationship_context, form_text, user_message, chat_history, conversation=None):
         """Handle follow-up questions in the feedback chat."""
         
         system_prompt = f"""You are a skilled interviewer helping someone think through their feedback for an external form. You ONLY ask questions - you never write feedback content for them.
@@ -1434,8 +2532,8 @@ Based on this analysis, choose your next question to ensure comprehensive covera
             {"role": "system", "content": conversation_analysis}
         ]
         
-        # Add full chat history for complete context and topic tracking
-        for msg in chat_history:
+        # Add chat history for context and topic tracking, compacted to the prompt budget
+        for msg in fit_chat_history('single_player', app.config['SINGLE_PLAYER_TOKEN_BUDGET'], messages, chat_history, user_message, conversation):
             messages.append(msg)
         
         messages.append({
@@ -1519,55 +2617,11 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         if not query or len(query) < 2:
             return jsonify([])
         
-        # Get emails from users
-        user_emails = []
-        users = User.query.filter(User.email.ilike(f'%{query}%')).limit(10).all()
-        for user in users:
-            user_emails.append({
-                'email': user.email,
-                'name': user.name,
-                'type': 'user'
-            })
-        
-        # Get emails from feedback requests (targets and assignees)
-        target_emails = db.session.query(FeedbackRequest.target_email, FeedbackRequest.target_name)\
-            .filter(FeedbackRequest.target_email.ilike(f'%{query}%'))\
-            .distinct().limit(5).all()
-        
-        assigned_emails = db.session.query(FeedbackRequest.assigned_to_email)\
-            .filter(FeedbackRequest.assigned_to_email.ilike(f'%{query}%'))\
-            .distinct().limit(5).all()
-        
-        # Add target emails
-        for target_email, target_name in target_emails:
-            if not any(item['email'] == target_email for item in user_emails):
-                user_emails.append({
-                    'email': target_email,
-                    'name': target_name,
-                    'type': 'target'
-                })
-        
-        # Add assigned emails
-        for (assigned_email,) in assigned_emails:
-            if not any(item['email'] == assigned_email for item in user_emails):
-                user_emails.append({
-                    'email': assigned_email,
-                    'name': assigned_email,
-                    'type': 'assignee'
-                })
-        
-        # Sort by relevance (exact match first, then starts with, then contains)
-        def sort_key(item):
-            email = item['email'].lower()
-            if email == query:
-                return (0, email)
-            elif email.startswith(query):
-                return (1, email)
-            else:
-                return (2, email)
-        
-        user_emails.sort(key=sort_key)
-        return jsonify(user_emails[:10])
+        # Answered from the in-process copy of the contact directory
+        response = jsonify(app.extensions['contact_index'].suggest(query, limit=10))
+        # Lets the browser reuse results when the user retypes a query
+        response.headers['Cache-Control'] = f"private, max-age={app.config['EMAIL_SUGGESTIONS_MAX_AGE']}"
+        return response
 
     @app.route('/aggregate-report')
     @login_required
@@ -1581,6 +2635,15 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         start_date = request.args.get('start_date', '')
         end_date = request.args.get('end_date', '')
         
+        if target_email and not can_view_target(user, target_email):
+            flash('You do not have permission to view feedback about this person.', 'error')
+            target_email = ''
+        # Answer repeat visits from the version query alone
+        etag = page_etag(user, 'aggregate', target_email, start_date, end_date, *aggregate_version(user, target_email))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
         # Get available target people (those who have received feedback)
         if user.is_admin:
             # Admins can see aggregates for anyone
@@ -1597,50 +2660,67 @@ Be editorial in organization and flow while keeping their authentic voice and ob
                 ).distinct().order_by(FeedbackRequest.target_name).all()
         
         feedback_data = []
+        stats = None
         if target_email:
-            # Build date filter
+            # Build date filter; both ends are whole days
             date_filter = []
+            start_day = end_day = None
             if start_date:
                 try:
                     start_dt = datetime.strptime(start_date, '%Y-%m-%d')
                     date_filter.append(FeedbackRequest.created_at >= start_dt)
+                    start_day = start_dt.date()
                 except ValueError:
                     pass
             if end_date:
                 try:
                     end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                    date_filter.append(FeedbackRequest.created_at <= end_dt)
+                    date_filter.append(FeedbackRequest.created_at < end_dt + timedelta(days=1))
+                    end_day = end_dt.date()
                 except ValueError:
                     pass
             
-            # Get all feedback requests for this target email
-            query = FeedbackRequest.query.filter(FeedbackRequest.target_email == target_email)
+            # Headline numbers and distributions come from the precomputed stats,
+            # unless the viewer can only see some of the target's requests
+            if sees_all_target_requests(user, target_email):
+                stats = target_stats(target_email, start_day, end_day)
+            else:
+                stats = scoped_target_stats(target_email, access_condition(user), start_day, end_day)
+            
+            # Submitted responses for the detail cards, in one query
+            query = db.session.query(FeedbackRequest, Response)\
+                .join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+                .filter(FeedbackRequest.target_email == target_email, Response.is_draft == False)\
+                .filter(access_condition(user))\
+                .options(
+                    joinedload(Response.question),
+                    joinedload(FeedbackRequest.template),
+                    joinedload(FeedbackRequest.creator)
+                )
             if date_filter:
                 query = query.filter(*date_filter)
             
-            feedback_requests = query.order_by(FeedbackRequest.created_at.desc()).all()
-            
-            # Get responses for each request
-            for req in feedback_requests:
-                responses = Response.query.filter_by(
-                    feedback_request_id=req.id, 
-                    is_draft=False
-                ).all()
-                
-                if responses:  # Only include requests with actual responses
-                    feedback_data.append({
-                        'request': req,
-                        'responses': responses,
-                        'response_count': len(responses)
-                    })
-        
-        return render_template('aggregate_report.html', 
+            by_request = {}
+            for req, response in query.order_by(FeedbackRequest.created_at.desc(), FeedbackRequest.id).all():
+                if req.id not in by_request:
+                    by_request[req.id] = {'request': req, 'responses': []}
+                    feedback_data.append(by_request[req.id])
+                by_request[req.id]['responses'].append(response)
+            for data in feedback_data:
+                data['response_count'] = len(data['responses'])
+                # A request's card changes only when one of its responses does
+                data['fragment_version'] = max(
+                    (r.updated_at or r.submitted_at or r.created_at for r in data['responses'])
+                ).isoformat() + f"/{data['response_count']}"
+        
+        return with_etag(render_template('aggregate_report.html', 
                              target_email=target_email,
                              start_date=start_date,
                              end_date=end_date,
                              available_targets=available_targets,
                              feedback_data=feedback_data,
-                             user=user)
+                             stats=stats,
+                             user=user), etag)
 
     @app.route('/report/<request_id>')
     @login_required
@@ -1649,15 +2729,22 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         if not user:
             return redirect(url_for('auth_login'))
             
-        feedback_request = FeedbackRequest.query.get_or_404(request_id)
-        
-        # Check if user can access this request
-        if not can_access_request(feedback_request, user):
+        # Check access and read the report's version before loading anything
+        version = report_version(request_id, user)
+        if version is None:
+            abort(404)
+        allowed, version = version
+        if not allowed:
             flash('You do not have permission to view this report.', 'error')
             return redirect(url_for('dashboard'))
+        etag = page_etag(user, 'report', request_id, *version)
+        cached = not_modified(etag)
+        if cached:
+            return cached
         
+        feedback_request = db.session.get(FeedbackRequest, request_id)
         responses = Response.query.filter_by(feedback_request_id=request_id, is_draft=False).all()
-        return render_template('report.html', feedback_request=feedback_request, responses=responses, user=user)
+        return with_etag(render_template('report.html', feedback_request=feedback_request, responses=responses, user=user), etag)
 
     @app.route('/coaching/<request_id>')
     @login_required
@@ -1666,21 +2753,35 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         if not user:
             return redirect(url_for('auth_login'))
             
-        feedback_request = FeedbackRequest.query.get_or_404(request_id)
-        
-        # Check if user can access this request
-        if not can_access_request(feedback_request, user):
+        # Check if user can access this request before loading it
+        allowed = check_request_access(request_id, user)
+        if allowed is None:
+            abort(404)
+        if not allowed:
             flash('You do not have permission to view this coaching guide.', 'error')
             return redirect(url_for('dashboard'))
         
+        feedback_request = db.session.get(FeedbackRequest, request_id)
         responses = Response.query.filter_by(feedback_request_id=request_id, is_draft=False).all()
         questions = Question.query.filter_by(template_id=feedback_request.template_id).order_by(Question.order_index).all()
         
-        # Analyze feedback safety and relationship dynamics
-        safety_analysis = analyze_feedback_safety(responses, feedback_request.template.is_supervisor_feedback)
-        
-        # Generate personalized coaching content
-        coaching_content = generate_personalized_coaching(feedback_request, responses, safety_analysis)
+        if app.config['JOB_QUEUE_ENABLED']:
+            cached = get_cached_coaching_guide(feedback_request, responses) or recent_coaching_fallback(feedback_request, responses)
+            if not cached:
+                # Render a waiting page that polls until a worker has built the guide
+                job = enqueue_job('coaching_guide', {'feedback_request_id': request_id}, key=request_id, created_by_id=user.id)
+                return render_template('coaching.html',
+                                     feedback_request=feedback_request,
+                                     responses=responses,
+                                     questions=questions,
+                                     safety_analysis=None,
+                                     coaching_content=None,
+                                     job_id=job.id,
+                                     user=user)
+            safety_analysis, coaching_content = cached
+        else:
+            # Analyze feedback safety and generate personalized coaching (cached per response content)
+            safety_analysis, coaching_content = get_coaching_guide(feedback_request, responses)
         
         return render_template('coaching.html', 
                              feedback_request=feedback_request, 
@@ -1697,46 +2798,32 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         if not user:
             return jsonify({'success': False, 'error': 'Authentication required'}), 401
             
-        response = Response.query.get_or_404(response_id)
-        feedback_request = FeedbackRequest.query.get_or_404(response.feedback_request_id)
-        
-        # Check if user can access this request
-        if not can_access_request(feedback_request, user):
+        # Check if user can access the response's request before loading anything
+        allowed = check_response_access(response_id, user)
+        if allowed is None:
+            abort(404)
+        if not allowed:
             return jsonify({'success': False, 'error': 'Permission denied'}), 403
         
+        response = db.session.get(Response, response_id)
+        
         data = request.get_json()
         custom_prompt = data.get('custom_prompt', '').strip()
         edited_prompt = data.get('edited_prompt', '').strip()
         
+        if not response.chat_history:
+            return jsonify({'success': False, 'error': 'No chat history available'}), 400
+        
+        if app.config['JOB_QUEUE_ENABLED']:
+            job = enqueue_job('regenerate_summary', {
+                'response_id': response_id,
+                'custom_prompt': custom_prompt,
+                'edited_prompt': edited_prompt
+            }, created_by_id=user.id)
+            return jsonify({'success': True, 'job_id': job.id}), 202
+        
         try:
-            # Get the question and chat history
-            question = Question.query.get_or_404(response.question_id)
-            template = FeedbackTemplate.query.get_or_404(question.template_id)
-            
-            if not response.chat_history:
-                return jsonify({'success': False, 'error': 'No chat history available'}), 400
-            
-            chat_history = json.loads(response.chat_history)
-            
-            # Use edited prompt if provided, otherwise use custom prompt
-            if edited_prompt:
-                new_summary = generate_feedback_summary_with_edited_prompt(
-                    question.question_text, 
-                    chat_history,
-                    edited_prompt
-                )
-            else:
-                # Fallback to custom prompt approach
-                new_summary = generate_feedback_summary_with_custom_prompt(
-                    question.question_text, 
-                    chat_history,
-                    template.is_supervisor_feedback,
-                    custom_prompt
-                )
-            
-            # Update the response
-            response.discussion_summary = new_summary
-            db.session.commit()
+            new_summary = regenerate_response_summary(response, custom_prompt, edited_prompt)
             
             return jsonify({
                 'success': True,
@@ -1747,6 +2834,73 @@ Be editorial in organization and flow while keeping their authentic voice and ob
             print(f"Error regenerating summary: {e}")
             return jsonify({'success': False, 'error': 'Failed to regenerate summary'}), 500
 
+    @app.route('/api/analytics', methods=['GET'])
+    @login_required
+    def feedback_analytics_api():
+        """Rating and agreement distributions, trends and cohort comparison for a target (or the org for admins)."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        
+        target_email = request.args.get('target_email', '')
+        if not target_email and not user.is_admin:
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        if target_email and not can_view_target(user, target_email):
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        
+        bucket = request.args.get('bucket', 'month')
+        if bucket not in BUCKETS:
+            return jsonify({'success': False, 'error': 'Invalid bucket'}), 400
+        try:
+            start = datetime.strptime(request.args['start_date'], '%Y-%m-%d') if request.args.get('start_date') else None
+            end = datetime.strptime(request.args['end_date'], '%Y-%m-%d') + timedelta(days=1) if request.args.get('end_date') else None
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Dates must be YYYY-MM-DD'}), 400
+        
+        if not analytics_available():
+            return jsonify({'success': False, 'error': 'Analytics require numpy to be installed'}), 503
+        # Limit a target's numbers to the requests the viewer can access
+        condition = None if not target_email or sees_all_target_requests(user, target_email) else access_condition(user)
+        return jsonify(feedback_analytics(target_email or None, start, end, bucket, condition))
+
+    @app.route('/api/metrics/tokens', methods=['GET'])
+    @login_required
+    def token_usage_metrics():
+        """Prompt tokens sent and saved by chat history compaction, per endpoint."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        if not user.is_admin:
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        
+        return jsonify(token_metrics.snapshot())
+
+    @app.route('/api/metrics/summary-cache', methods=['GET'])
+    @login_required
+    def summary_cache_metrics():
+        """Discussion summary cache hits and misses in this process."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        if not user.is_admin:
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        
+        return jsonify(summary_cache_stats.snapshot())
+
+    @app.route('/api/jobs/<job_id>', methods=['GET'])
+    @login_required
+    def get_job_status(job_id):
+        """Poll the status of a background job."""
+        user = ensure_authenticated()
+        if not user:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        
+        job = Job.query.get_or_404(job_id)
+        if job.created_by_id and job.created_by_id != user.id and not user.is_admin:
+            return jsonify({'success': False, 'error': 'Permission denied'}), 403
+        
+        return jsonify(job_status(job))
+
     @app.route('/api/get-prompt/<response_id>', methods=['GET'])
     @login_required
     def get_current_prompt(response_id):
@@ -1754,13 +2908,15 @@ Be editorial in organization and flow while keeping their authentic voice and ob
         if not user:
             return jsonify({'success': False, 'error': 'Authentication required'}), 401
             
-        response = Response.query.get_or_404(response_id)
-        feedback_request = FeedbackRequest.query.get_or_404(response.feedback_request_id)
-        
-        # Check if user can access this request
-        if not can_access_request(feedback_request, user):
+        # Check if user can access the response's request before loading anything
+        allowed = check_response_access(response_id, user)
+        if allowed is None:
+            abort(404)
+        if not allowed:
             return jsonify({'success': False, 'error': 'Permission denied'}), 403
         
+        response = db.session.get(Response, response_id)
+        
         try:
             # Get the question and template for context
             question = Question.query.get_or_404(response.question_id)
@@ -0,0 +1,263 @@
+from flask import current_app, request, send_from_directory, url_for
+from flask.cli import AppGroup
+import click
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+import urllib.parse
+import urllib.request
+
+try:
+    import rjsmin
+except ImportError:  # Optional: scripts are bundled unminified without rjsmin
+    rjsmin = None
+
+try:
+    import brotli
+except ImportError:  # Optional: only gzip variants are written without brotli
+    brotli = None
+
+# Third-party files fetched by `flask assets vendor`: path under static/ -> CDN URL.
+# Files referenced by url() in the stylesheets (Font Awesome's webfonts) are fetched alongside.
+VENDOR_FILES = {
+    'vendor/bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+    'vendor/marked/marked.min.js': 'https://cdn.jsdelivr.net/npm/marked@12.0.2/marked.min.js'
+}
+
+# Bundles served as one file each once built: name -> source paths under static/
+BUNDLES = {
+    'vendor.css': ['vendor/bootstrap/bootstrap.min.css', 'vendor/fontawesome/css/all.min.css'],
+    'vendor.js': ['vendor/bootstrap/bootstrap.bundle.min.js', 'vendor/marked/marked.min.js']
+}
+
+# Application sources built one file each, fingerprinted under their own path
+SOURCE_DIRS = ('js', 'css')
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ttf')
+
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+def fingerprinted(path, content):
+    """path with a hash of content before its extension, e.g. js/survey.3f2a9c1b7d4e.js."""
+    root, ext = posixpath.splitext(path)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+def is_local_url(url):
+    return not (url.startswith(('data:', '#', '/')) or urllib.parse.urlsplit(url).scheme)
+
+def minify(path, content):
+    """Minify an application script; vendor files ship minified already."""
+    if rjsmin is None or not path.endswith('.js') or path.endswith('.min.js'):
+        return content
+    return rjsmin.jsmin(content.decode('utf-8')).encode('utf-8')
+
+def write_asset(dist_dir, path, content):
+    """Write a built file and its precompressed variants."""
+    target = os.path.join(dist_dir, *path.split('/'))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(content)
+    if not path.endswith(COMPRESSIBLE):
+        return
+    variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(content, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(target + suffix, 'wb') as f:
+                f.write(compressed)
+
+class AssetBuilder:
+    """Builds fingerprinted files from static/ into a dist directory and records them in a manifest."""
+
+    def __init__(self, static_dir, dist_dir):
+        self.static_dir = static_dir
+        self.dist_dir = dist_dir
+        self.manifest = {}
+        self.skipped = []
+
+    def exists(self, path):
+        return os.path.isfile(os.path.join(self.static_dir, *path.split('/')))
+
+    def read(self, path):
+        with open(os.path.join(self.static_dir, *path.split('/')), 'rb') as f:
+            return f.read()
+
+    def add(self, name, content):
+        built = fingerprinted(name, content)
+        write_asset(self.dist_dir, built, content)
+        self.manifest[name] = built
+        return built
+
+    def add_file(self, path):
+        """Fingerprint a file referenced from a stylesheet, once."""
+        if path not in self.manifest:
+            self.add(path, self.read(path))
+        return self.manifest[path]
+
+    def rewrite_css(self, source_path, bundle_name, css):
+        """Point a stylesheet's relative url()s at the fingerprinted copies, relative to the bundle."""
+        def replace(match):
+            url = match.group(2)
+            if not is_local_url(url):
+                return match.group(0)
+            path, hash_mark, fragment = url.partition('?')[0].partition('#')
+            resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source_path), path))
+            built = self.add_file(resolved)
+            relative = posixpath.relpath(built, posixpath.dirname(bundle_name) or '.')
+            return f"url({relative}{hash_mark}{fragment})"
+        return CSS_URL.sub(replace, css.decode('utf-8')).encode('utf-8')
+
+    def add_bundle(self, name, sources):
+        parts = []
+        for path in sources:
+            content = minify(path, self.read(path))
+            if path.endswith('.css'):
+                content = self.rewrite_css(path, name, content)
+            parts.append(content)
+        # Statement separator in case a script omits its final semicolon
+        separator = b'\n' if name.endswith('.css') else b';\n'
+        return self.add(name, separator.join(parts))
+
+    def build(self):
+        for name, sources in BUNDLES.items():
+            # Pages keep loading a bundle from its sources (or the CDN) until it is vendored
+            if all(self.exists(path) for path in sources):
+                self.add_bundle(name, sources)
+            else:
+                self.skipped.append(name)
+        for directory in SOURCE_DIRS:
+            root = os.path.join(self.static_dir, directory)
+            for dirpath, _, filenames in os.walk(root):
+                for filename in sorted(filenames):
+                    path = posixpath.join(directory, os.path.relpath(os.path.join(dirpath, filename), root).replace(os.sep, '/'))
+                    self.add_bundle(path, [path])
+        with open(os.path.join(self.dist_dir, 'manifest.json'), 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        return self.manifest
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+def vendor_assets(static_dir):
+    """Download VENDOR_FILES and the files their stylesheets reference into static_dir. Returns the paths written."""
+    written = []
+    pending = list(VENDOR_FILES.items())
+    while pending:
+        path, url = pending.pop(0)
+        content = fetch(url)
+        target = os.path.join(static_dir, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+        written.append(path)
+        if path.endswith('.css'):
+            for reference in sorted({m.group(2).partition('?')[0].partition('#')[0]
+                                     for m in CSS_URL.finditer(content.decode('utf-8'))}):
+                if is_local_url(reference):
+                    referenced = posixpath.normpath(posixpath.join(posixpath.dirname(path), reference))
+                    if referenced not in written and all(referenced != p for p, _ in pending):
+                        pending.append((referenced, urllib.parse.urljoin(url, reference)))
+    return written
+
+class Assets:
+    """Serves fingerprinted static assets built by `flask assets build`.
+
+    Templates call asset_url(path) for a file under static/ and
+    asset_urls(bundle) for a bundle from BUNDLES. With a built manifest
+    these return one fingerprinted URL under /assets/, served with
+    far-future cache headers and a precompressed variant when the browser
+    accepts one. Without a build they fall back to the source files (or
+    the CDN for vendor files not yet downloaded), so development needs no
+    build step.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        self.dist_dir = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.dist_dir = app.config.get('ASSET_DIST_DIR') or os.path.join(app.static_folder, 'dist')
+        self.max_age = app.config.get('ASSET_MAX_AGE', 31536000)
+        self.load_manifest()
+        app.extensions['assets'] = self
+        app.add_url_rule('/assets/<path:filename>', 'asset', self.send_asset)
+        app.jinja_env.globals['asset_url'] = self.url
+        app.jinja_env.globals['asset_urls'] = self.urls
+
+    def load_manifest(self):
+        try:
+            with open(os.path.join(self.dist_dir, 'manifest.json')) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def source_url(self, path):
+        if path in VENDOR_FILES and not os.path.exists(os.path.join(current_app.static_folder, *path.split('/'))):
+            return VENDOR_FILES[path]
+        return url_for('static', filename=path)
+
+    def url(self, path):
+        if path in self.manifest:
+            return url_for('asset', filename=self.manifest[path])
+        return self.source_url(path)
+
+    def urls(self, bundle):
+        if bundle in self.manifest:
+            return [url_for('asset', filename=self.manifest[bundle])]
+        return [self.source_url(path) for path in BUNDLES[bundle]]
+
+    def send_asset(self, filename):
+        """Serve a built file, preferring a precompressed variant the client accepts."""
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[candidate] and os.path.isfile(os.path.join(self.dist_dir, *(filename + suffix).split('/'))):
+                encoding = candidate
+                filename += suffix
+                break
+        response = send_from_directory(self.dist_dir, filename, mimetype=mimetype, max_age=self.max_age)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        # File names change with their content, so a copy never goes stale
+        response.headers['Cache-Control'] = f"public, max-age={self.max_age}, immutable"
+        return response
+
+assets_cli = AppGroup('assets', help='Vendor and build static assets.')
+
+@assets_cli.command('vendor')
+def vendor_command():
+    """Download Bootstrap, Font Awesome and marked into static/vendor."""
+    for path in vendor_assets(current_app.static_folder):
+        click.echo(f"Fetched {path}")
+
+@assets_cli.command('build')
+@click.option('--clean', is_flag=True, help='Remove earlier builds first.')
+def build_command(clean):
+    """Bundle, minify, fingerprint and precompress static assets."""
+    assets = current_app.extensions['assets']
+    if clean and os.path.isdir(assets.dist_dir):
+        shutil.rmtree(assets.dist_dir)
+    builder = AssetBuilder(current_app.static_folder, assets.dist_dir)
+    manifest = builder.build()
+    for name, built in sorted(manifest.items()):
+        path = os.path.join(assets.dist_dir, *built.split('/'))
+        sizes = f"{os.path.getsize(path)} bytes"
+        if os.path.exists(path + '.gz'):
+            sizes += f", {os.path.getsize(path + '.gz')} gzipped"
+        click.echo(f"{name} -> {built} ({sizes})")
+    for name in builder.skipped:
+        click.echo(f"Skipped {name}: run `flask assets vendor` first.")
+    if rjsmin is None:
+        click.echo("rjsmin is not installed; scripts were not minified.")
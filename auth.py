@@ -1,22 +1,105 @@
 from flask import current_app, session, request, redirect, url_for, flash
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from functools import wraps
-from models import db, User
+from collections import OrderedDict
+from sqlalchemy import case, event, or_, true
+from sqlalchemy.orm import make_transient_to_detached
+from models import db, User, FeedbackRequest, Response
+from contacts import record_contacts
 from datetime import datetime
+import threading
+import time
 
 login_manager = LoginManager()
 
+class UserCache:
+    """Size-bounded, short-TTL cache of user rows for the Flask-Login user_loader.
+    
+    Entries are dropped when a user row is updated or deleted in this
+    process; the TTL bounds how stale other workers' copies can get.
+    """
+    
+    def __init__(self, ttl=60, max_entries=1000):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.ttl = ttl
+        self.max_entries = max_entries
+    
+    def configure(self, ttl, max_entries):
+        with self._lock:
+            self.ttl = ttl
+            self.max_entries = max_entries
+            self._entries.clear()
+    
+    def get(self, user_id):
+        """Return the cached column values for a user, or None."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+    
+    def put(self, user):
+        values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id=None):
+        """Drop one user, or every user when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+user_cache = UserCache()
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    """Permission and profile changes must not be served from the cache."""
+    user_cache.invalidate(target.id)
+
 def init_auth(app):
     """Initialize authentication system."""
     login_manager.init_app(app)
     login_manager.login_view = 'auth_login'
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
+    user_cache.configure(app.config.get('USER_CACHE_TTL', 60), app.config.get('USER_CACHE_MAX_ENTRIES', 1000))
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID for Flask-Login."""
-    return User.query.get(str(user_id))
+    """Load user by ID for Flask-Login, from the user cache when possible."""
+    user_id = str(user_id)
+    values = user_cache.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user:
+            user_cache.put(user)
+        return user
+    
+    # Attach a copy to this request's session without a query
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+def record_login(user):
+    """Set last_login and commit, at most once per LAST_LOGIN_INTERVAL seconds per user."""
+    now = datetime.utcnow()
+    interval = current_app.config.get('LAST_LOGIN_INTERVAL', 300)
+    if user.last_login and (now - user.last_login).total_seconds() < interval:
+        return False
+    user.last_login = now
+    db.session.commit()
+    return True
 
 def get_or_create_dev_user():
     """Get or create the default development user."""
@@ -35,6 +118,7 @@ def get_or_create_dev_user():
             is_admin=True
         )
         db.session.add(user)
+        record_contacts([(user.email, user.name, 'user')])
         db.session.commit()
     
     return user
@@ -44,8 +128,7 @@ def auto_login_dev_user():
     if current_app.config['LOCAL_DEV_MODE'] and not current_user.is_authenticated:
         user = get_or_create_dev_user()
         if user:
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            record_login(user)
             login_user(user)
             return user
     return current_user if current_user.is_authenticated else None
@@ -133,6 +216,60 @@ def can_complete_request(feedback_request, user=None):
     
     return False
 
+def access_condition(user):
+    """SQL condition for the requests a user can access, matching can_access_request.
+    
+    Use it to filter list queries so requests the user can't see are never loaded.
+    """
+    if user.is_admin:
+        return true()
+    return or_(
+        FeedbackRequest.created_by_id == user.id,
+        FeedbackRequest.target_email == user.email,
+        FeedbackRequest.assigned_to_email == user.email,
+        # Legacy fallback for existing records
+        FeedbackRequest.assigned_to_id == user.id
+    )
+
+def complete_condition(user):
+    """SQL condition for the requests a user can complete, matching can_complete_request."""
+    return or_(
+        FeedbackRequest.assigned_to_email == user.email,
+        # Legacy fallback for existing records
+        FeedbackRequest.assigned_to_id == user.id
+    )
+
+def check_request_access(request_id, user, complete=False):
+    """Authorize a user for a request with one primary-key query, without loading the request.
+    
+    Returns None if the request doesn't exist, otherwise whether the user can
+    access it (or complete it, with complete=True).
+    """
+    condition = complete_condition(user) if complete else access_condition(user)
+    row = db.session.query(case((condition, 1), else_=0))\
+        .filter(FeedbackRequest.id == request_id).first()
+    return None if row is None else bool(row[0])
+
+def check_response_access(response_id, user):
+    """Authorize a user for a response's request in one query. Returns None if the response doesn't exist."""
+    row = db.session.query(case((access_condition(user), 1), else_=0))\
+        .select_from(Response)\
+        .join(FeedbackRequest, FeedbackRequest.id == Response.feedback_request_id)\
+        .filter(Response.id == response_id).first()
+    return None if row is None else bool(row[0])
+
+def can_view_target(user, target_email):
+    """Check if a user can see aggregate feedback about a person: admins, the person, or anyone who requested feedback for them."""
+    if user.is_admin or target_email == user.email:
+        return True
+    return db.session.query(FeedbackRequest.id).filter_by(
+        target_email=target_email, created_by_id=user.id
+    ).first() is not None
+
+def sees_all_target_requests(user, target_email):
+    """Check if a user can access every request about a person, so target-wide totals are theirs to see."""
+    return user.is_admin or target_email == user.email
+
 def get_users_for_assignment():
     """Get list of users that can be assigned feedback requests."""
     return User.query.order_by(User.name).all()
\ No newline at end of file
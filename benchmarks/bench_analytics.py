@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""Benchmark aggregate report analytics: Python loops vs NumPy arrays.
+
+Fills a database with synthetic submitted responses, then computes the
+rating distribution, monthly trend and agreement counts for the whole org
+and for one target (with its cohort comparison). The loop path fetches ORM
+rows and walks them in Python. The vectorized path is
+analytics.feedback_analytics.
+
+Usage: python benchmarks/bench_analytics.py [--responses 1000000] [--targets 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from config import Config
+from auth import get_or_create_dev_user
+from analytics import AGREEMENT_VALUES, feedback_analytics
+from models import db, FeedbackTemplate, FeedbackRequest, Question, Response
+
+ANSWERS_PER_REQUEST = 10
+
+def setup(app, responses, targets):
+    random.seed(0)
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_dev_user()
+        template = FeedbackTemplate(name="Benchmark Template", created_by_id=user.id)
+        db.session.add(template)
+        db.session.flush()
+        questions = [
+            Question(template_id=template.id, question_text=f"Question {i}",
+                     question_type='rating' if i % 2 else 'agreement', order_index=i)
+            for i in range(ANSWERS_PER_REQUEST)
+        ]
+        db.session.add_all(questions)
+        db.session.flush()
+
+        start = datetime(2022, 1, 1)
+        request_rows = []
+        response_rows = []
+        for r in range(responses // ANSWERS_PER_REQUEST):
+            request_id = f'request-{r}'
+            created_at = start + timedelta(minutes=random.randrange(3 * 365 * 24 * 60))
+            request_rows.append({
+                'id': request_id, 'target_email': f'target{r % targets}@example.com', 'target_name': 'Target',
+                'assigned_to_email': f'giver{r % 500}@example.com', 'template_id': template.id,
+                'created_by_id': user.id, 'created_at': created_at
+            })
+            for question in questions:
+                rating = agreement = None
+                if question.question_type == 'rating':
+                    rating = random.randint(1, 5)
+                else:
+                    agreement = random.choice(AGREEMENT_VALUES)
+                response_rows.append({
+                    'feedback_request_id': request_id, 'question_id': question.id, 'rating_value': rating,
+                    'agreement_value': agreement, 'is_draft': False, 'submitted_at': created_at
+                })
+        db.session.bulk_insert_mappings(FeedbackRequest, request_rows)
+        db.session.bulk_insert_mappings(Response, response_rows, render_nulls=True)
+        db.session.commit()
+
+def python_analytics(target_email):
+    """The same numbers from ORM rows and per-row Python loops."""
+    query = db.session.query(FeedbackRequest.target_email, FeedbackRequest.created_at,
+                             Response.rating_value, Response.agreement_value)\
+        .join(Response, Response.feedback_request_id == FeedbackRequest.id)\
+        .filter(Response.is_draft == False)
+    ratings = []
+    agreement_counts = {value: 0 for value in AGREEMENT_VALUES}
+    months = {}
+    target_sums = {}
+    for target, created_at, rating, agreement in query:
+        if rating is not None:
+            total = target_sums.setdefault(target, [0, 0])
+            total[0] += rating
+            total[1] += 1
+        if target_email and target != target_email:
+            continue
+        month = months.setdefault((created_at.year, created_at.month), [0, 0, 0])
+        month[0] += 1
+        if rating is not None:
+            ratings.append(rating)
+            month[1] += rating
+            month[2] += 1
+        if agreement:
+            agreement_counts[agreement] += 1
+
+    ratings.sort()
+    result = {
+        'median': ratings[len(ratings) // 2],
+        'histogram': [ratings.count(value) for value in range(1, 6)],
+        'agreement': agreement_counts,
+        'trend': {key: (count, total / rated if rated else None) for key, (count, total, rated) in sorted(months.items())}
+    }
+    if target_email:
+        target_mean = sum(ratings) / len(ratings)
+        means = [total / count for total, count in target_sums.values()]
+        result['percentile'] = 100 * sum(mean < target_mean for mean in means) / len(means)
+    return result
+
+def timed(label, f):
+    start = time.perf_counter()
+    result = f()
+    elapsed = time.perf_counter() - start
+    print(f"{label:12s} {elapsed:8.2f}s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--responses', type=int, default=1000000)
+    parser.add_argument('--targets', type=int, default=2000)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp()
+
+    class BenchmarkConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+
+    # The engine is created in create_app, so the database has to be set before it
+    app = create_app(BenchmarkConfig)
+    timed('setup', lambda: setup(app, args.responses, args.targets))
+
+    with app.app_context():
+        for label, target_email in (('org', None), ('one target', 'target0@example.com')):
+            print(label)
+            _, loop = timed('  loops', lambda: python_analytics(target_email))
+            _, vectorized = timed('  vectorized', lambda: feedback_analytics(target_email))
+            print(f"  speedup: {loop / vectorized:.1f}x")
+
+    os.close(db_fd)
+    os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Benchmark creating feedback requests one form POST at a time vs in bulk.
+
+The per-row path mirrors create_request: two user lookups and a commit per
+request. The bulk path resolves all emails in one IN query and inserts in
+chunks within a single transaction.
+
+Usage: python benchmarks/bench_bulk_requests.py [--rows 10000] [--chunk-size 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from auth import get_or_create_dev_user
+from bulk_requests import create_requests_bulk
+from models import db, FeedbackTemplate, FeedbackRequest, User
+
+def make_rows(count):
+    # Every tenth giver has an account, like a partially onboarded org
+    return [
+        {'target_email': f'target{i}@example.com', 'target_name': f'Target {i}',
+         'assigned_to_email': f'giver{i % 500}@example.com', 'context': '', 'template_id': ''}
+        for i in range(count)
+    ]
+
+def setup(app):
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_dev_user()
+        template = FeedbackTemplate(name="Benchmark Template", created_by_id=user.id)
+        db.session.add(template)
+        db.session.add_all([User(email=f'giver{i}@example.com', name=f'Giver {i}') for i in range(0, 500, 10)])
+        db.session.commit()
+        return template.id
+
+def create_one_by_one(rows, user, template_id):
+    for row in rows:
+        target_user = User.query.filter_by(email=row['target_email']).first()
+        assigned_user = User.query.filter_by(email=row['assigned_to_email']).first()
+        db.session.add(FeedbackRequest(
+            target_email=row['target_email'],
+            target_name=row['target_name'],
+            target_user_id=target_user.id if target_user else None,
+            assigned_to_email=row['assigned_to_email'],
+            assigned_to_user_id=assigned_user.id if assigned_user else None,
+            context=row['context'],
+            template_id=template_id,
+            created_by_id=user.id,
+            assigned_to_id=assigned_user.id if assigned_user else None
+        ))
+        db.session.commit()
+
+def timed(app, label, f):
+    with app.app_context():
+        FeedbackRequest.query.delete()
+        db.session.commit()
+        start = time.perf_counter()
+        f()
+        elapsed = time.perf_counter() - start
+        count = FeedbackRequest.query.count()
+    print(f"{label:10s} {elapsed:8.2f}s  ({count} requests, {count / elapsed:,.0f}/s)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app()
+    app.config.update({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}"})
+    template_id = setup(app)
+    rows = make_rows(args.rows)
+
+    with app.app_context():
+        user = get_or_create_dev_user()
+        per_row = timed(app, 'per-row', lambda: create_one_by_one(rows, user, template_id))
+        bulk = timed(app, 'bulk', lambda: create_requests_bulk(rows, user, template_id, chunk_size=args.chunk_size))
+
+    print(f"speedup: {per_row / bulk:.1f}x")
+    os.close(db_fd)
+    os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
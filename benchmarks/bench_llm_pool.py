@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Benchmark per-turn chat latency with and without a pooled OpenAI client.
+
+Runs a local stand-in for the chat completions endpoint and compares building
+a fresh client for every turn (the old behaviour) against reusing the pooled
+client from the app's LLM client registry.
+
+Usage: python benchmarks/bench_llm_pool.py [--turns 200] [--latency-ms 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import openai
+from flask import Flask
+from llm import LLMClientRegistry
+
+COMPLETION = {
+    'id': 'chatcmpl-bench',
+    'object': 'chat.completion',
+    'created': 0,
+    'model': 'bench-model',
+    'choices': [{
+        'index': 0,
+        'message': {'role': 'assistant', 'content': 'Can you share a specific example?'},
+        'finish_reason': 'stop'
+    }],
+    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2}
+}
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive chat completions endpoint."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_turns(get_client, turns):
+    """Run chat turns and return per-turn latencies in milliseconds."""
+    latencies = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        client = get_client()
+        client.chat.completions.create(
+            model='bench-model',
+            messages=[{'role': 'user', 'content': 'They are very collaborative'}],
+            max_tokens=100
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<12} mean={statistics.mean(latencies):7.2f}ms  "
+          f"p50={statistics.median(latencies):7.2f}ms  p95={p95:7.2f}ms")
+    return statistics.mean(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--turns', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    StandInHandler.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    app = Flask(__name__)
+    app.config.update(OPENAI_API_KEY='bench-key', OPENAI_BASE_URL=base_url)
+    registry = LLMClientRegistry(app)
+
+    def unpooled_client():
+        return openai.OpenAI(api_key='bench-key', base_url=base_url)
+
+    # Warm up both paths so imports and the first connection are excluded
+    run_turns(unpooled_client, 3)
+    run_turns(registry.get_client, 3)
+
+    print(f"{args.turns} turns against local stand-in ({args.latency_ms}ms server latency)")
+    unpooled = report('per-call', run_turns(unpooled_client, args.turns))
+    pooled = report('pooled', run_turns(registry.get_client, args.turns))
+    print(f"speedup: {unpooled / pooled:.2f}x")
+
+    registry.close()
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
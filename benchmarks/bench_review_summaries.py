@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""Benchmark POST /review/<request_id> with serial vs concurrent summaries.
+
+Uses a stubbed LLM that sleeps for a fixed latency per completion, so the
+wall-clock difference comes only from how summaries are scheduled.
+
+Usage: python benchmarks/bench_review_summaries.py [--questions 6] [--latency-ms 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import unittest.mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app
+from auth import get_or_create_dev_user
+from models import db, FeedbackTemplate, FeedbackRequest, Question
+
+class StubCompletions:
+    """Chat completions stand-in with injected latency."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        response = unittest.mock.Mock()
+        response.choices = [unittest.mock.Mock()]
+        response.choices[0].message.content = "They consistently unblock the team."
+        return response
+
+def setup_request(app, question_count):
+    """Create a request whose template has question_count discussion questions."""
+    with app.app_context():
+        db.create_all()
+        user = get_or_create_dev_user()
+        template = FeedbackTemplate(name="Benchmark Template", created_by_id=user.id)
+        db.session.add(template)
+        db.session.flush()
+        questions = [
+            Question(template_id=template.id, question_text=f"Discussion question {i}?",
+                     question_type='discussion', order_index=i)
+            for i in range(question_count)
+        ]
+        db.session.add_all(questions)
+        feedback_request = FeedbackRequest(
+            target_name="Jane Roe", target_email="jane@example.com",
+            assigned_to_email=user.email, template_id=template.id, created_by_id=user.id
+        )
+        db.session.add(feedback_request)
+        db.session.commit()
+        return feedback_request.id, [q.id for q in questions]
+
+def time_review(app, request_id, question_ids, run):
+    # Vary the chat per run so unchanged drafts and the summary cache don't skip the LLM
+    chat_history = [
+        {'role': 'user', 'content': f'They always help the team ship on time ({run}).'},
+        {'role': 'assistant', 'content': 'Can you share a specific example?'},
+        {'role': 'user', 'content': 'During the launch they paired with everyone on blockers.'}
+    ]
+    payload = {qid: {'type': 'discussion', 'chat_history': chat_history} for qid in question_ids}
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post(f'/review/{request_id}', json=payload)
+    elapsed = time.perf_counter() - start
+    assert response.get_json() == {'success': True}
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--questions', type=int, default=6)
+    parser.add_argument('--latency-ms', type=float, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    db_fd, db_path = tempfile.mkstemp()
+    app = create_app()
+    app.config.update({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}"})
+    request_id, question_ids = setup_request(app, args.questions)
+
+    stub_client = unittest.mock.Mock()
+    stub_client.chat.completions = StubCompletions(args.latency_ms / 1000)
+
+    print(f"{args.questions} discussion questions, {args.latency_ms:.0f}ms per LLM call")
+    with unittest.mock.patch('openai.OpenAI', return_value=stub_client):
+        app.config['SUMMARY_MAX_WORKERS'] = 1
+        serial = time_review(app, request_id, question_ids, 'serial')
+        print(f"serial      {serial * 1000:8.1f}ms")
+
+        app.config['SUMMARY_MAX_WORKERS'] = args.workers
+        concurrent = time_review(app, request_id, question_ids, 'concurrent')
+        print(f"concurrent  {concurrent * 1000:8.1f}ms  (max {args.workers} in flight)")
+
+    print(f"speedup: {serial / concurrent:.2f}x")
+    os.close(db_fd)
+    os.unlink(db_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+from models import db, FeedbackTemplate, FeedbackRequest, User, LOOKUP_CHUNK_SIZE
+from contacts import record_contacts
+from datetime import datetime
+import csv
+import io
+import uuid
+
+# Columns accepted in bulk uploads; template_id may come from the form instead
+BULK_REQUEST_FIELDS = ('target_email', 'target_name', 'assigned_to_email', 'context', 'template_id')
+REQUIRED_FIELDS = ('target_email', 'target_name', 'assigned_to_email')
+
+def normalize_request_row(row):
+    """Keep the known columns of an uploaded row as stripped strings."""
+    return {field: str(row.get(field) or '').strip() for field in BULK_REQUEST_FIELDS}
+
+def parse_requests_csv(stream):
+    """Read request rows from a CSV upload with a header row."""
+    reader = csv.DictReader(io.StringIO(stream.read().decode('utf-8-sig')))
+    return [normalize_request_row(row) for row in reader]
+
+def validate_request_rows(rows, user, default_template_id=None):
+    """Check bulk rows before anything is written. Returns a list of error messages."""
+    errors = []
+    template_ids = {row.get('template_id') or default_template_id for row in rows}
+    known_templates = {
+        t for (t,) in db.session.query(FeedbackTemplate.id).filter(FeedbackTemplate.id.in_(template_ids - {None}))
+    }
+    can_assign_others = user.can_create_requests_for_others or user.is_admin
+
+    for number, row in enumerate(rows, start=1):
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            errors.append(f"Row {number}: missing {', '.join(missing)}")
+        if (row.get('template_id') or default_template_id) not in known_templates:
+            errors.append(f"Row {number}: unknown template")
+        if row.get('assigned_to_email') and row['assigned_to_email'] != user.email and not can_assign_others:
+            errors.append(f"Row {number}: you do not have permission to create feedback requests for others")
+    return errors
+
+def find_users_by_email(emails):
+    """Map email -> user id for every email that has an account, in chunked IN queries."""
+    emails = sorted(set(emails))
+    users = {}
+    for start in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+        chunk = emails[start:start + LOOKUP_CHUNK_SIZE]
+        users.update(db.session.query(User.email, User.id).filter(User.email.in_(chunk)).all())
+    return users
+
+def create_requests_bulk(rows, created_by, default_template_id=None, chunk_size=1000):
+    """Create one feedback request per row with batched inserts.
+
+    Emails are linked to existing accounts with one lookup, and rows are
+    inserted chunk_size at a time in a single transaction. Returns the
+    inserted rows as dicts including their new id.
+    """
+    users = find_users_by_email(
+        [row['target_email'] for row in rows] + [row['assigned_to_email'] for row in rows]
+    )
+    now = datetime.utcnow()
+    mappings = []
+    for row in rows:
+        assigned_user_id = users.get(row['assigned_to_email'])
+        mappings.append({
+            'id': str(uuid.uuid4()),
+            'target_email': row['target_email'],
+            'target_name': row['target_name'],
+            'target_user_id': users.get(row['target_email']),
+            'assigned_to_email': row['assigned_to_email'],
+            'assigned_to_user_id': assigned_user_id,
+            'context': row.get('context') or '',
+            'template_id': row.get('template_id') or default_template_id,
+            'created_by_id': created_by.id,
+            'reviewer_id': None,
+            'status': 'pending',
+            'created_at': now,
+            # Legacy compatibility
+            'assigned_to_id': assigned_user_id
+        })
+
+    for start in range(0, len(mappings), chunk_size):
+        db.session.bulk_insert_mappings(FeedbackRequest, mappings[start:start + chunk_size], render_nulls=True)
+    record_contacts(
+        [(row['target_email'], row['target_name'], 'target') for row in rows] +
+        [(row['assigned_to_email'], row['assigned_to_email'], 'assignee') for row in rows]
+    )
+    db.session.commit()
+    return mappings
+
+def share_links_csv(created, url_root):
+    """Render created requests and their survey links as CSV text."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(['target_name', 'target_email', 'assigned_to_email', 'survey_link'])
+    for row in created:
+        writer.writerow([row['target_name'], row['target_email'], row['assigned_to_email'],
+                         f"{url_root}survey/{row['id']}"])
+    return output.getvalue()
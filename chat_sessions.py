@@ -0,0 +1,97 @@
+from models import db, ChatMessage, ChatSummary
+from sqlalchemy.exc import IntegrityError
+
+class ChatSequenceError(Exception):
+    """The client's sequence number is ahead of the stored conversation."""
+    
+    def __init__(self, expected_seq):
+        super().__init__(f"Expected chat sequence {expected_seq}")
+        self.expected_seq = expected_seq
+
+def conversation_key(*parts):
+    """Build the key a conversation is stored under."""
+    return ':'.join(str(part) for part in parts)
+
+def load_history(key):
+    """Return a conversation's messages in order as role/content dicts."""
+    messages = ChatMessage.query.filter_by(conversation_key=key).order_by(ChatMessage.seq).all()
+    return [{'role': m.role, 'content': m.content} for m in messages]
+
+def replace_conversation(key, messages):
+    """Overwrite a stored conversation with the given role/content messages."""
+    ChatMessage.query.filter_by(conversation_key=key).delete()
+    ChatSummary.query.filter_by(conversation_key=key).delete()
+    db.session.add_all([
+        ChatMessage(conversation_key=key, seq=seq, role=m['role'], content=m['content'])
+        for seq, m in enumerate(messages)
+    ])
+    db.session.commit()
+
+def delete_conversations(prefix):
+    """Drop every conversation whose key starts with prefix. Caller commits."""
+    ChatMessage.query.filter(ChatMessage.conversation_key.startswith(prefix, autoescape=True))\
+        .delete(synchronize_session=False)
+    ChatSummary.query.filter(ChatSummary.conversation_key.startswith(prefix, autoescape=True))\
+        .delete(synchronize_session=False)
+
+def begin_turn(key, seq, chat_history=None):
+    """Return the history a new turn at position seq should be answered with.
+    
+    seq is the number of messages the client already has. A client that is
+    behind (page reload, retried turn) rewinds the conversation to seq,
+    dropping any rolling summary of the removed messages. A client that is
+    ahead raises ChatSequenceError unless it resends its chat_history, which
+    then replaces the stored copy and its summary.
+    """
+    if chat_history is not None:
+        if len(chat_history) < seq:
+            raise ChatSequenceError(len(chat_history))
+        history = [{'role': m['role'], 'content': m['content']} for m in chat_history[:seq]]
+        replace_conversation(key, history)
+        return history
+    
+    history = load_history(key)
+    if seq > len(history):
+        raise ChatSequenceError(len(history))
+    if seq < len(history):
+        ChatMessage.query.filter(ChatMessage.conversation_key == key, ChatMessage.seq >= seq)\
+            .delete(synchronize_session=False)
+        # A rolling summary that covers dropped messages no longer describes the conversation
+        ChatSummary.query.filter(ChatSummary.conversation_key == key, ChatSummary.covered > seq)\
+            .delete(synchronize_session=False)
+        db.session.commit()
+        history = history[:seq]
+    return history
+
+def record_turn(key, seq, user_message, assistant_message):
+    """Append a user message and its reply at seq. Returns the next sequence number."""
+    db.session.add_all([
+        ChatMessage(conversation_key=key, seq=seq, role='user', content=user_message),
+        ChatMessage(conversation_key=key, seq=seq + 1, role='assistant', content=assistant_message)
+    ])
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request recorded this turn first
+        db.session.rollback()
+        raise ChatSequenceError(len(load_history(key)))
+    return seq + 2
+
+def load_summary(key):
+    """Return the (summary, covered) state of a conversation's rolling summary, or None."""
+    row = ChatSummary.query.filter_by(conversation_key=key).first()
+    return (row.summary, row.covered) if row else None
+
+def save_summary(key, summary, covered):
+    """Store a conversation's rolling summary."""
+    row = ChatSummary.query.filter_by(conversation_key=key).first()
+    if row is None:
+        row = ChatSummary(conversation_key=key)
+        db.session.add(row)
+    row.summary = summary
+    row.covered = covered
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent turn saved it first; either summary is usable
+        db.session.rollback()
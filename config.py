@@ -9,6 +9,69 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
     OPENAI_MODEL = os.environ.get('OPENAI_MODEL') or 'gpt-4o'
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL')  # Optional: override for proxies or local stand-ins
+    
+    # OpenAI connection pool settings (one pooled client per worker process)
+    OPENAI_POOL_MAX_CONNECTIONS = int(os.environ.get('OPENAI_POOL_MAX_CONNECTIONS', 20))
+    OPENAI_POOL_MAX_KEEPALIVE = int(os.environ.get('OPENAI_POOL_MAX_KEEPALIVE', 10))
+    OPENAI_POOL_KEEPALIVE_EXPIRY = float(os.environ.get('OPENAI_POOL_KEEPALIVE_EXPIRY', 30))
+    OPENAI_TIMEOUT = float(os.environ.get('OPENAI_TIMEOUT', 60))
+    OPENAI_CONNECT_TIMEOUT = float(os.environ.get('OPENAI_CONNECT_TIMEOUT', 5))
+    
+    # Discussion summaries generated concurrently on review
+    SUMMARY_MAX_WORKERS = int(os.environ.get('SUMMARY_MAX_WORKERS', 4))
+    SUMMARY_TIMEOUT = float(os.environ.get('SUMMARY_TIMEOUT', 30))
+    # Keep each discussion's summary updated after every chat turn so review can reuse it
+    ROLLING_SUMMARIES_ENABLED = os.environ.get('ROLLING_SUMMARIES_ENABLED', 'false').lower() == 'true'
+    # Most discussion summaries kept in the summary cache before the least recently used are evicted
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get('SUMMARY_CACHE_MAX_ENTRIES', 5000))
+    
+    # Rendered report fragments: 'memory' (per-worker LRU), 'filesystem' (shared by workers on a host) or 'none'
+    FRAGMENT_CACHE_BACKEND = os.environ.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    FRAGMENT_CACHE_DIR = os.environ.get('FRAGMENT_CACHE_DIR', '')  # Defaults to instance/fragments
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 2000))
+    
+    # Fingerprinted static assets from `flask assets build`, served under /assets/
+    ASSET_DIST_DIR = os.environ.get('ASSET_DIST_DIR', '')  # Defaults to static/dist
+    ASSET_MAX_AGE = int(os.environ.get('ASSET_MAX_AGE', 31536000))
+    
+    # Seconds a logged-in user's row is served from the per-worker user cache
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1000))
+    # Minimum seconds between last_login writes for the same user
+    LAST_LOGIN_INTERVAL = int(os.environ.get('LAST_LOGIN_INTERVAL', 300))
+    
+    # Seconds before each worker reloads its in-memory contact directory
+    CONTACT_INDEX_TTL = float(os.environ.get('CONTACT_INDEX_TTL', 300))
+    # Seconds browsers may reuse an email suggestion response
+    EMAIL_SUGGESTIONS_MAX_AGE = int(os.environ.get('EMAIL_SUGGESTIONS_MAX_AGE', 60))
+    
+    # Seconds to memoize the prior-question context between chat turns
+    PRIOR_CONTEXT_TTL = float(os.environ.get('PRIOR_CONTEXT_TTL', 300))
+    
+    # Prompt token budgets for chat history; older turns beyond these are summarized
+    CHAT_TOKEN_BUDGET = int(os.environ.get('CHAT_TOKEN_BUDGET', 2000))
+    SINGLE_PLAYER_TOKEN_BUDGET = int(os.environ.get('SINGLE_PLAYER_TOKEN_BUDGET', 4000))
+    CHAT_KEEP_RECENT_MESSAGES = int(os.environ.get('CHAT_KEEP_RECENT_MESSAGES', 6))
+    CHAT_SUMMARY_MAX_TOKENS = int(os.environ.get('CHAT_SUMMARY_MAX_TOKENS', 200))
+    
+    # Background job queue (run worker.py when enabled)
+    JOB_QUEUE_ENABLED = os.environ.get('JOB_QUEUE_ENABLED', 'false').lower() == 'true'
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 5))  # Seconds before the first retry, doubled each time
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', 300))  # Running jobs older than this are retried
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1))
+    COACHING_RETRY_SECONDS = int(os.environ.get('COACHING_RETRY_SECONDS', 300))  # Show a queued guide's fallback this long before retrying the LLM
+    
+    # Keyset pagination for dashboard and template listings
+    DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 25))
+    DASHBOARD_COUNT_CAP = int(os.environ.get('DASHBOARD_COUNT_CAP', 999))  # Totals above this show as "999+"
+    TEMPLATES_PAGE_SIZE = int(os.environ.get('TEMPLATES_PAGE_SIZE', 24))
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
+    
+    # Bulk feedback request creation
+    MAX_BULK_REQUESTS = int(os.environ.get('MAX_BULK_REQUESTS', 10000))
+    BULK_INSERT_CHUNK_SIZE = int(os.environ.get('BULK_INSERT_CHUNK_SIZE', 1000))
     
     # Authentication settings
     LOCAL_DEV_MODE = os.environ.get('LOCAL_DEV_MODE', 'true').lower() == 'true'
@@ -0,0 +1,228 @@
+from bisect import bisect_left, insort
+from flask import current_app, has_app_context
+from flask.cli import AppGroup
+from models import db, Contact, ContactGram, User, FeedbackRequest, LOOKUP_CHUNK_SIZE
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import click
+import threading
+import time
+import uuid
+
+# Lower ranks win when the same email is seen as several kinds
+KIND_RANK = {'user': 0, 'target': 1, 'assignee': 2}
+
+def email_grams(email_lower):
+    """Distinct trigrams of a lowercased email."""
+    return {email_lower[i:i + 3] for i in range(len(email_lower) - 2)}
+
+def record_contacts(entries):
+    """Add or update directory entries from (email, name, kind) tuples. Caller commits.
+    
+    An email keeps the name from its highest-ranked kind, so a user's
+    account name wins over a name typed on a request. The worker's
+    ContactIndex picks the entries up after the commit.
+    """
+    best = {}
+    for email, name, kind in entries:
+        if not email:
+            continue
+        key = email.strip().lower()
+        if key not in best or KIND_RANK[kind] < KIND_RANK[best[key][2]]:
+            best[key] = (email.strip(), name or email.strip(), kind)
+    
+    keys = sorted(best)
+    existing = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        existing.update((c.email_lower, c) for c in Contact.query.filter(Contact.email_lower.in_(chunk)))
+    
+    contacts = []
+    grams = []
+    for key, (email, name, kind) in best.items():
+        contact = existing.get(key)
+        if contact is None:
+            contact_id = str(uuid.uuid4())
+            contacts.append({'id': contact_id, 'email': email, 'email_lower': key, 'name': name, 'kind': kind})
+            grams.extend({'gram': gram, 'contact_id': contact_id} for gram in email_grams(key))
+        elif KIND_RANK[kind] < KIND_RANK[contact.kind]:
+            contact.kind = kind
+            contact.name = name
+    
+    if contacts:
+        db.session.bulk_insert_mappings(Contact, contacts)
+        db.session.bulk_insert_mappings(ContactGram, grams)
+    
+    # The in-memory index only sees these once the caller's commit succeeds
+    db.session.info.setdefault('pending_contacts', []).extend([
+        {'email': c.email, 'email_lower': c.email_lower, 'name': c.name, 'kind': c.kind}
+        for c in existing.values()
+    ] + contacts)
+
+@event.listens_for(Session, 'after_commit')
+def index_committed_contacts(session):
+    """Add contacts recorded in a committed transaction to the in-memory index."""
+    contacts = session.info.pop('pending_contacts', None)
+    index = get_contact_index()
+    if contacts and index is not None:
+        index.add(contacts)
+
+@event.listens_for(Session, 'after_rollback')
+def drop_rolled_back_contacts(session):
+    """Contacts from a rolled-back transaction never existed."""
+    session.info.pop('pending_contacts', None)
+
+def rank_suggestions(query, contacts, limit):
+    """Order contact dicts exact match first, then prefix, then substring matches."""
+    def sort_key(contact):
+        if contact['email_lower'] == query:
+            return (0, contact['email_lower'])
+        if contact['email_lower'].startswith(query):
+            return (1, contact['email_lower'])
+        return (2, contact['email_lower'])
+    
+    return [
+        {'email': c['email'], 'name': c['name'], 'type': c['kind']}
+        for c in sorted(contacts, key=sort_key)[:limit]
+    ]
+
+class ContactIndex:
+    """In-process copy of the contact directory for autocomplete.
+    
+    Emails are kept in a sorted list, so a prefix is a bisect plus a slice,
+    next to the same trigram postings the database keeps. The index is
+    loaded on first use in each worker, updated when a transaction that
+    called record_contacts commits, and reloaded after ttl seconds to pick
+    up contacts added by other workers.
+    """
+    
+    def __init__(self, app=None, ttl=300):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._contacts = {}
+        self._grams = {}
+        self._loaded_at = None
+        self.ttl = ttl
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app):
+        self.ttl = app.config.get('CONTACT_INDEX_TTL', 300)
+        app.extensions['contact_index'] = self
+    
+    def _index(self, contact):
+        key = contact['email_lower']
+        if key not in self._contacts:
+            insort(self._keys, key)
+            for gram in email_grams(key):
+                self._grams.setdefault(gram, set()).add(key)
+        self._contacts[key] = contact
+    
+    def load(self):
+        """Read the whole directory from the database."""
+        rows = db.session.query(Contact.email, Contact.email_lower, Contact.name, Contact.kind).all()
+        with self._lock:
+            self._keys = []
+            self._contacts = {}
+            self._grams = {}
+            for email, email_lower, name, kind in sorted(rows, key=lambda row: row[1]):
+                self._index({'email': email, 'email_lower': email_lower, 'name': name, 'kind': kind})
+            self._loaded_at = time.monotonic()
+    
+    def add(self, contacts):
+        """Add or replace contacts in a loaded index."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for contact in contacts:
+                self._index(contact)
+    
+    def reset(self):
+        with self._lock:
+            self._loaded_at = None
+    
+    def suggest(self, query, limit=10):
+        """Same results as suggest_contacts, answered from memory."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.load()
+        query = query.lower()
+        with self._lock:
+            start = bisect_left(self._keys, query)
+            matches = []
+            for key in self._keys[start:start + limit]:
+                if not key.startswith(query):
+                    break
+                matches.append(self._contacts[key])
+            
+            if len(matches) < limit and len(query) >= 3:
+                postings = [self._grams.get(gram, set()) for gram in email_grams(query)]
+                for key in sorted(min(postings, key=len)):
+                    if query in key and not key.startswith(query):
+                        matches.append(self._contacts[key])
+                        if len(matches) == limit:
+                            break
+        return rank_suggestions(query, matches, limit)
+
+def get_contact_index():
+    """Return the current app's contact index, if it has one."""
+    if has_app_context():
+        return current_app.extensions.get('contact_index')
+    return None
+
+def suggest_contacts(query, limit=10):
+    """Return autocomplete suggestions, exact and prefix matches first.
+    
+    Prefix matches come from a range scan on the email index. For queries of
+    three or more characters, substring matches are filled in from the
+    trigram postings of one of the query's trigrams.
+    """
+    query = query.lower()
+    matches = Contact.query.filter(
+        Contact.email_lower >= query,
+        Contact.email_lower < query + '\U0010ffff'
+    ).order_by(Contact.email_lower).limit(limit).all()
+    
+    if len(matches) < limit and len(query) >= 3:
+        # Grams without punctuation tend to be rarer (e.g. not "@ex" or ".co")
+        grams = sorted(email_grams(query), key=lambda g: (not g.isalnum(), query.index(g)))
+        # Prefix matches were all found above. No ORDER BY, so the scan
+        # stops as soon as enough rows match
+        matches += Contact.query.join(ContactGram, ContactGram.contact_id == Contact.id)\
+            .filter(
+                ContactGram.gram == grams[0],
+                Contact.email_lower.contains(query, autoescape=True),
+                ~Contact.email_lower.startswith(query, autoescape=True)
+            )\
+            .limit(limit - len(matches)).all()
+    
+    return rank_suggestions(query, [
+        {'email': c.email, 'email_lower': c.email_lower, 'name': c.name, 'kind': c.kind} for c in matches
+    ], limit)
+
+def rebuild_contacts():
+    """Rebuild the directory from users and feedback requests. Returns the contact count."""
+    ContactGram.query.delete()
+    Contact.query.delete()
+    entries = [(email, name, 'user') for email, name in db.session.query(User.email, User.name)]
+    entries += [
+        (email, name, 'target') for email, name in
+        db.session.query(FeedbackRequest.target_email, FeedbackRequest.target_name).distinct()
+    ]
+    entries += [
+        (email, email, 'assignee') for (email,) in
+        db.session.query(FeedbackRequest.assigned_to_email).distinct()
+    ]
+    record_contacts(entries)
+    db.session.commit()
+    index = get_contact_index()
+    if index is not None:
+        index.reset()
+    return Contact.query.count()
+
+contacts_cli = AppGroup('contacts', help='Manage the email autocomplete directory.')
+
+@contacts_cli.command('rebuild')
+def rebuild_command():
+    """Rebuild the contact directory from users and feedback requests."""
+    count = rebuild_contacts()
+    click.echo(f"Indexed {count} contacts.")
@@ -0,0 +1,123 @@
+from flask import render_template
+from markupsafe import Markup
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+
+class MemoryBackend:
+    """In-process LRU of rendered fragments."""
+
+    def __init__(self, max_entries=2000):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, version, html):
+        with self._lock:
+            self._entries[key] = (version, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class FileBackend:
+    """Rendered fragments as files in a local directory, shared by all workers on the host."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                version, _, html = f.read().partition('\n')
+        except OSError:
+            return None
+        return version, html
+
+    def set(self, key, version, html):
+        # Write to a temporary file and rename so readers never see a partial fragment
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(f"{version}\n{html}")
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"Error writing fragment cache: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def delete(self, key):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            os.unlink(os.path.join(self.directory, name))
+
+class FragmentCache:
+    """Cache of rendered template fragments for immutable report content.
+
+    Each fragment is stored under a key with the version it was rendered
+    for (e.g. the response's updated_at), and is re-rendered whenever the
+    version differs, so edits never serve stale HTML even across workers.
+    Templates call cached_fragment(key, version, template_name, **context).
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('FRAGMENT_CACHE_BACKEND', 'memory')
+        if backend == 'filesystem':
+            self.backend = FileBackend(app.config.get('FRAGMENT_CACHE_DIR') or os.path.join(app.instance_path, 'fragments'))
+        elif backend == 'memory':
+            self.backend = MemoryBackend(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 2000))
+        else:
+            self.backend = None
+        app.extensions['fragment_cache'] = self
+        app.jinja_env.globals['cached_fragment'] = self.render
+
+    def render(self, key, version, template_name, **context):
+        """Return the HTML for key at version, rendering template_name only on a miss."""
+        version = str(version)
+        if self.backend is not None:
+            cached = self.backend.get(key)
+            if cached is not None and cached[0] == version:
+                return Markup(cached[1])
+        html = render_template(template_name, **context)
+        if self.backend is not None:
+            self.backend.set(key, version, html)
+        return Markup(html)
+
+    def delete(self, *keys):
+        if self.backend is not None:
+            for key in keys:
+                self.backend.delete(key)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
@@ -0,0 +1,132 @@
+from flask import current_app
+from models import db, Job
+from datetime import datetime, timedelta
+import json
+import time
+import traceback
+
+# Job type -> handler(payload) returning a JSON-serializable result
+JOB_HANDLERS = {}
+
+def job_handler(job_type):
+    """Register a function as the handler for a job type."""
+    def decorator(f):
+        JOB_HANDLERS[job_type] = f
+        return f
+    return decorator
+
+def enqueue_job(job_type, payload, key=None, created_by_id=None):
+    """Queue a job and return it. Reuses a queued job of the same type and key."""
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    
+    if key:
+        existing = Job.query.filter_by(job_type=job_type, key=key, status='queued').first()
+        if existing:
+            return existing
+    
+    job = Job(
+        job_type=job_type,
+        key=key,
+        payload=json.dumps(payload),
+        max_attempts=current_app.config['JOB_MAX_ATTEMPTS'],
+        created_by_id=created_by_id
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def claim_next_job():
+    """Atomically claim the oldest runnable job, or return None.
+    
+    Running jobs whose lease has expired (e.g. the worker died) are claimable
+    again and count as another attempt. Once such a job has used all its
+    attempts it is marked failed instead, so a job that keeps crashing or
+    hanging its worker isn't retried forever.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=current_app.config['JOB_LEASE_SECONDS'])
+    stale = (Job.status == 'running') & (Job.started_at < stale_before)
+    
+    if Job.query.filter(stale, Job.attempts >= Job.max_attempts).update({
+        'status': 'failed',
+        'error': 'Worker lease expired on the final attempt',
+        'finished_at': now
+    }, synchronize_session=False):
+        db.session.commit()
+    
+    candidates = Job.query.filter(
+        ((Job.status == 'queued') & (Job.run_after <= now)) |
+        (stale & (Job.attempts < Job.max_attempts))
+    ).order_by(Job.run_after, Job.created_at).limit(5).all()
+    
+    for candidate in candidates:
+        # Only one worker wins the conditional update
+        claimed = Job.query.filter(
+            Job.id == candidate.id,
+            Job.status == candidate.status,
+            Job.attempts == candidate.attempts
+        ).update({
+            'status': 'running',
+            'attempts': Job.attempts + 1,
+            'started_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return Job.query.get(candidate.id)
+    
+    return None
+
+def run_job(job):
+    """Run a claimed job, recording its result or scheduling a retry."""
+    handler = JOB_HANDLERS.get(job.job_type)
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job.job_type}")
+        result = handler(json.loads(job.payload))
+        job.status = 'succeeded'
+        job.result = json.dumps(result)
+        job.error = None
+        job.finished_at = datetime.utcnow()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Job {job.id} ({job.job_type}) failed on attempt {job.attempts}: {e}")
+        traceback.print_exc()
+        job.error = str(e)
+        if handler is not None and job.attempts < job.max_attempts:
+            # Exponential backoff: base, 2x base, 4x base, ...
+            backoff = current_app.config['JOB_RETRY_BACKOFF'] * (2 ** (job.attempts - 1))
+            job.status = 'queued'
+            job.run_after = datetime.utcnow() + timedelta(seconds=backoff)
+        else:
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return job
+
+def run_worker(app, poll_interval=None, once=False):
+    """Process jobs until interrupted. With once=True, drain runnable jobs and return."""
+    with app.app_context():
+        poll_interval = poll_interval or app.config['JOB_POLL_INTERVAL']
+        processed = 0
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    return processed
+                db.session.remove()
+                time.sleep(poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+
+def job_status(job):
+    """Serialize a job for the status polling endpoint."""
+    return {
+        'id': job.id,
+        'type': job.job_type,
+        'status': job.status,
+        'attempts': job.attempts,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error if job.status == 'failed' else None
+    }
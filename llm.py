@@ -0,0 +1,88 @@
+import atexit
+import os
+import threading
+import httpx
+import openai
+from flask import current_app, has_app_context
+from config import Config
+
+class LLMClientRegistry:
+    """App-scoped registry of pooled OpenAI clients.
+
+    Clients are created lazily, one per worker process, and reuse a keep-alive
+    HTTP connection pool across requests instead of building a fresh client
+    (and TLS session) for every LLM call.
+    """
+
+    def __init__(self, app=None):
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.api_key = None
+        self.base_url = None
+        self.max_connections = None
+        self.max_keepalive_connections = None
+        self.keepalive_expiry = None
+        self.timeout = None
+        self.connect_timeout = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read pool settings from the app config and register on the app."""
+        self.api_key = app.config.get('OPENAI_API_KEY')
+        self.base_url = app.config.get('OPENAI_BASE_URL')
+        self.max_connections = app.config.get('OPENAI_POOL_MAX_CONNECTIONS', 20)
+        self.max_keepalive_connections = app.config.get('OPENAI_POOL_MAX_KEEPALIVE', 10)
+        self.keepalive_expiry = app.config.get('OPENAI_POOL_KEEPALIVE_EXPIRY', 30.0)
+        self.timeout = app.config.get('OPENAI_TIMEOUT', 60.0)
+        self.connect_timeout = app.config.get('OPENAI_CONNECT_TIMEOUT', 5.0)
+        app.extensions['llm_clients'] = self
+        atexit.register(self.close)
+
+    def build_http_client(self):
+        """Build an httpx client with keep-alive pooling and timeouts."""
+        return httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        )
+
+    def get_client(self):
+        """Return the pooled client for the current worker process."""
+        pid = os.getpid()
+        client = self._clients.get(pid)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(pid)
+                if client is None:
+                    # Forked workers must not share sockets with their parent,
+                    # so drop clients that belong to other processes.
+                    self._clients = {}
+                    client = openai.OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        http_client=self.build_http_client()
+                    )
+                    self._clients[pid] = client
+        return client
+
+    def close(self):
+        """Close the pooled client for the current worker process."""
+        with self._lock:
+            client = self._clients.pop(os.getpid(), None)
+        if client is not None:
+            client.close()
+
+def get_llm_client():
+    """Get the shared OpenAI client for the current app.
+
+    Falls back to an unpooled client when called outside an app context.
+    """
+    if has_app_context():
+        registry = current_app.extensions.get('llm_clients')
+        if registry is not None:
+            return registry.get_client()
+    return openai.OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL)
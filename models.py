@@ -5,6 +5,9 @@ import uuid
 
 db = SQLAlchemy()
 
+# Keeps IN lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
 class User(UserMixin, db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(255), unique=True, nullable=False)
@@ -46,6 +49,10 @@ class FeedbackTemplate(db.Model):
     
     questions = db.relationship('Question', backref='template', lazy=True)
     requests = db.relationship('FeedbackRequest', backref='template', lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_feedback_template_created_at_id', 'created_at', 'id'),  # Template list keyset pages
+    )
 
 class FeedbackRequest(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -66,11 +73,23 @@ class FeedbackRequest(db.Model):
     status = db.Column(db.String(20), default='pending')  # pending, in_progress, completed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow)  # Versions report page ETags
     
     responses = db.relationship('Response', backref='feedback_request', lazy=True)
     
     # Legacy fields - keeping for backwards compatibility, will be deprecated
     assigned_to_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=True)  # DEPRECATED: use assigned_to_user_id
+    
+    # Composite indexes follow the dashboard buckets, aggregate report and
+    # survey lookups: equality column first, then (created_at, id) for ordering
+    __table_args__ = (
+        db.Index('ix_feedback_request_created_at_id', 'created_at', 'id'),
+        db.Index('ix_feedback_request_created_by_created_at', 'created_by_id', 'created_at', 'id'),
+        db.Index('ix_feedback_request_assigned_email_created_at', 'assigned_to_email', 'created_at'),
+        db.Index('ix_feedback_request_target_email_created_at', 'target_email', 'created_at'),
+        db.Index('ix_feedback_request_assigned_to_id', 'assigned_to_id'),
+        db.Index('ix_feedback_request_template_id', 'template_id'),
+    )
 
 class Question(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -78,6 +97,10 @@ class Question(db.Model):
     question_text = db.Column(db.Text, nullable=False)
     question_type = db.Column(db.String(20), nullable=False)  # 'rating', 'agreement', or 'discussion'
     order_index = db.Column(db.Integer, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_question_template_order', 'template_id', 'order_index'),
+    )
 
 class Response(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -90,5 +113,142 @@ class Response(db.Model):
     is_draft = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     submitted_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True, onupdate=datetime.utcnow)  # Versions cached report fragments
+    
+    question = db.relationship('Question', backref='responses', lazy=True)
+    
+    __table_args__ = (
+        db.Index('ix_response_request_draft', 'feedback_request_id', 'is_draft'),
+        db.Index('ix_response_question_id', 'question_id'),
+    )
+
+class CoachingCache(db.Model):
+    # Generated safety analysis and coaching guide for a request's submitted responses
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    feedback_request_id = db.Column(db.String(36), db.ForeignKey('feedback_request.id'), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False)  # sha256 of the responses and context fed to the prompts
+    prompt_version = db.Column(db.String(20), nullable=False)
+    safety_analysis = db.Column(db.Text, nullable=False)  # JSON string of the safety analysis
+    coaching_content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('feedback_request_id', 'content_hash', 'prompt_version', name='uq_coaching_cache_key'),
+    )
+
+class Job(db.Model):
+    # Background LLM work, run by worker.py
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_type = db.Column(db.String(50), nullable=False)  # handler name registered in jobs.py
+    key = db.Column(db.String(255), nullable=True)  # Optional: dedupes queued jobs for the same subject
+    payload = db.Column(db.Text, nullable=False)  # JSON string of handler arguments
+    status = db.Column(db.String(20), default='queued', nullable=False)  # queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+    result = db.Column(db.Text, nullable=True)  # JSON string returned by the handler
+    error = db.Column(db.Text, nullable=True)  # Last error message
+    created_by_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=True)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # Retry backoff
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),
+    )
+
+class ChatMessage(db.Model):
+    # Server-side chat transcripts, so clients only send the newest message each turn
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    conversation_key = db.Column(db.String(200), nullable=False)  # e.g. survey:<request_id>:<question_id>
+    seq = db.Column(db.Integer, nullable=False)  # Position in the conversation, from 0
+    role = db.Column(db.String(20), nullable=False)  # 'user' or 'assistant'
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('conversation_key', 'seq', name='uq_chat_message_seq'),
+    )
+
+class ChatSummary(db.Model):
+    # Rolling summary of the older turns of a stored chat, kept within the prompt token budget
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    conversation_key = db.Column(db.String(200), unique=True, nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    covered = db.Column(db.Integer, nullable=False)  # Number of leading messages the summary includes
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DiscussionSummary(db.Model):
+    # Discussion summary kept up to date while the giver chats, so review can reuse it
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    feedback_request_id = db.Column(db.String(36), db.ForeignKey('feedback_request.id'), nullable=False)
+    question_id = db.Column(db.String(36), db.ForeignKey('question.id'), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)  # Hash of the chat the summary was generated from
+    summary = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('feedback_request_id', 'question_id', name='uq_discussion_summary_question'),
+    )
+
+class SummaryCache(db.Model):
+    # Discussion summaries keyed by a hash of everything in their prompt, reused across review saves
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    summary = db.Column(db.Text, nullable=False)
+    hits = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)  # LRU eviction order
+
+class Contact(db.Model):
+    # Deduplicated emails from users and feedback requests, backing email autocomplete
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    email = db.Column(db.String(255), nullable=False)
+    email_lower = db.Column(db.String(255), unique=True, nullable=False)  # Prefix range scans
+    name = db.Column(db.String(255), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # user, target or assignee
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ContactGram(db.Model):
+    # Trigram postings over Contact.email_lower for substring matches
+    gram = db.Column(db.String(3), primary_key=True)
+    contact_id = db.Column(db.String(36), db.ForeignKey('contact.id'), primary_key=True)
+
+class TargetQuestionStats(db.Model):
+    # Running totals of submitted answers per target, question and day the request was created
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    target_email = db.Column(db.String(255), nullable=False)
+    period = db.Column(db.Date, nullable=False)
+    question_id = db.Column(db.String(36), db.ForeignKey('question.id'), nullable=False)
+    response_count = db.Column(db.Integer, default=0, nullable=False)
+    rating_count = db.Column(db.Integer, default=0, nullable=False)
+    rating_sum = db.Column(db.Integer, default=0, nullable=False)
+    rating_1 = db.Column(db.Integer, default=0, nullable=False)
+    rating_2 = db.Column(db.Integer, default=0, nullable=False)
+    rating_3 = db.Column(db.Integer, default=0, nullable=False)
+    rating_4 = db.Column(db.Integer, default=0, nullable=False)
+    rating_5 = db.Column(db.Integer, default=0, nullable=False)
+    agreement_strongly_agree = db.Column(db.Integer, default=0, nullable=False)
+    agreement_agree = db.Column(db.Integer, default=0, nullable=False)
+    agreement_disagree = db.Column(db.Integer, default=0, nullable=False)
+    agreement_strongly_disagree = db.Column(db.Integer, default=0, nullable=False)
+    agreement_na = db.Column(db.Integer, default=0, nullable=False)
+    
+    question = db.relationship('Question', lazy=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('target_email', 'period', 'question_id', name='uq_target_question_stats'),
+    )
+
+class TargetGiverStats(db.Model):
+    # Submitted sessions per target, feedback giver and day the request was created
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    target_email = db.Column(db.String(255), nullable=False)
+    period = db.Column(db.Date, nullable=False)
+    giver_email = db.Column(db.String(255), nullable=False)
+    session_count = db.Column(db.Integer, default=0, nullable=False)
+    response_count = db.Column(db.Integer, default=0, nullable=False)
     
-    question = db.relationship('Question', backref='responses', lazy=True)
\ No newline at end of file
+    __table_args__ = (
+        db.UniqueConstraint('target_email', 'period', 'giver_email', name='uq_target_giver_stats'),
+    )
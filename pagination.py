@@ -0,0 +1,56 @@
+from sqlalchemy import and_, func, or_
+from datetime import datetime
+import base64
+
+def encode_cursor(created_at, item_id):
+    """Encode a (created_at, id) keyset position as an opaque URL-safe cursor."""
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor back to (created_at, id). Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, item_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), item_id
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+def page_size(requested, default, maximum):
+    """Clamp a requested page size to 1..maximum, using default when missing or invalid."""
+    try:
+        size = int(requested)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, maximum))
+
+def keyset_page(query, model, cursor=None, limit=25):
+    """Fetch one page of query ordered newest first by (created_at, id).
+    
+    Returns (items, next_cursor); next_cursor is None on the last page. The
+    cursor seeks past the last row of the previous page, so every page costs
+    the same regardless of how deep it is.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < item_id)
+        ))
+    
+    items = query.limit(limit + 1).all()
+    if len(items) > limit:
+        items = items[:limit]
+        return items, encode_cursor(items[-1].created_at, items[-1].id)
+    return items, None
+
+def capped_count(query, cap):
+    """Count query's rows, stopping after cap + 1 so the cost stays bounded however many match."""
+    limited = query.order_by(None).limit(cap + 1).subquery()
+    return query.session.query(func.count()).select_from(limited).scalar()
+
+def count_label(query, cap):
+    """capped_count for display: the exact count up to cap, then e.g. "999+"."""
+    count = capped_count(query, cap)
+    return f"{cap}+" if count > cap else count
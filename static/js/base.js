@@ -0,0 +1,75 @@
+// Poll a background job until it finishes; resolves with its final status
+function pollJob(jobId, intervalMs = 1000) {
+    return fetch(`/api/jobs/${jobId}`)
+        .then(response => response.json())
+        .then(job => {
+            if (job.status === 'succeeded' || job.status === 'failed') {
+                return job;
+            }
+            return new Promise(resolve => setTimeout(resolve, intervalMs))
+                .then(() => pollJob(jobId, intervalMs));
+        });
+}
+
+// Post a chat turn carrying only the new message and its sequence number.
+// If the server's copy of the conversation is behind (409), resend once
+// with the local history so it can resync.
+function postChatTurn(url, body, history, headers = {}) {
+    const send = payload => fetch(url, {
+        method: 'POST',
+        headers: Object.assign({'Content-Type': 'application/json'}, headers),
+        body: JSON.stringify(payload)
+    });
+    return send(body).then(response => {
+        if (response.status !== 409) {
+            return response;
+        }
+        return send(Object.assign({}, body, {chat_history: history}));
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Add loading states to buttons with data-loading attribute
+    document.querySelectorAll('[data-loading]').forEach(function(button) {
+        button.addEventListener('click', function(e) {
+            // Don't add loading state if it's a link with target="_blank" or external link
+            if (button.tagName === 'A' && (button.target === '_blank' || button.href.startsWith('http') && !button.href.includes(window.location.hostname))) {
+                return;
+            }
+
+            const originalText = button.innerHTML;
+            const loadingText = button.getAttribute('data-loading');
+
+            button.innerHTML = `<i class="fas fa-spinner fa-spin me-2"></i>${loadingText}`;
+            button.disabled = true;
+
+            // For forms, don't restore state as page will redirect
+            // For other actions, restore after a delay as fallback
+            if (button.type !== 'submit') {
+                setTimeout(() => {
+                    button.innerHTML = originalText;
+                    button.disabled = false;
+                }, 5000);
+            }
+        });
+    });
+
+    // Add visual feedback for all form submissions
+    document.querySelectorAll('form').forEach(function(form) {
+        form.addEventListener('submit', function(e) {
+            const submitBtn = form.querySelector('button[type="submit"]');
+            if (submitBtn && !submitBtn.disabled) {
+                // Add a subtle loading class to the form
+                form.classList.add('form-submitting');
+
+                // Add loading state if not already handled
+                if (!submitBtn.querySelector('.fa-spinner')) {
+                    const icon = submitBtn.querySelector('i');
+                    if (icon && icon.classList.contains('fas')) {
+                        icon.className = 'fas fa-spinner fa-spin me-2';
+                    }
+                }
+            }
+        });
+    });
+});
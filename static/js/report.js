@@ -0,0 +1,194 @@
+let allTranscriptsVisible = false;
+let currentResponseId = null;
+
+// Function to render markdown content
+function renderMarkdownContent() {
+    document.querySelectorAll('[data-markdown-content]').forEach(element => {
+        const markdownContent = element.getAttribute('data-markdown-content');
+        if (markdownContent) {
+            element.innerHTML = marked.parse(markdownContent);
+        }
+    });
+}
+
+// Function to update summary with markdown rendering
+function updateSummaryWithMarkdown(elementId, content) {
+    const element = document.getElementById(elementId);
+    if (element) {
+        element.setAttribute('data-markdown-content', content);
+        element.innerHTML = marked.parse(content);
+    }
+}
+
+function toggleAllTranscripts() {
+    const button = event.target.closest('button');
+    const icon = button.querySelector('i');
+    const collapseElements = document.querySelectorAll('.chat-transcript .collapse');
+
+    if (!allTranscriptsVisible) {
+        // Show all transcripts
+        collapseElements.forEach(collapse => {
+            new bootstrap.Collapse(collapse, { show: true });
+        });
+        button.innerHTML = '<i class="fas fa-compress me-2"></i>Hide All Transcripts';
+        allTranscriptsVisible = true;
+    } else {
+        // Hide all transcripts
+        collapseElements.forEach(collapse => {
+            new bootstrap.Collapse(collapse, { hide: true });
+        });
+        button.innerHTML = '<i class="fas fa-expand me-2"></i>Show All Transcripts';
+        allTranscriptsVisible = false;
+    }
+}
+
+function showRegenerateModal(responseId, questionText) {
+    currentResponseId = responseId;
+    document.getElementById('modal-question-text').textContent = questionText;
+
+    // Show the inline regenerate section
+    const regenerateSection = document.getElementById('regenerate-section');
+    regenerateSection.style.display = 'block';
+
+    // Scroll to the regenerate section
+    regenerateSection.scrollIntoView({ behavior: 'smooth' });
+
+    // Load current summary with markdown content
+    const currentSummary = document.getElementById(`summary-${responseId}`).getAttribute('data-markdown-content') || 
+                          document.getElementById(`summary-${responseId}`).textContent;
+    document.getElementById('current-summary').innerHTML = marked.parse(currentSummary);
+
+    // Load the current prompt used for this response
+    loadCurrentPrompt(responseId);
+}
+
+function hideRegenerateSection() {
+    document.getElementById('regenerate-section').style.display = 'none';
+    currentResponseId = null;
+}
+
+function loadCurrentPrompt(responseId) {
+    const promptTextarea = document.getElementById('edit-prompt');
+    promptTextarea.value = 'Loading current prompt...';
+    promptTextarea.disabled = true;
+
+    fetch(`/api/get-prompt/${responseId}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                promptTextarea.value = data.prompt;
+                promptTextarea.disabled = false;
+            } else {
+                promptTextarea.value = 'Error loading prompt. Please try again.';
+                promptTextarea.disabled = false;
+            }
+        })
+        .catch(error => {
+            console.error('Error loading prompt:', error);
+            promptTextarea.value = 'Error loading prompt. Please try again.';
+            promptTextarea.disabled = false;
+        });
+}
+
+function regenerateSummary() {
+    if (!currentResponseId) return;
+
+    const editedPrompt = document.getElementById('edit-prompt').value.trim();
+    if (!editedPrompt) {
+        alert('Please provide instructions for how to organize the summary.');
+        return;
+    }
+
+    const button = document.getElementById('confirm-regenerate');
+    const originalText = button.innerHTML;
+
+    // Show loading state
+    button.innerHTML = '<i class="fas fa-spinner fa-spin me-1"></i>Regenerating...';
+    button.disabled = true;
+
+    // Make API call to regenerate summary with edited prompt
+    fetch(`/api/regenerate-summary/${currentResponseId}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            edited_prompt: editedPrompt
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success && data.job_id) {
+            // Regeneration was queued; wait for the worker to finish it
+            return pollJob(data.job_id).then(job => job.status === 'succeeded'
+                ? {success: true, new_summary: job.result.new_summary}
+                : {success: false, error: job.error});
+        }
+        return data;
+    })
+    .then(data => {
+        if (data.success) {
+            // Update the summary in the DOM with markdown rendering
+            updateSummaryWithMarkdown(`summary-${currentResponseId}`, data.new_summary);
+
+            // Update current summary display with markdown rendering
+            document.getElementById('current-summary').innerHTML = marked.parse(data.new_summary);
+
+            // Hide the regenerate section
+            hideRegenerateSection();
+
+            // Show success message
+            const alert = document.createElement('div');
+            alert.className = 'alert alert-success alert-dismissible fade show position-fixed';
+            alert.style.top = '20px';
+            alert.style.right = '20px';
+            alert.style.zIndex = '9999';
+            alert.innerHTML = `
+                <i class="fas fa-check-circle me-2"></i>Summary regenerated successfully!
+                <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+            `;
+            document.body.appendChild(alert);
+
+            // Auto-remove alert after 3 seconds
+            setTimeout(() => {
+                if (alert.parentNode) {
+                    alert.remove();
+                }
+            }, 3000);
+        } else {
+            alert('Error regenerating summary: ' + (data.error || 'Unknown error'));
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error regenerating summary. Please try again.');
+    })
+    .finally(() => {
+        // Reset button state
+        button.innerHTML = originalText;
+        button.disabled = false;
+    });
+}
+
+// Update individual toggle buttons when collapsed/expanded
+document.addEventListener('DOMContentLoaded', function() {
+    // Render all markdown content on page load
+    renderMarkdownContent();
+
+    const collapseElements = document.querySelectorAll('.chat-transcript .collapse');
+
+    collapseElements.forEach(collapse => {
+        collapse.addEventListener('show.bs.collapse', function() {
+            const button = this.previousElementSibling.querySelector('button');
+            button.innerHTML = '<i class="fas fa-chevron-up me-1"></i>Hide Details';
+        });
+
+        collapse.addEventListener('hide.bs.collapse', function() {
+            const button = this.previousElementSibling.querySelector('button');
+            button.innerHTML = '<i class="fas fa-chevron-down me-1"></i>Show Details';
+        });
+    });
+
+    // Add event listener for regenerate button
+    document.getElementById('confirm-regenerate').addEventListener('click', regenerateSummary);
+});
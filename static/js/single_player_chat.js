@@ -0,0 +1,224 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const chatMessages = document.getElementById('chat-messages');
+    const chatInput = document.getElementById('chat-input');
+    const sendBtn = document.getElementById('send-btn');
+    const copyChatBtn = document.getElementById('copy-chat-btn');
+    const generateFinalBtn = document.getElementById('generate-final-btn');
+
+    let isWaitingForResponse = false;
+
+    function scrollToBottom() {
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+
+    function addMessage(content, isUser = false) {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message ${isUser ? 'user-message' : 'ai-message'}`;
+
+        const now = new Date();
+        const timeStr = now.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+
+        messageDiv.innerHTML = `
+            <div class="message-content">
+                ${isUser ? content : marked.parse(content)}
+            </div>
+            <div class="message-time ${isUser ? 'text-end' : ''}">
+                ${timeStr}
+            </div>
+        `;
+
+        chatMessages.appendChild(messageDiv);
+        scrollToBottom();
+    }
+
+    function showTypingIndicator() {
+        const typingDiv = document.createElement('div');
+        typingDiv.className = 'message ai-message typing-indicator-message';
+        typingDiv.innerHTML = `
+            <div class="typing-indicator">
+                <i class="fas fa-robot me-2"></i>
+                <div class="typing-dots">
+                    <div class="typing-dot"></div>
+                    <div class="typing-dot"></div>
+                    <div class="typing-dot"></div>
+                </div>
+            </div>
+        `;
+
+        chatMessages.appendChild(typingDiv);
+        scrollToBottom();
+        return typingDiv;
+    }
+
+    function removeTypingIndicator() {
+        const typingIndicator = chatMessages.querySelector('.typing-indicator-message');
+        if (typingIndicator) {
+            typingIndicator.remove();
+        }
+    }
+
+    let chatHistory = []; // Store chat history locally
+
+    function sendMessage(message, action = 'chat') {
+        if (isWaitingForResponse || (!message && action !== 'start')) return;
+
+        isWaitingForResponse = true;
+        sendBtn.disabled = true;
+
+        // The server keeps the transcript; only the new message and its position are sent
+        const seq = chatHistory.length;
+
+        // Add user message if not the initial start
+        if (action !== 'start') {
+            addMessage(message, true);
+            chatInput.value = '';
+            // Reset textarea height
+            chatInput.style.height = 'auto';
+            chatInput.style.height = '38px';
+            // Add to local chat history
+            chatHistory.push({
+                role: 'user',
+                content: message
+            });
+        }
+
+        // Show typing indicator
+        const typingIndicator = showTypingIndicator();
+
+        // Send to backend
+        postChatTurn('/api/single-player-chat', {
+            message: message,
+            action: action,
+            seq: seq
+        }, chatHistory.slice(0, seq))
+        .then(response => response.json())
+        .then(data => {
+            removeTypingIndicator();
+
+            if (data.error) {
+                addMessage('Sorry, I encountered an error. Please try again.', false);
+            } else {
+                addMessage(data.response, false);
+                // Add AI response to local chat history; the server limits
+                // how much of it is sent to the model
+                chatHistory.push({
+                    role: 'assistant',
+                    content: data.response
+                });
+            }
+        })
+        .catch(error => {
+            removeTypingIndicator();
+            console.error('Error:', error);
+            addMessage('Sorry, I encountered an error. Please try again.', false);
+        })
+        .finally(() => {
+            isWaitingForResponse = false;
+            sendBtn.disabled = false;
+            chatInput.focus();
+        });
+    }
+
+    // Send button click
+    sendBtn.addEventListener('click', function() {
+        const message = chatInput.value.trim();
+        if (message) {
+            sendMessage(message);
+        }
+    });
+
+    // Auto-resize textarea as user types and update character counter
+    const charCounter = document.getElementById('char-counter');
+
+    chatInput.addEventListener('input', function() {
+        this.style.height = 'auto';
+        this.style.height = Math.min(this.scrollHeight, 200) + 'px';
+
+        // Update character counter
+        const currentLength = this.value.length;
+        charCounter.textContent = `${currentLength} / 3000`;
+
+        // Change color when getting close to limit
+        if (currentLength > 2700) {
+            charCounter.classList.add('text-warning');
+            charCounter.classList.remove('text-muted');
+        } else if (currentLength > 2900) {
+            charCounter.classList.add('text-danger');
+            charCounter.classList.remove('text-warning', 'text-muted');
+        } else {
+            charCounter.classList.add('text-muted');
+            charCounter.classList.remove('text-warning', 'text-danger');
+        }
+    });
+
+    // Enter key to send (Ctrl+Enter for new line)
+    chatInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && !e.ctrlKey && !e.shiftKey) {
+            e.preventDefault();
+            const message = this.value.trim();
+            if (message) {
+                sendMessage(message);
+            }
+        }
+    });
+
+    // Quick actions
+    document.querySelectorAll('.quick-action').forEach(button => {
+        button.addEventListener('click', function() {
+            const message = this.getAttribute('data-message');
+            sendMessage(message);
+        });
+    });
+
+    // Copy all chat
+    copyChatBtn.addEventListener('click', function() {
+        const messages = chatMessages.querySelectorAll('.message');
+        let chatText = '';
+
+        messages.forEach(msg => {
+            const content = msg.querySelector('.message-content');
+            const time = msg.querySelector('.message-time');
+            const isUser = msg.classList.contains('user-message');
+
+            if (content && !msg.classList.contains('typing-indicator-message')) {
+                chatText += `${isUser ? 'You' : 'AI Assistant'}: ${content.textContent || content.innerText}\n\n`;
+            }
+        });
+
+        navigator.clipboard.writeText(chatText).then(() => {
+            const originalText = this.innerHTML;
+            this.innerHTML = '<i class="fas fa-check me-1"></i>Copied!';
+            setTimeout(() => {
+                this.innerHTML = originalText;
+            }, 2000);
+        }).catch(err => {
+            console.error('Could not copy text: ', err);
+            alert('Could not copy to clipboard. Please select and copy the text manually.');
+        });
+    });
+
+    // Generate Final Feedback button
+    generateFinalBtn.addEventListener('click', function() {
+        const message = "I'm ready to organize my feedback into final responses for the form.";
+        sendMessage(message);
+    });
+
+    // Render initial guidance with markdown
+    const initialGuidanceEl = document.getElementById('initial-guidance');
+    const initialGuidanceText = initialGuidanceEl.dataset.markdown;
+
+    if (typeof marked !== 'undefined') {
+        initialGuidanceEl.innerHTML = marked.parse(initialGuidanceText);
+    } else {
+        initialGuidanceEl.textContent = initialGuidanceText;
+    }
+
+    // Add initial guidance to chat history for context
+    chatHistory.push({
+        role: 'assistant',
+        content: initialGuidanceText
+    });
+
+    // Focus on input
+    chatInput.focus();
+});
@@ -0,0 +1,234 @@
+let chatData = {};
+// The request being answered, from the survey form's data-request-id
+const feedbackRequestId = document.getElementById('survey-form').dataset.requestId;
+
+// Save one answer as a draft as soon as it changes, so the review save
+// only has to write what changed since.
+function autosaveAnswer(questionId, answer) {
+    fetch(`/api/drafts/${feedbackRequestId}/${questionId}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(answer)
+    }).catch(error => console.error('Autosave failed:', error));
+}
+
+document.querySelectorAll('input[name^="rating_"], input[name^="agreement_"]').forEach(input => {
+    input.addEventListener('change', function() {
+        const [type, questionId] = this.name.split('_');
+        autosaveAnswer(questionId, {type: type, value: this.value});
+    });
+});
+
+document.querySelectorAll('.send-message').forEach(button => {
+    button.addEventListener('click', function() {
+        const questionId = this.dataset.questionId;
+        const textarea = document.querySelector(`textarea[data-question-id="${questionId}"]`);
+        const message = textarea.value.trim();
+
+        if (message) {
+            sendChatMessage(questionId, message);
+            textarea.value = '';
+            textarea.style.height = 'auto'; // Reset height
+            textarea.style.height = (textarea.scrollHeight) + 'px'; // Adjust to content
+        }
+    });
+});
+
+document.querySelectorAll('.chat-input').forEach(textarea => {
+    textarea.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && e.ctrlKey) {
+            e.preventDefault(); // Prevent default behavior
+            const questionId = this.dataset.questionId;
+            const message = this.value.trim();
+
+            if (message) {
+                sendChatMessage(questionId, message);
+                this.value = '';
+                this.style.height = 'auto'; // Reset height
+                this.style.height = (this.scrollHeight) + 'px'; // Adjust to content
+            }
+        }
+    });
+
+    // Auto-resize textarea as user types
+    textarea.addEventListener('input', function() {
+        this.style.height = 'auto';
+        this.style.height = (this.scrollHeight) + 'px';
+    });
+});
+
+function sendChatMessage(questionId, message) {
+    const chatContainer = document.getElementById(`chat_${questionId}`);
+    const scrollableContainer = chatContainer.parentElement; // This is the .chat-container with overflow
+
+    // Add user message
+    const userMessage = document.createElement('div');
+    userMessage.className = 'message user-message mb-2 text-end';
+    userMessage.innerHTML = `
+        <div class="bg-primary text-white p-2 rounded d-inline-block">
+            <strong>You:</strong> ${message}
+        </div>
+    `;
+    chatContainer.appendChild(userMessage);
+
+    // Scroll to bottom with a slight delay to ensure rendering is complete
+    setTimeout(() => {
+        scrollableContainer.scrollTop = scrollableContainer.scrollHeight;
+    }, 10);
+
+    // Initialize chat data for this question if not exists
+    if (!chatData[questionId]) {
+        chatData[questionId] = [];
+    }
+    // The server keeps the transcript; only the new message and its position are sent
+    const seq = chatData[questionId].length;
+    chatData[questionId].push({role: 'user', content: message});
+
+    // Create the assistant bubble up front so streamed tokens render immediately
+    const botMessage = document.createElement('div');
+    botMessage.className = 'message bot-message mb-2';
+    botMessage.innerHTML = `
+        <div class="bg-light p-2 rounded">
+            <strong>Assistant:</strong> <span class="bot-text"><i class="fas fa-ellipsis-h text-muted"></i></span>
+        </div>
+    `;
+    chatContainer.appendChild(botMessage);
+    const botText = botMessage.querySelector('.bot-text');
+
+    // Send to backend for AI response, streaming tokens as they arrive
+    postChatTurn(`/api/chat/${questionId}`, {
+        message: message,
+        seq: seq,
+        feedback_request_id: feedbackRequestId,
+        stream: true
+    }, chatData[questionId].slice(0, seq), {'Accept': 'text/event-stream'})
+    .then(response => readChatStream(response, token => {
+        if (!botText.dataset.started) {
+            botText.dataset.started = 'true';
+            botText.textContent = '';
+        }
+        botText.textContent += token;
+        scrollableContainer.scrollTop = scrollableContainer.scrollHeight;
+    }))
+    .then(data => {
+        botText.textContent = data.response;
+
+        // Scroll to bottom
+        setTimeout(() => {
+            scrollableContainer.scrollTop = scrollableContainer.scrollHeight;
+        }, 10);
+
+        // The server saved this turn to the draft when it recorded it
+        chatData[questionId].push({role: 'assistant', content: data.response});
+
+        if (data.is_final) {
+            // Disable input for this question
+            const input = document.querySelector(`textarea[data-question-id="${questionId}"]`);
+            const button = document.querySelector(`button[data-question-id="${questionId}"]`);
+            input.disabled = true;
+            button.disabled = true;
+
+            // Mark question as complete
+            const questionSection = document.querySelector(`div[data-question-id="${questionId}"]`);
+            questionSection.classList.add('border-success');
+        }
+    });
+}
+
+// Read a Server-Sent Events chat stream, calling onToken for each token.
+// Resolves with the final {response, is_final} event. Falls back to plain
+// JSON if the server answered without streaming.
+function readChatStream(response, onToken) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (!response.body || !contentType.includes('text/event-stream')) {
+        return response.json();
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let finalEvent = null;
+
+    function pump() {
+        return reader.read().then(({done, value}) => {
+            if (done) {
+                return finalEvent || {response: '', is_final: false};
+            }
+            buffer += decoder.decode(value, {stream: true});
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+            frames.forEach(frame => {
+                if (!frame.startsWith('data: ')) {
+                    return;
+                }
+                const event = JSON.parse(frame.slice(6));
+                if (event.done) {
+                    finalEvent = event;
+                } else if (event.token) {
+                    onToken(event.token);
+                }
+            });
+            return pump();
+        });
+    }
+    return pump();
+}
+
+document.getElementById('review-responses').addEventListener('click', function() {
+    // Collect all responses
+    const responses = {};
+
+    // Collect rating responses
+    document.querySelectorAll('input[name^="rating_"]:checked').forEach(input => {
+        const questionId = input.name.split('_')[1];
+        responses[questionId] = {
+            type: 'rating',
+            value: input.value
+        };
+    });
+
+    // Collect agreement responses
+    document.querySelectorAll('input[name^="agreement_"]:checked').forEach(input => {
+        const questionId = input.name.split('_')[1];
+        responses[questionId] = {
+            type: 'agreement',
+            value: input.value
+        };
+    });
+
+    // Collect discussion responses
+    Object.keys(chatData).forEach(questionId => {
+        responses[questionId] = {
+            type: 'discussion',
+            chat_history: chatData[questionId]
+        };
+    });
+
+    // Save responses to backend
+    fetch(`/review/${feedbackRequestId}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(responses)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success && data.job_id) {
+            // Summaries are being generated in the background
+            return pollJob(data.job_id).then(() => {
+                window.location.href = `/review/${feedbackRequestId}`;
+            });
+        } else if (data.success) {
+            window.location.href = `/review/${feedbackRequestId}`;
+        } else {
+            alert('Error saving responses. Please try again.');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error saving responses. Please try again.');
+    });
+});
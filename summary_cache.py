@@ -0,0 +1,106 @@
+from flask.cli import AppGroup
+from models import db, SummaryCache
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import click
+import threading
+
+class CacheStats:
+    """Hit and miss counters for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def snapshot(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+summary_cache_stats = CacheStats()
+
+def get_cached_summaries(content_hashes):
+    """Look up cached summaries by hash in one query. Returns hash -> summary.
+    
+    Marks hits as recently used; the caller's commit persists that.
+    """
+    content_hashes = set(content_hashes)
+    if not content_hashes:
+        return {}
+    
+    rows = SummaryCache.query.filter(SummaryCache.content_hash.in_(content_hashes)).all()
+    now = datetime.utcnow()
+    for row in rows:
+        row.hits += 1
+        row.last_used_at = now
+    summary_cache_stats.record(len(rows), len(content_hashes) - len(rows))
+    return {row.content_hash: row.summary for row in rows}
+
+def store_summaries(summaries_by_hash, max_entries):
+    """Cache new summaries and evict the least recently used beyond max_entries.
+    
+    Commits on its own, so call it after the caller's transaction.
+    """
+    if not summaries_by_hash:
+        return
+    
+    existing = {
+        h for (h,) in db.session.query(SummaryCache.content_hash)
+            .filter(SummaryCache.content_hash.in_(summaries_by_hash.keys()))
+    }
+    db.session.add_all([
+        SummaryCache(content_hash=h, summary=summary)
+        for h, summary in summaries_by_hash.items() if h not in existing
+    ])
+    try:
+        db.session.flush()
+        evict_summaries(max_entries)
+        db.session.commit()
+    except IntegrityError:
+        # Another worker cached the same discussion first
+        db.session.rollback()
+
+def evict_summaries(max_entries):
+    """Delete all but the max_entries most recently used summaries. Caller commits."""
+    stale_ids = db.session.query(SummaryCache.id)\
+        .order_by(SummaryCache.last_used_at.desc(), SummaryCache.id)\
+        .offset(max_entries).all()
+    if stale_ids:
+        SummaryCache.query.filter(SummaryCache.id.in_([i for (i,) in stale_ids]))\
+            .delete(synchronize_session=False)
+    return len(stale_ids)
+
+def purge_summaries(older_than_days=None):
+    """Delete cached summaries, optionally only those unused for older_than_days. Returns the count."""
+    query = SummaryCache.query
+    if older_than_days is not None:
+        query = query.filter(SummaryCache.last_used_at < datetime.utcnow() - timedelta(days=older_than_days))
+    deleted = query.delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+summary_cache_cli = AppGroup('summary-cache', help='Manage the discussion summary cache.')
+
+@summary_cache_cli.command('purge')
+@click.option('--older-than', type=int, default=None, help='Only purge entries unused for this many days.')
+def purge_command(older_than):
+    """Delete cached discussion summaries."""
+    deleted = purge_summaries(older_than)
+    click.echo(f"Purged {deleted} cached summaries.")
+
+@summary_cache_cli.command('stats')
+def stats_command():
+    """Show cache size and lifetime hits."""
+    entries = SummaryCache.query.count()
+    hits = db.session.query(db.func.coalesce(db.func.sum(SummaryCache.hits), 0)).scalar()
+    click.echo(f"{entries} cached summaries, {hits} hits.")
@@ -2,6 +2,7 @@ import pytest
 import tempfile
 import os
 from app import create_app
+from auth import get_or_create_dev_user
 from models import db, FeedbackTemplate, FeedbackRequest, Question, Response
 
 @pytest.fixture
@@ -78,4 +79,49 @@ def sample_feedback_request(app, sample_template):
         
         # Refresh to ensure relationships are loaded
         db.session.refresh(feedback_request)
-        yield feedback_request
\ No newline at end of file
+        yield feedback_request
+@pytest.fixture
+def dev_user(app):
+    """The auto-logged-in development user (admin in local dev mode)."""
+    with app.app_context():
+        user = get_or_create_dev_user()
+        yield user
+
+@pytest.fixture
+def discussion_template(app, dev_user):
+    """A template with a rating question followed by two discussion questions."""
+    with app.app_context():
+        template = FeedbackTemplate(name="Discussion Template", created_by_id=dev_user.id)
+        db.session.add(template)
+        db.session.flush()
+        
+        questions = [
+            Question(template_id=template.id, question_text="How would you rate their communication?",
+                     question_type="rating", order_index=0),
+            Question(template_id=template.id, question_text="What are their greatest strengths?",
+                     question_type="discussion", order_index=1),
+            Question(template_id=template.id, question_text="Where could they grow?",
+                     question_type="discussion", order_index=2)
+        ]
+        db.session.add_all(questions)
+        db.session.commit()
+        
+        db.session.refresh(template)
+        yield template
+
+@pytest.fixture
+def survey_request(app, dev_user, discussion_template):
+    """A feedback request assigned to the dev user using the discussion template."""
+    with app.app_context():
+        feedback_request = FeedbackRequest(
+            target_name="Jane Roe",
+            target_email="jane@example.com",
+            assigned_to_email=dev_user.email,
+            template_id=discussion_template.id,
+            created_by_id=dev_user.id
+        )
+        db.session.add(feedback_request)
+        db.session.commit()
+        
+        db.session.refresh(feedback_request)
+        yield feedback_request
@@ -0,0 +1,90 @@
+import pytest
+import unittest.mock
+from models import db, User, FeedbackRequest, Response
+from auth import access_condition, can_view_target, check_request_access, check_response_access
+from tests.test_dashboard import count_queries
+
+@pytest.fixture
+def member(app):
+    """A non-admin user with no relation to the survey request."""
+    with app.app_context():
+        user = User(email='member@example.com', name='Member', is_admin=False)
+        db.session.add(user)
+        db.session.commit()
+        yield user
+
+def add_request(survey_request, **fields):
+    """Add a request like survey_request with some fields replaced."""
+    values = {'target_email': 'x@example.com', 'target_name': 'X', 'assigned_to_email': 'y@example.com',
+              'template_id': survey_request.template_id, 'created_by_id': survey_request.created_by_id}
+    values.update(fields)
+    db.session.add(FeedbackRequest(**values))
+
+def loaded_requests():
+    return [obj for obj in db.session.identity_map.values() if isinstance(obj, FeedbackRequest)]
+
+class TestRequestAccess:
+    def test_roles(self, app, survey_request, member):
+        """Test the SQL checks against the creator, target, assignee and legacy rules."""
+        with app.app_context():
+            assert check_request_access(survey_request.id, member) is False
+            assert check_request_access('missing', member) is None
+            
+            for field, value in (('created_by_id', member.id), ('target_email', member.email),
+                                 ('assigned_to_email', member.email), ('assigned_to_id', member.id)):
+                add_request(survey_request, **{field: value})
+            db.session.commit()
+            allowed = FeedbackRequest.query.filter(access_condition(member)).count()
+            assert allowed == 4
+            
+            assert check_request_access(survey_request.id, member, complete=True) is False
+            survey_request = db.session.get(FeedbackRequest, survey_request.id)
+            survey_request.assigned_to_email = member.email
+            db.session.commit()
+            assert check_request_access(survey_request.id, member, complete=True) is True
+
+    def test_check_runs_one_query_without_loading_the_request(self, app, survey_request, dev_user):
+        """Test that authorization is a single query that materializes nothing."""
+        with app.app_context():
+            request_id = survey_request.id
+            response = Response(feedback_request_id=request_id, question_id='q', is_draft=False)
+            db.session.add(response)
+            db.session.commit()
+            response_id = response.id
+            user = db.session.get(User, dev_user.id)
+            user.is_admin = False
+            db.session.commit()
+            db.session.refresh(user)
+            db.session.expunge_all()
+            
+            with count_queries(app) as statements:
+                assert check_request_access(request_id, user, complete=True) is True
+                assert check_response_access(response_id, user) is True
+            
+            assert len(statements) == 2
+            assert loaded_requests() == []
+
+    def test_can_view_target(self, app, survey_request, member):
+        """Test who may see aggregate feedback about a person."""
+        with app.app_context():
+            assert can_view_target(member, member.email)
+            assert not can_view_target(member, survey_request.target_email)
+            add_request(survey_request, target_email=survey_request.target_email, created_by_id=member.id)
+            db.session.commit()
+            assert can_view_target(member, survey_request.target_email)
+
+class TestRoutes:
+    def test_denied_and_missing_requests(self, client, app, survey_request, member):
+        """Test that routes authorize before loading and 404 on unknown ids."""
+        with app.app_context():
+            with unittest.mock.patch('app.ensure_authenticated', return_value=member):
+                assert client.get(f'/report/{survey_request.id}').status_code == 302
+                assert client.get(f'/survey/{survey_request.id}').status_code == 302
+                assert client.get('/report/missing').status_code == 404
+                assert client.get('/api/get-prompt/missing').status_code == 404
+                
+                response = client.post(f'/api/drafts/{survey_request.id}/q', json={'type': 'rating', 'value': '3'})
+                assert response.status_code == 403
+                
+                page = client.get(f'/aggregate-report?target_email={survey_request.target_email}')
+                assert 'Feedback Summary' not in page.get_data(as_text=True)
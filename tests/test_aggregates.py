@@ -0,0 +1,138 @@
+import pytest
+import unittest.mock
+from datetime import date, datetime
+from models import db, FeedbackRequest, Question, Response, TargetQuestionStats, TargetGiverStats, User
+from aggregates import record_submission, target_stats, rebuild_target_stats
+from tests.test_dashboard import count_queries
+
+def add_submission(client, dev_user, template, rating, giver=None, created_at=datetime(2024, 3, 15, 9, 30)):
+    """Create a request for jane@example.com with draft answers and submit it."""
+    with client.application.app_context():
+        feedback_request = FeedbackRequest(
+            target_name="Jane Roe", target_email="jane@example.com",
+            assigned_to_email=giver or dev_user.email, template_id=template.id,
+            created_by_id=dev_user.id, created_at=created_at
+        )
+        db.session.add(feedback_request)
+        db.session.flush()
+        rating_question, strengths, _ = Question.query.filter_by(template_id=template.id).order_by(Question.order_index)
+        db.session.add_all([
+            Response(feedback_request_id=feedback_request.id, question_id=rating_question.id, rating_value=rating),
+            Response(feedback_request_id=feedback_request.id, question_id=strengths.id, discussion_summary='Reliable.')
+        ])
+        db.session.commit()
+        request_id = feedback_request.id
+    client.post(f'/submit/{request_id}')
+    return request_id
+
+def add_requesters(app, *emails):
+    """Create non-admin users who can request feedback."""
+    with app.app_context():
+        users = [User(email=email, name=email.split('@')[0].title()) for email in emails]
+        db.session.add_all(users)
+        db.session.commit()
+        for user in users:
+            db.session.refresh(user)
+        # Detached with their columns loaded so tests can use them after this context closes
+        db.session.expunge_all()
+        return users
+
+def rating_stats(stats):
+    return next(item for item in stats['questions'] if item['question'].question_type == 'rating')
+
+class TestIncrementalStats:
+    def test_submissions_update_target_stats(self, client, dev_user, discussion_template):
+        """Test that each submit folds its answers into the precomputed stats."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        add_submission(client, dev_user, discussion_template, rating=2)
+        add_submission(client, dev_user, discussion_template, rating=5, giver='peer@example.com')
+        
+        with client.application.app_context():
+            stats = target_stats('jane@example.com')
+            assert (stats['sessions'], stats['responses'], stats['givers']) == (3, 6, 2)
+            rating = rating_stats(stats)
+            assert rating['rating_mean'] == pytest.approx(11 / 3)
+            assert rating['rating_histogram'] == [0, 1, 0, 1, 1]
+            assert TargetGiverStats.query.count() == 2
+
+    def test_resubmitting_does_not_double_count(self, client, dev_user, discussion_template):
+        """Test that a second submit with no drafts leaves the stats alone."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=3)
+        client.post(f'/submit/{request_id}')
+        
+        with client.application.app_context():
+            stats = target_stats('jane@example.com')
+            assert (stats['sessions'], stats['responses']) == (1, 2)
+
+    def test_agreement_distribution(self, app, dev_user):
+        """Test that agreement answers are counted per value."""
+        with app.app_context():
+            question = Question(template_id='t', question_text='They communicate clearly', question_type='agreement', order_index=0)
+            db.session.add(question)
+            db.session.flush()
+            feedback_request = FeedbackRequest(target_email='jane@example.com', target_name='Jane',
+                                               assigned_to_email=dev_user.email, created_at=datetime(2024, 1, 1))
+            answers = [Response(question_id=question.id, agreement_value=value) for value in ('agree', 'agree', 'na')]
+            record_submission(feedback_request, answers, new_session=True)
+            db.session.commit()
+            
+            agreement = target_stats('jane@example.com')['questions'][0]['agreement']
+            assert agreement == {'strongly_agree': 0, 'agree': 2, 'disagree': 0, 'strongly_disagree': 0, 'na': 1}
+
+    def test_date_range_is_inclusive_by_day(self, client, dev_user, discussion_template):
+        """Test that period filters include whole start and end days."""
+        add_submission(client, dev_user, discussion_template, rating=4, created_at=datetime(2024, 3, 15, 18, 0))
+        add_submission(client, dev_user, discussion_template, rating=2, created_at=datetime(2024, 4, 2))
+        
+        with client.application.app_context():
+            assert target_stats('jane@example.com', end_date=date(2024, 3, 15))['sessions'] == 1
+            assert target_stats('jane@example.com', start_date=date(2024, 3, 16))['sessions'] == 1
+            assert target_stats('jane@example.com', date(2024, 3, 1), date(2024, 4, 30))['sessions'] == 2
+
+    def test_rebuild_matches_incremental_stats(self, client, runner, dev_user, discussion_template):
+        """Test that the rebuild command reproduces the incrementally maintained rows."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        add_submission(client, dev_user, discussion_template, rating=1, giver='peer@example.com')
+        
+        with client.application.app_context():
+            before = target_stats('jane@example.com')
+            result = runner.invoke(args=['aggregates', 'rebuild'])
+            
+            assert 'Rebuilt 4 aggregate rows' in result.output
+            after = target_stats('jane@example.com')
+            assert {k: before[k] for k in ('sessions', 'responses', 'givers')} == \
+                {k: after[k] for k in ('sessions', 'responses', 'givers')}
+            assert rating_stats(after)['rating_histogram'] == rating_stats(before)['rating_histogram']
+
+class TestAggregateReport:
+    def test_query_count_does_not_grow_with_history(self, client, app, dev_user, discussion_template):
+        """Test that the report runs a fixed number of queries however many requests there are."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        with count_queries(app) as few:
+            client.get('/aggregate-report?target_email=jane@example.com')
+        
+        for rating in (1, 2, 3, 5):
+            add_submission(client, dev_user, discussion_template, rating=rating, giver=f'peer{rating}@example.com')
+        with count_queries(app) as many:
+            response = client.get('/aggregate-report?target_email=jane@example.com')
+        
+        assert len(many) == len(few)
+        html = response.get_data(as_text=True)
+        assert 'Question Statistics' in html
+        assert 'Average: 3.0/5' in html
+
+    def test_stats_cover_only_the_viewers_requests(self, client, app, dev_user, discussion_template):
+        """Test that a requester's headline numbers leave out another requester's feedback for the same person."""
+        alice, bob = add_requesters(app, 'alice@example.com', 'bob@example.com')
+        add_submission(client, alice, discussion_template, rating=5, giver=dev_user.email)
+        add_submission(client, bob, discussion_template, rating=1, giver='peer@example.com')
+        
+        with app.app_context(), unittest.mock.patch('app.ensure_authenticated', return_value=alice):
+            html = client.get('/aggregate-report?target_email=jane@example.com').get_data(as_text=True)
+        assert '<h3 class="text-primary">1</h3>' in html
+        assert 'Average: 5.0/5' in html
+        
+        # Admins still see the target-wide totals
+        html = client.get('/aggregate-report?target_email=jane@example.com').get_data(as_text=True)
+        assert '<h3 class="text-primary">2</h3>' in html
+        assert 'Average: 3.0/5' in html
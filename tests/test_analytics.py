@@ -0,0 +1,99 @@
+import pytest
+import unittest.mock
+from datetime import datetime
+from models import db, User
+import analytics
+from tests.test_aggregates import add_requesters, add_submission
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+requires_numpy = pytest.mark.skipif(np is None, reason='numpy is not installed')
+
+@requires_numpy
+class TestAnalyticsFunctions:
+    def test_rating_stats(self):
+        """Test percentiles and histogram, ignoring missing ratings."""
+        stats = analytics.rating_stats(np.array([1, 2, 3, 4, 5, np.nan]))
+        assert stats['count'] == 5
+        assert stats['mean'] == 3.0
+        assert stats['percentiles']['p50'] == 3.0
+        assert stats['histogram'] == [1, 1, 1, 1, 1]
+        assert analytics.rating_stats(np.array([np.nan]))['mean'] is None
+
+    def test_agreement_stats_ignore_na_for_net_agreement(self):
+        """Test the agreement distribution and net agreement."""
+        codes = np.array([0, 1, 1, 2, 4, -1], dtype=np.int8)
+        stats = analytics.agreement_stats(codes)
+        assert stats['distribution'] == {'strongly_agree': 1, 'agree': 2, 'disagree': 1, 'strongly_disagree': 0, 'na': 1}
+        assert stats['net_agreement'] == 0.5
+
+    def test_week_buckets_start_on_monday(self):
+        """Test that weekly trends group dates by the Monday starting their week."""
+        created = np.array(['2024-03-10', '2024-03-11', '2024-03-17'], dtype='datetime64[D]')
+        starts = analytics.bucket_starts(created, 'week')
+        assert [str(day) for day in starts] == ['2024-03-04', '2024-03-11', '2024-03-11']
+
+    def test_cohort_percentile(self):
+        """Test the target's position among other targets' mean ratings."""
+        targets = np.array(['a@example.com', 'b@example.com', 'c@example.com'], dtype=object)
+        comparison = analytics.cohort_comparison(targets, np.array([4.5, 2.0, 3.0]), 'c@example.com')
+        assert comparison == {'targets': 3, 'org_mean_rating': pytest.approx(9.5 / 3),
+                              'target_mean_rating': 3.0, 'target_percentile': pytest.approx(100 / 3)}
+        assert analytics.cohort_comparison(targets, np.array([4.5, 2.0, 3.0]), 'd@example.com')['target_percentile'] is None
+
+class TestAnalyticsApi:
+    @requires_numpy
+    def test_target_trend_and_cohort(self, client, dev_user, discussion_template):
+        """Test the JSON API over submitted feedback."""
+        add_submission(client, dev_user, discussion_template, rating=4, created_at=datetime(2024, 3, 5))
+        add_submission(client, dev_user, discussion_template, rating=2, created_at=datetime(2024, 4, 20))
+        
+        data = client.get('/api/analytics?target_email=jane@example.com').get_json()
+        
+        assert data['ratings']['count'] == 2
+        assert [(p['period'], p['mean_rating']) for p in data['trend']] == [('2024-03-01', 4.0), ('2024-04-01', 2.0)]
+        assert data['cohort']['targets'] == 1
+        assert data['cohort']['target_mean_rating'] == 3.0
+        
+        march = client.get('/api/analytics?target_email=jane@example.com&end_date=2024-03-31').get_json()
+        assert march['ratings']['count'] == 1
+
+    @requires_numpy
+    def test_other_targets_need_permission(self, client, app):
+        """Test that non-admins only see themselves and people they requested feedback for."""
+        with app.app_context():
+            user = User(email='member@example.com', name='Member', is_admin=False)
+            db.session.add(user)
+            db.session.commit()
+            with unittest.mock.patch('app.ensure_authenticated', return_value=user):
+                assert client.get('/api/analytics?target_email=jane@example.com').status_code == 403
+                assert client.get('/api/analytics').status_code == 403
+                assert client.get('/api/analytics?target_email=member@example.com').status_code == 200
+
+    @requires_numpy
+    def test_requesters_only_see_their_requests(self, client, app, dev_user, discussion_template):
+        """Test that a requester's analytics for a person leave out other requesters' feedback."""
+        alice, bob = add_requesters(app, 'alice@example.com', 'bob@example.com')
+        add_submission(client, alice, discussion_template, rating=5, giver=dev_user.email)
+        add_submission(client, bob, discussion_template, rating=1, giver=dev_user.email)
+        
+        with app.app_context(), unittest.mock.patch('app.ensure_authenticated', return_value=alice):
+            data = client.get('/api/analytics?target_email=jane@example.com').get_json()
+        
+        assert data['ratings']['count'] == 1
+        assert data['ratings']['mean'] == 5.0
+        assert 'cohort' not in data
+
+    def test_invalid_parameters(self, client):
+        """Test that bad buckets and dates are rejected."""
+        assert client.get('/api/analytics?bucket=year').status_code == 400
+        assert client.get('/api/analytics?start_date=03/01/2024').status_code == 400
+
+    def test_unavailable_without_numpy(self, client):
+        """Test that the API reports analytics as unavailable when numpy is missing."""
+        with unittest.mock.patch.object(analytics, 'np', None):
+            response = client.get('/api/analytics')
+        assert response.status_code == 503
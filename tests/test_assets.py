@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import pytest
+import unittest.mock
+from assets import AssetBuilder, BUNDLES, VENDOR_FILES, vendor_assets
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """A static folder with one app script and a vendored stylesheet that references a font."""
+    files = {
+        # Long enough that its gzip variant is smaller
+        'js/page.js': ''.join(f"function greet{i}(name) {{\n    // Say hello\n    return `Hello ${{name}}`;\n}}\n" for i in range(20)),
+        'vendor/bootstrap/bootstrap.min.css': 'body{background:url("data:image/svg+xml,%3csvg xmlns=\'x\'/%3e")}',
+        'vendor/fontawesome/css/all.min.css': '@font-face{src:url(../webfonts/fa-solid-900.woff2) format("woff2")}',
+        'vendor/fontawesome/webfonts/fa-solid-900.woff2': 'font',
+        'vendor/bootstrap/bootstrap.bundle.min.js': 'var bootstrap={}',
+        'vendor/marked/marked.min.js': 'var marked={}'
+    }
+    for path, content in files.items():
+        target = tmp_path / 'static' / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    return tmp_path / 'static'
+
+def build(static_dir):
+    return AssetBuilder(str(static_dir), str(static_dir / 'dist')).build()
+
+class TestAssetBuild:
+    def test_build_fingerprints_and_precompresses(self, static_dir):
+        """Test that sources and bundles get content-hashed names, a manifest and gzip variants."""
+        manifest = build(static_dir)
+
+        assert set(manifest) >= {'js/page.js', 'vendor.css', 'vendor.js'}
+        assert manifest['js/page.js'].startswith('js/page.') and manifest['js/page.js'].endswith('.js')
+        assert json.loads((static_dir / 'dist' / 'manifest.json').read_text()) == manifest
+        built = (static_dir / 'dist' / manifest['vendor.js']).read_bytes()
+        assert built == b'var bootstrap={};\nvar marked={}'
+        page = static_dir / 'dist' / manifest['js/page.js']
+        assert gzip.decompress((static_dir / 'dist' / (manifest['js/page.js'] + '.gz')).read_bytes()) == page.read_bytes()
+
+    def test_changed_source_gets_new_name(self, static_dir):
+        first = build(static_dir)['js/page.js']
+        (static_dir / 'js' / 'page.js').write_text('function greet() {}\n')
+        assert build(static_dir)['js/page.js'] != first
+
+    def test_stylesheet_urls_point_at_fingerprinted_fonts(self, static_dir):
+        """Test that bundled CSS references the built font relative to the bundle, leaving data URIs alone."""
+        manifest = build(static_dir)
+        css = (static_dir / 'dist' / manifest['vendor.css']).read_text()
+
+        font = manifest['vendor/fontawesome/webfonts/fa-solid-900.woff2']
+        assert f'url({font})' in css
+        assert (static_dir / 'dist' / font).read_text() == 'font'
+        assert 'url("data:image/svg+xml' in css
+
+    def test_missing_vendor_files_skip_bundle(self, static_dir):
+        os.remove(static_dir / 'vendor' / 'marked' / 'marked.min.js')
+        builder = AssetBuilder(str(static_dir), str(static_dir / 'dist'))
+        manifest = builder.build()
+        assert builder.skipped == ['vendor.js']
+        assert 'vendor.js' not in manifest
+
+    def test_vendor_fetches_stylesheet_fonts(self, tmp_path):
+        """Test that vendoring also downloads the files a stylesheet references, next to it."""
+        def fetch(url):
+            if url.endswith('all.min.css'):
+                return b'@font-face{src:url(../webfonts/fa-solid-900.woff2?v=6)}'
+            return b'content'
+
+        with unittest.mock.patch('assets.fetch', side_effect=fetch) as fetched:
+            written = vendor_assets(str(tmp_path))
+
+        assert set(written) == set(VENDOR_FILES) | {'vendor/fontawesome/webfonts/fa-solid-900.woff2'}
+        fetched.assert_any_call('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/webfonts/fa-solid-900.woff2')
+        assert (tmp_path / 'vendor' / 'fontawesome' / 'webfonts' / 'fa-solid-900.woff2').read_bytes() == b'content'
+
+class TestAssetServing:
+    def test_unbuilt_pages_use_sources(self, client):
+        """Test that without a build pages load app scripts from static/ and vendor files from their source."""
+        page = client.get('/templates').get_data(as_text=True)
+        assert '/static/js/base.js' in page
+        for path in BUNDLES['vendor.js']:
+            if not os.path.exists(os.path.join(client.application.static_folder, path)):
+                assert VENDOR_FILES[path] in page
+
+    def test_built_assets_are_served_immutable(self, app, client, static_dir):
+        """Test that built files are linked by hash and served precompressed with far-future caching."""
+        manifest = build(static_dir)
+        assets = app.extensions['assets']
+        assets.dist_dir = str(static_dir / 'dist')
+        assets.load_manifest()
+
+        page = client.get('/templates').get_data(as_text=True)
+        assert f"/assets/{manifest['vendor.js']}" in page
+        assert f"/assets/{manifest['vendor.css']}" in page
+
+        response = client.get(f"/assets/{manifest['js/page.js']}", headers={'Accept-Encoding': 'gzip, deflate'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Cache-Control'] == f"public, max-age={app.config['ASSET_MAX_AGE']}, immutable"
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert b'Hello' in gzip.decompress(response.get_data())
+
+        plain = client.get(f"/assets/{manifest['js/page.js']}")
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.mimetype == 'text/javascript'
+        assert b'Hello' in plain.get_data()
+
+    def test_survey_script_reads_request_from_page(self, client, survey_request):
+        """Test that the extracted survey script gets the request id from the form."""
+        page = client.get(f'/survey/{survey_request.id}').get_data(as_text=True)
+        assert f'data-request-id="{survey_request.id}"' in page
+        assert '/static/js/survey.js' in page
@@ -0,0 +1,135 @@
+import pytest
+import csv
+import io
+from models import db, User, FeedbackRequest
+from bulk_requests import create_requests_bulk, find_users_by_email, validate_request_rows
+from tests.test_dashboard import count_queries
+
+def request_rows(count, assigned_to_email='giver@example.com'):
+    return [
+        {'target_email': f'person{i}@example.com', 'target_name': f'Person {i}', 'assigned_to_email': assigned_to_email}
+        for i in range(count)
+    ]
+
+def csv_upload(rows):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=['target_email', 'target_name', 'assigned_to_email', 'context'])
+    writer.writeheader()
+    writer.writerows(rows)
+    return io.BytesIO(output.getvalue().encode('utf-8'))
+
+class TestBulkCreate:
+    def test_links_existing_accounts_with_one_lookup(self, app, dev_user, discussion_template):
+        """Test that all emails resolve in one query and inserts are batched."""
+        with app.app_context():
+            db.session.add(User(email='person1@example.com', name='Person 1'))
+            db.session.commit()
+            rows = request_rows(5, assigned_to_email=dev_user.email)
+            
+            with count_queries(app) as statements:
+                created = create_requests_bulk(rows, dev_user, discussion_template.id, chunk_size=2)
+            
+            selects = [s for s in statements if s.startswith('SELECT')]
+            inserts = [s for s in statements if s.startswith('INSERT')]
+            # One account lookup and one contact directory lookup
+            assert len(selects) == 2
+            # Three request chunks, then the new contacts and their trigrams
+            assert len(inserts) == 5
+            
+            requests = {r.target_email: r for r in FeedbackRequest.query}
+            assert len(requests) == 5 == len(created)
+            assert requests['person1@example.com'].target_user_id is not None
+            assert requests['person2@example.com'].target_user_id is None
+            assert all(r.assigned_to_user_id == dev_user.id for r in requests.values())
+
+    def test_user_lookup_is_chunked(self, app, dev_user):
+        """Test that large email lists stay under the bound-parameter limit."""
+        with app.app_context():
+            emails = [f'person{i}@example.com' for i in range(1200)] + [dev_user.email]
+            
+            with count_queries(app) as statements:
+                users = find_users_by_email(emails)
+            
+            assert users == {dev_user.email: dev_user.id}
+            assert len(statements) == 3
+
+    def test_rows_for_others_need_permission(self, app, discussion_template):
+        """Test that users without permission may only assign requests to themselves."""
+        with app.app_context():
+            user = User(email='member@example.com', name='Member', can_create_requests_for_others=False)
+            rows = request_rows(1, assigned_to_email='member@example.com') + request_rows(1)
+            
+            errors = validate_request_rows(rows, user, discussion_template.id)
+            
+            assert errors == ['Row 2: you do not have permission to create feedback requests for others']
+
+class TestBulkApi:
+    def test_creates_requests_and_returns_links(self, client, dev_user, discussion_template):
+        """Test the JSON bulk creation API."""
+        response = client.post('/api/requests/bulk', json={
+            'template_id': discussion_template.id,
+            'requests': request_rows(3)
+        })
+        
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['created'] == 3
+        assert data['requests'][0]['survey_link'].endswith(f"/survey/{data['requests'][0]['id']}")
+        with client.application.app_context():
+            assert FeedbackRequest.query.count() == 3
+
+    def test_invalid_rows_create_nothing(self, client, dev_user, discussion_template):
+        """Test that one bad row rejects the whole upload."""
+        rows = request_rows(2)
+        rows[1]['target_name'] = ''
+        
+        response = client.post('/api/requests/bulk', json={'template_id': discussion_template.id, 'requests': rows})
+        
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == ['Row 2: missing target_name']
+        with client.application.app_context():
+            assert FeedbackRequest.query.count() == 0
+
+    def test_unknown_template_rejected(self, client, dev_user):
+        """Test that rows must point at an existing template."""
+        response = client.post('/api/requests/bulk', json={'template_id': 'missing', 'requests': request_rows(1)})
+        
+        assert response.status_code == 400
+        assert response.get_json()['errors'] == ['Row 1: unknown template']
+
+    def test_csv_format_downloads_links(self, client, dev_user, discussion_template):
+        """Test that the API can return share links as a CSV file."""
+        response = client.post('/api/requests/bulk?format=csv', json={
+            'template_id': discussion_template.id,
+            'requests': request_rows(2)
+        })
+        
+        assert response.mimetype == 'text/csv'
+        assert 'attachment; filename=share_links.csv' in response.headers['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        assert [r['target_email'] for r in rows] == ['person0@example.com', 'person1@example.com']
+        assert all('/survey/' in r['survey_link'] for r in rows)
+
+class TestCsvUpload:
+    def test_upload_creates_requests(self, client, dev_user, discussion_template):
+        """Test that a CSV upload creates requests and downloads their links."""
+        response = client.post('/create/bulk', data={
+            'template_id': discussion_template.id,
+            'csv_file': (csv_upload(request_rows(4)), 'requests.csv')
+        }, content_type='multipart/form-data')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert len(response.get_data(as_text=True).strip().splitlines()) == 5
+        with client.application.app_context():
+            assert FeedbackRequest.query.count() == 4
+
+    def test_upload_errors_are_listed(self, client, dev_user, discussion_template):
+        """Test that validation errors are shown on the upload page."""
+        response = client.post('/create/bulk', data={
+            'template_id': discussion_template.id,
+            'csv_file': (csv_upload([{'target_email': 'person@example.com', 'target_name': '', 'assigned_to_email': 'giver@example.com'}]), 'requests.csv')
+        }, content_type='multipart/form-data')
+        
+        assert response.status_code == 400
+        assert b'Row 1: missing target_name' in response.data
@@ -0,0 +1,250 @@
+import json
+import pytest
+import unittest.mock
+from models import db, FeedbackTemplate, Question, Response, User, ChatMessage
+from chat_sessions import ChatSequenceError, conversation_key, load_history, begin_turn, record_turn, load_summary, save_summary
+from tests.test_chat_streaming import make_chunk, parse_events, discussion_question
+
+def mock_completion(mock_openai, content):
+    mock_client = unittest.mock.Mock()
+    mock_openai.return_value = mock_client
+    mock_client.chat.completions.create.return_value.choices = [unittest.mock.Mock()]
+    mock_client.chat.completions.create.return_value.choices[0].message.content = content
+    return mock_client
+
+def sent_messages(mock_client):
+    return mock_client.chat.completions.create.call_args[1]['messages']
+
+class TestChatSessionStore:
+    def test_records_and_replays_turns(self, app):
+        """Test that recorded turns come back in order."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            assert begin_turn(key, 0) == []
+            assert record_turn(key, 0, 'Hello', 'Hi there') == 2
+            
+            assert begin_turn(key, 2) == [
+                {'role': 'user', 'content': 'Hello'},
+                {'role': 'assistant', 'content': 'Hi there'}
+            ]
+
+    def test_client_ahead_of_server_raises(self, app):
+        """Test that an unknown sequence number reports the expected one."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            record_turn(key, 0, 'Hello', 'Hi there')
+            
+            with pytest.raises(ChatSequenceError) as excinfo:
+                begin_turn(key, 4)
+            assert excinfo.value.expected_seq == 2
+
+    def test_client_behind_rewinds_conversation(self, app):
+        """Test that a reloaded client restarts the conversation at its position."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            record_turn(key, 0, 'Hello', 'Hi there')
+            record_turn(key, 2, 'More', 'Tell me more')
+            
+            assert begin_turn(key, 0) == []
+            assert load_history(key) == []
+
+    def test_rewind_drops_summary_of_removed_messages(self, app):
+        """Test that a rolling summary covering rewound messages is not reused."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            record_turn(key, 0, 'Hello', 'Hi there')
+            record_turn(key, 2, 'More', 'Tell me more')
+            save_summary(key, 'Said hello', 2)
+            
+            begin_turn(key, 2)
+            assert load_summary(key) == ('Said hello', 2)
+            begin_turn(key, 0)
+            assert load_summary(key) is None
+            
+            save_summary(key, 'Said hello', 2)
+            begin_turn(key, 2, [{'role': 'user', 'content': 'Hi'}, {'role': 'assistant', 'content': 'Hello'}])
+            assert load_summary(key) is None
+
+    def test_resync_replaces_stored_history(self, app):
+        """Test that resending chat_history overwrites the stored copy."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            history = [{'role': 'user', 'content': 'Hello'}, {'role': 'assistant', 'content': 'Hi there'}]
+            
+            assert begin_turn(key, 2, history) == history
+            assert load_history(key) == history
+
+    def test_duplicate_turn_raises(self, app):
+        """Test that two requests recording the same turn don't both succeed."""
+        with app.app_context():
+            key = conversation_key('survey', 'request', 'question')
+            record_turn(key, 0, 'Hello', 'Hi there')
+            
+            with pytest.raises(ChatSequenceError):
+                record_turn(key, 0, 'Hello again', 'Hi again')
+            assert len(load_history(key)) == 2
+
+class TestSurveyChatSessions:
+    def test_replays_server_history_to_model(self, client, survey_request, discussion_template):
+        """Test that a client sending only seq gets its history from the server."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = mock_completion(mock_openai, "Can you share an example?")
+                first = client.post(f'/api/chat/{question.id}', json={
+                    'message': 'They are great', 'seq': 0, 'feedback_request_id': survey_request.id
+                })
+                assert first.get_json()['seq'] == 2
+                
+                second = client.post(f'/api/chat/{question.id}', json={
+                    'message': 'They unblocked a launch', 'seq': 2, 'feedback_request_id': survey_request.id
+                })
+                assert second.get_json()['seq'] == 4
+                
+                contents = [m['content'] for m in sent_messages(mock_client)[1:]]
+                assert contents == ['They are great', 'Can you share an example?', 'They unblocked a launch']
+
+    def test_recorded_turn_updates_discussion_draft(self, client, survey_request, discussion_template):
+        """Test that the server autosaves the discussion draft from its own transcript."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_completion(mock_openai, "Can you share an example?")
+                client.post(f'/api/chat/{question.id}', json={
+                    'message': 'They are great', 'seq': 0, 'feedback_request_id': survey_request.id
+                })
+            
+            draft = Response.query.filter_by(feedback_request_id=survey_request.id, question_id=question.id, is_draft=True).one()
+            assert json.loads(draft.chat_history) == [
+                {'role': 'user', 'content': 'They are great'},
+                {'role': 'assistant', 'content': 'Can you share an example?'}
+            ]
+            assert draft.discussion_summary is None
+
+    def test_out_of_sync_returns_409(self, client, survey_request, discussion_template):
+        """Test that a sequence number the server hasn't seen is rejected."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            response = client.post(f'/api/chat/{question.id}', json={
+                'message': 'Hello', 'seq': 4, 'feedback_request_id': survey_request.id
+            })
+            
+            assert response.status_code == 409
+            assert response.get_json()['expected_seq'] == 0
+
+    def test_streaming_final_event_carries_seq(self, client, survey_request, discussion_template):
+        """Test that streamed turns are recorded once the completion finishes."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                mock_client.chat.completions.create.return_value = iter([make_chunk("Why?")])
+                
+                response = client.post(f'/api/chat/{question.id}', json={
+                    'message': 'They are great', 'seq': 0, 'feedback_request_id': survey_request.id, 'stream': True
+                })
+                
+                assert parse_events(response.data)[-1]['seq'] == 2
+                key = conversation_key('survey', survey_request.id, question.id)
+                assert load_history(key)[-1] == {'role': 'assistant', 'content': 'Why?'}
+
+    def test_legacy_clients_still_send_full_history(self, client, survey_request, discussion_template):
+        """Test that requests without seq keep using the posted chat_history."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_completion(mock_openai, "Can you share an example?")
+                response = client.post(f'/api/chat/{question.id}', json={
+                    'message': 'They are great',
+                    'chat_history': [{'role': 'user', 'content': 'They are great'}],
+                    'feedback_request_id': survey_request.id
+                })
+            
+            assert 'seq' not in response.get_json()
+            assert ChatMessage.query.count() == 0
+
+    def test_submit_clears_survey_transcripts(self, client, survey_request, discussion_template):
+        """Test that submitting feedback drops its stored conversations."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            record_turn(conversation_key('survey', survey_request.id, question.id), 0, 'Hello', 'Hi there')
+            record_turn(conversation_key('survey', 'other-request', question.id), 0, 'Hello', 'Hi there')
+            
+            client.post(f'/submit/{survey_request.id}')
+            
+            assert ChatMessage.query.count() == 2
+            assert ChatMessage.query.filter(ChatMessage.conversation_key.startswith(f'survey:{survey_request.id}:')).count() == 0
+
+class TestSurveyChatAccess:
+    def post_turn(self, client, question_id, request_id):
+        return client.post(f'/api/chat/{question_id}', json={
+            'message': 'Hello', 'seq': 0, 'feedback_request_id': request_id
+        })
+
+    def test_other_users_cannot_touch_transcript(self, client, app, survey_request, discussion_template):
+        """Test that only the assignee can rewind or overwrite a stored survey chat."""
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            key = conversation_key('survey', survey_request.id, question.id)
+            record_turn(key, 0, 'Hello', 'Hi there')
+            member = User(email='member@example.com', name='Member')
+            db.session.add(member)
+            db.session.commit()
+            
+            with unittest.mock.patch('app.auto_login_dev_user', return_value=member):
+                assert self.post_turn(client, question.id, survey_request.id).status_code == 403
+            with unittest.mock.patch('app.auto_login_dev_user', return_value=None):
+                assert self.post_turn(client, question.id, survey_request.id).status_code == 401
+            assert len(load_history(key)) == 2
+
+    def test_question_must_belong_to_request(self, client, app, dev_user, survey_request):
+        with app.app_context():
+            other = FeedbackTemplate(name="Other", created_by_id=dev_user.id)
+            db.session.add(other)
+            db.session.flush()
+            question = Question(template_id=other.id, question_text="Other?", question_type='discussion', order_index=0)
+            db.session.add(question)
+            db.session.commit()
+            
+            assert self.post_turn(client, question.id, survey_request.id).status_code == 404
+            assert self.post_turn(client, question.id, 'missing').status_code == 404
+
+    def test_submitted_request_is_closed(self, client, app, survey_request, discussion_template):
+        """Test that a submitted survey's chat can't be restarted."""
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            db.session.add(Response(feedback_request_id=survey_request.id, question_id=question.id,
+                                    discussion_summary='Done.', is_draft=False))
+            db.session.commit()
+            
+            assert self.post_turn(client, question.id, survey_request.id).status_code == 403
+            assert ChatMessage.query.count() == 0
+
+class TestSinglePlayerChatSessions:
+    def test_replays_from_seeded_guidance(self, client, dev_user):
+        """Test that single-player turns replay the stored guidance and history."""
+        with client.application.app_context():
+            key = conversation_key('single-player', dev_user.id)
+            begin_turn(key, 1, [{'role': 'assistant', 'content': 'Start with strengths.'}])
+            with client.session_transaction() as sess:
+                sess['chat_context'] = {
+                    'relationship_context': 'My manager',
+                    'form_text': 'What went well?',
+                    'initial_guidance': 'Start with strengths.'
+                }
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = mock_completion(mock_openai, "What impact did that have?")
+                response = client.post('/api/single-player-chat', json={
+                    'message': 'They mentor the team', 'action': 'chat', 'seq': 1
+                })
+            
+            assert response.get_json() == {'response': 'What impact did that have?', 'seq': 3}
+            contents = [m['content'] for m in sent_messages(mock_client)[2:]]
+            assert contents == ['Start with strengths.', 'They mentor the team']
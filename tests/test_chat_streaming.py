@@ -0,0 +1,107 @@
+import pytest
+import unittest.mock
+import json
+from models import Question
+
+def make_chunk(content):
+    chunk = unittest.mock.Mock()
+    chunk.choices = [unittest.mock.Mock()]
+    chunk.choices[0].delta.content = content
+    return chunk
+
+def parse_events(data):
+    """Parse a Server-Sent Events body into a list of payloads."""
+    return [json.loads(frame[len('data: '):]) for frame in data.decode().split('\n\n') if frame.startswith('data: ')]
+
+def discussion_question(template):
+    return Question.query.filter_by(template_id=template.id, question_type='discussion').order_by(Question.order_index).first()
+
+class TestChatStreaming:
+    def test_streams_tokens_then_final_event(self, client, survey_request, discussion_template):
+        """Test that streaming mode forwards tokens and ends with is_final."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                mock_client.chat.completions.create.return_value = iter([
+                    make_chunk("Thank you "), make_chunk(None), make_chunk("for that detailed feedback!")
+                ])
+                
+                response = client.post(
+                    f'/api/chat/{question.id}',
+                    json={
+                        'message': 'They always unblock the team',
+                        'feedback_request_id': survey_request.id,
+                        'stream': True
+                    }
+                )
+                
+                assert response.status_code == 200
+                assert response.mimetype == 'text/event-stream'
+                events = parse_events(response.data)
+                assert [e['token'] for e in events[:-1]] == ["Thank you ", "for that detailed feedback!"]
+                assert events[-1] == {
+                    'response': 'Thank you for that detailed feedback!',
+                    'is_final': True,
+                    'done': True
+                }
+                assert mock_client.chat.completions.create.call_args[1]['stream'] is True
+
+    def test_accept_header_selects_streaming(self, client, survey_request, discussion_template):
+        """Test that an event-stream Accept header opts into streaming."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                mock_client.chat.completions.create.return_value = iter([make_chunk("Can you share an example?")])
+                
+                response = client.post(
+                    f'/api/chat/{question.id}',
+                    json={'message': 'They are great', 'feedback_request_id': survey_request.id},
+                    headers={'Accept': 'text/event-stream'}
+                )
+                
+                events = parse_events(response.data)
+                assert events[-1]['response'] == "Can you share an example?"
+                assert events[-1]['is_final'] is False
+
+    def test_streaming_falls_back_when_openai_fails(self, client, survey_request, discussion_template):
+        """Test that a failed stream still ends with a fallback final event."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI', side_effect=Exception("API Error")):
+                response = client.post(
+                    f'/api/chat/{question.id}',
+                    json={'message': 'done', 'feedback_request_id': survey_request.id, 'stream': True}
+                )
+                
+                events = parse_events(response.data)
+                assert len(events) == 1
+                assert events[0]['done'] is True
+                assert events[0]['is_final'] is True
+
+    def test_json_contract_unchanged_without_stream(self, client, survey_request, discussion_template):
+        """Test that non-streaming clients still get a single JSON object."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                mock_response = unittest.mock.Mock()
+                mock_response.choices = [unittest.mock.Mock()]
+                mock_response.choices[0].message.content = "Can you share an example?"
+                mock_client.chat.completions.create.return_value = mock_response
+                
+                response = client.post(
+                    f'/api/chat/{question.id}',
+                    json={'message': 'They are great', 'feedback_request_id': survey_request.id}
+                )
+                
+                assert response.is_json
+                assert response.get_json() == {'response': "Can you share an example?", 'is_final': False}
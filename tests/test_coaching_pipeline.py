@@ -0,0 +1,212 @@
+import pytest
+import unittest.mock
+import time
+from datetime import datetime
+from models import db, FeedbackRequest, Question, Response, CoachingCache
+import app as app_module
+from app import estimate_feedback_safety, generate_coaching_with_safety
+
+@pytest.fixture
+def submitted_responses(app, survey_request, discussion_template):
+    """Submitted responses for the survey request: a low rating and one discussion."""
+    with app.app_context():
+        questions = Question.query.filter_by(template_id=discussion_template.id).order_by(Question.order_index).all()
+        responses = [
+            Response(feedback_request_id=survey_request.id, question_id=questions[0].id,
+                     rating_value=2, is_draft=False, submitted_at=datetime.utcnow()),
+            Response(feedback_request_id=survey_request.id, question_id=questions[1].id,
+                     discussion_summary="They miss deadlines on shared work.", is_draft=False,
+                     submitted_at=datetime.utcnow())
+        ]
+        db.session.add_all(responses)
+        db.session.commit()
+        yield responses
+
+class TestSafetyEstimate:
+    def test_positive_ratings_estimate_high(self):
+        """Test that ratings-only positive feedback is estimated as high safety."""
+        assert estimate_feedback_safety([Response(rating_value=5)]) == 'high'
+
+    def test_discussion_estimates_medium(self):
+        """Test that written discussion feedback is estimated as medium safety."""
+        assert estimate_feedback_safety([Response(discussion_summary="Good work")]) == 'medium'
+
+    def test_multiple_critical_answers_estimate_low(self):
+        """Test that several low ratings or disagreements are estimated as low safety."""
+        responses = [Response(rating_value=1), Response(agreement_value='strongly_disagree')]
+        assert estimate_feedback_safety(responses) == 'low'
+
+class TestCoachingPipeline:
+    def test_safety_and_coaching_run_concurrently(self, app, survey_request, submitted_responses):
+        """Test that page latency is roughly one LLM call when the estimate holds."""
+        def slow_safety(responses, is_supervisor_feedback=False):
+            time.sleep(0.2)
+            return {'safety_level': 'medium', 'concerns': [], 'suggestions': []}
+        
+        def slow_coaching(feedback_request, responses, safety_analysis):
+            time.sleep(0.2)
+            return f"Coaching for {safety_analysis['safety_level']}"
+        
+        with app.app_context():
+            feedback_request = FeedbackRequest.query.get(survey_request.id)
+            responses = Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=False).all()
+            with unittest.mock.patch.object(app_module, 'analyze_feedback_safety', side_effect=slow_safety), \
+                 unittest.mock.patch.object(app_module, 'generate_personalized_coaching', side_effect=slow_coaching) as coaching:
+                start = time.perf_counter()
+                safety_analysis, coaching_content = generate_coaching_with_safety(feedback_request, responses)
+                elapsed = time.perf_counter() - start
+        
+        assert safety_analysis['safety_level'] == 'medium'
+        assert coaching_content == "Coaching for medium"
+        assert coaching.call_count == 1
+        assert elapsed < 0.35
+
+    def test_concerns_do_not_add_a_full_guide_of_latency(self, app, survey_request, submitted_responses):
+        """Test that concerns at the estimated level cost a short section alongside the guide, not a second guide."""
+        def slow_safety(responses, is_supervisor_feedback=False):
+            time.sleep(0.2)
+            return {'safety_level': 'medium', 'concerns': ['Missed deadlines may feel like blame'],
+                    'suggestions': ['Focus on the shared schedule']}
+        
+        def slow_coaching(feedback_request, responses, safety_analysis):
+            time.sleep(0.4)
+            return f"Coaching for {safety_analysis['safety_level']}"
+        
+        def slow_concerns(feedback_request, safety_analysis):
+            time.sleep(0.1)
+            return "## Addressing Specific Concerns\n" + safety_analysis['concerns'][0]
+        
+        with app.app_context():
+            feedback_request = FeedbackRequest.query.get(survey_request.id)
+            responses = Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=False).all()
+            with unittest.mock.patch.object(app_module, 'analyze_feedback_safety', side_effect=slow_safety), \
+                 unittest.mock.patch.object(app_module, 'generate_personalized_coaching', side_effect=slow_coaching) as coaching, \
+                 unittest.mock.patch.object(app_module, 'concerns_coaching_section', side_effect=slow_concerns):
+                start = time.perf_counter()
+                _, coaching_content = generate_coaching_with_safety(feedback_request, responses)
+                elapsed = time.perf_counter() - start
+        
+        assert coaching_content == "Coaching for medium\n\n## Addressing Specific Concerns\nMissed deadlines may feel like blame"
+        assert coaching.call_count == 1
+        # Back-to-back analysis and guide would take 0.6s
+        assert elapsed < 0.55
+
+    def test_mismatched_estimate_regenerates_coaching(self, app, survey_request, submitted_responses):
+        """Test that coaching is regenerated with the full analysis when the estimate was wrong."""
+        analysis = {'safety_level': 'low', 'concerns': ['Power imbalance'], 'suggestions': []}
+        
+        with app.app_context():
+            feedback_request = FeedbackRequest.query.get(survey_request.id)
+            responses = Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=False).all()
+            with unittest.mock.patch.object(app_module, 'analyze_feedback_safety', return_value=analysis), \
+                 unittest.mock.patch.object(app_module, 'generate_personalized_coaching',
+                                            side_effect=lambda fr, rs, sa: f"Coaching for {sa['safety_level']}") as coaching:
+                safety_analysis, coaching_content = generate_coaching_with_safety(feedback_request, responses)
+        
+        assert coaching_content == "Coaching for low"
+        assert coaching.call_count == 2
+        assert coaching.call_args[0][2] is analysis
+
+    def test_concerns_reach_coaching_prompt(self, app, survey_request, submitted_responses):
+        """Test that concerns found at the estimated level still make it into the coaching prompt."""
+        with app.app_context():
+            feedback_request = FeedbackRequest.query.get(survey_request.id)
+            responses = Response.query.filter_by(feedback_request_id=feedback_request.id, is_draft=False).all()
+            level = estimate_feedback_safety(responses)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                
+                def create(**kwargs):
+                    response = unittest.mock.Mock()
+                    response.choices = [unittest.mock.Mock()]
+                    if kwargs['max_tokens'] == 300:
+                        response.choices[0].message.content = f'{{"safety_level": "{level}", "concerns": ["Power imbalance"], "suggestions": []}}'
+                    else:
+                        response.choices[0].message.content = "Coaching"
+                    return response
+                
+                mock_client.chat.completions.create.side_effect = create
+                safety_analysis, coaching_content = generate_coaching_with_safety(feedback_request, responses)
+            
+            coaching_prompts = [call[1]['messages'][1]['content'] for call in mock_client.chat.completions.create.call_args_list
+                                if call[1]['max_tokens'] != 300]
+        
+        assert safety_analysis['concerns'] == ['Power imbalance']
+        # The guide itself plus the short concerns section
+        assert len(coaching_prompts) == 2
+        assert any('Specific concerns: Power imbalance' in prompt for prompt in coaching_prompts)
+        assert coaching_content == "Coaching\n\nCoaching"
+
+    def test_coaching_page_renders(self, client, survey_request, submitted_responses):
+        """Test that the coaching page renders with the pipelined results."""
+        with unittest.mock.patch('openai.OpenAI', side_effect=Exception("API Error")):
+            response = client.get(f'/coaching/{survey_request.id}')
+        
+        assert response.status_code == 200
+        assert b'Jane Roe' in response.data
+
+class TestCoachingCache:
+    def mock_llm(self, mock_openai):
+        """Make the mocked client return a safety JSON, then coaching text."""
+        mock_client = unittest.mock.Mock()
+        mock_openai.return_value = mock_client
+        
+        def create(**kwargs):
+            response = unittest.mock.Mock()
+            response.choices = [unittest.mock.Mock()]
+            if kwargs['max_tokens'] == 300:
+                response.choices[0].message.content = '{"safety_level": "medium", "concerns": [], "suggestions": []}'
+            else:
+                response.choices[0].message.content = "## Personalized Assessment\nBe direct and kind."
+            return response
+        
+        mock_client.chat.completions.create.side_effect = create
+        return mock_client
+
+    def test_repeat_views_served_from_cache(self, client, survey_request, submitted_responses):
+        """Test that a second coaching view makes no LLM calls."""
+        with unittest.mock.patch('openai.OpenAI') as mock_openai:
+            mock_client = self.mock_llm(mock_openai)
+            
+            first = client.get(f'/coaching/{survey_request.id}')
+            calls_after_first = mock_client.chat.completions.create.call_count
+            second = client.get(f'/coaching/{survey_request.id}')
+            
+            assert calls_after_first == 2
+            assert mock_client.chat.completions.create.call_count == calls_after_first
+            assert b'Be direct and kind.' in second.data
+            assert first.data == second.data
+        
+        with client.application.app_context():
+            assert CoachingCache.query.filter_by(feedback_request_id=survey_request.id).count() == 1
+
+    def test_fallback_results_are_not_cached(self, client, survey_request, submitted_responses):
+        """Test that guides produced while the LLM is down are regenerated next time."""
+        with unittest.mock.patch('openai.OpenAI', side_effect=Exception("API Error")):
+            client.get(f'/coaching/{survey_request.id}')
+        
+        with client.application.app_context():
+            assert CoachingCache.query.count() == 0
+
+    def test_regenerate_summary_invalidates_cache(self, client, survey_request, submitted_responses):
+        """Test that regenerating a summary drops the cached guide for the request."""
+        with client.application.app_context():
+            discussion = Response.query.filter(
+                Response.feedback_request_id == survey_request.id,
+                Response.discussion_summary.isnot(None)
+            ).first()
+            discussion.chat_history = '[{"role": "user", "content": "They miss deadlines"}]'
+            db.session.commit()
+            discussion_id = discussion.id
+        
+        with unittest.mock.patch('openai.OpenAI') as mock_openai:
+            self.mock_llm(mock_openai)
+            client.get(f'/coaching/{survey_request.id}')
+            
+            response = client.post(f'/api/regenerate-summary/{discussion_id}', json={'custom_prompt': 'Be brief'})
+            assert response.get_json()['success'] is True
+        
+        with client.application.app_context():
+            assert CoachingCache.query.filter_by(feedback_request_id=survey_request.id).count() == 0
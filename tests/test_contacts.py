@@ -0,0 +1,139 @@
+import pytest
+from models import db, Contact, ContactGram, FeedbackRequest
+from contacts import ContactIndex, record_contacts, suggest_contacts, rebuild_contacts
+from tests.test_dashboard import count_queries
+from tests.test_indexes import query_plan
+
+class TestContactDirectory:
+    def test_prefix_matches_rank_before_substring_matches(self, app):
+        """Test that exact and prefix matches come before substring matches."""
+        with app.app_context():
+            record_contacts([
+                ('maria.ann@example.com', 'Maria', 'target'),
+                ('ann@example.com', 'Ann', 'target'),
+                ('anna.lee@example.com', 'Anna', 'target'),
+                ('joann@example.com', 'Joann', 'target'),
+                ('bob@example.com', 'Bob', 'target')
+            ])
+            db.session.commit()
+            
+            emails = [s['email'] for s in suggest_contacts('ann')]
+            assert emails[:2] == ['ann@example.com', 'anna.lee@example.com']
+            assert set(emails[2:]) == {'maria.ann@example.com', 'joann@example.com'}
+
+    def test_emails_are_deduplicated_by_kind_priority(self, app):
+        """Test that an email keeps one entry, named after its highest-ranked kind."""
+        with app.app_context():
+            record_contacts([('Sam@Example.com', 'sam@example.com', 'assignee')])
+            db.session.commit()
+            record_contacts([('sam@example.com', 'Sam Smith', 'target'), ('SAM@example.com', 'Sam', 'assignee')])
+            db.session.commit()
+            
+            assert suggest_contacts('sam') == [{'email': 'Sam@Example.com', 'name': 'Sam Smith', 'type': 'target'}]
+            assert Contact.query.count() == 1
+
+    def test_substring_lookup_uses_trigram_index(self, app):
+        """Test that substring matches are read through the trigram postings."""
+        with app.app_context():
+            record_contacts([(f'person{i}@example.com', f'Person {i}', 'target') for i in range(50)])
+            db.session.commit()
+            
+            with count_queries(app) as statements:
+                suggestions = suggest_contacts('son4', limit=5)
+            
+            assert len(suggestions) == 5
+            assert all('son4' in s['email'] for s in suggestions)
+            assert len(statements) == 2
+            gram_query = Contact.query.join(ContactGram, ContactGram.contact_id == Contact.id)\
+                .filter(ContactGram.gram == 'son')
+            assert 'contact_gram USING COVERING INDEX' in query_plan(gram_query)
+
+    def test_rebuild_backfills_from_requests(self, app, runner, dev_user, discussion_template):
+        """Test that the CLI rebuilds the directory from existing requests."""
+        with app.app_context():
+            db.session.add(FeedbackRequest(
+                target_email='legacy@example.com', target_name='Legacy',
+                assigned_to_email=dev_user.email, template_id=discussion_template.id,
+                created_by_id=dev_user.id
+            ))
+            db.session.commit()
+            
+            result = runner.invoke(args=['contacts', 'rebuild'])
+            
+            assert 'Indexed 2 contacts' in result.output
+            assert suggest_contacts('legacy')[0]['name'] == 'Legacy'
+            assert suggest_contacts('dev@')[0]['type'] == 'user'
+
+class TestContactIndex:
+    def test_matches_database_lookup_without_queries(self, app):
+        """Test that the in-memory index answers like the database after one load."""
+        with app.app_context():
+            record_contacts([(f'person{i}@example.com', f'Person {i}', 'target') for i in range(30)] +
+                            [('ann@example.com', 'Ann', 'user'), ('joann@example.com', 'Joann', 'target')])
+            db.session.commit()
+            index = ContactIndex()
+            index.load()
+            
+            with count_queries(app) as statements:
+                suggestions = index.suggest('ann')
+                prefix_suggestions = index.suggest('person1', limit=3)
+                assert index.suggest('zzz') == []
+            
+            assert statements == []
+            assert suggestions == suggest_contacts('ann')
+            assert prefix_suggestions == suggest_contacts('person1', limit=3)
+            assert len(prefix_suggestions) == 3
+
+    def test_record_contacts_updates_loaded_index(self, app):
+        """Test that new and upgraded contacts show up without a reload."""
+        with app.app_context():
+            index = app.extensions['contact_index']
+            assert index.suggest('new') == []
+            
+            record_contacts([('new.person@example.com', 'new.person@example.com', 'assignee')])
+            record_contacts([('New.Person@example.com', 'New Person', 'target')])
+            db.session.commit()
+            
+            with count_queries(app) as statements:
+                suggestions = index.suggest('new')
+            assert statements == []
+            assert suggestions == [{'email': 'new.person@example.com', 'name': 'New Person', 'type': 'target'}]
+
+    def test_rolled_back_contacts_stay_out_of_index(self, app):
+        """Test that contacts from a rolled-back transaction are never suggested."""
+        with app.app_context():
+            index = app.extensions['contact_index']
+            assert index.suggest('ghost') == []
+            
+            record_contacts([('ghost@example.com', 'Ghost', 'target')])
+            assert index.suggest('ghost') == []
+            db.session.rollback()
+            db.session.commit()
+            
+            assert index.suggest('ghost') == []
+            assert Contact.query.filter_by(email_lower='ghost@example.com').count() == 0
+
+    def test_reloads_after_ttl(self, app):
+        """Test that contacts written by other workers appear once the index expires."""
+        with app.app_context():
+            index = ContactIndex(ttl=0)
+            assert index.suggest('late') == []
+            db.session.add(Contact(email='late@example.com', email_lower='late@example.com', name='Late', kind='target'))
+            db.session.commit()
+            
+            assert index.suggest('late')[0]['email'] == 'late@example.com'
+
+class TestEmailSuggestions:
+    def test_endpoint_returns_directory_matches(self, client, app):
+        """Test that the endpoint answers from the contact directory."""
+        with app.app_context():
+            client.get('/')  # Creates and indexes the dev user
+            
+            response = client.get('/api/email-suggestions?q=DEV')
+            assert response.get_json()[0]['email'] == 'dev@example.com'
+            assert client.get('/api/email-suggestions?q=d').get_json() == []
+
+    def test_responses_are_cacheable(self, client):
+        """Test that browsers may reuse suggestion responses."""
+        response = client.get('/api/email-suggestions?q=dev')
+        assert response.headers['Cache-Control'] == 'private, max-age=60'
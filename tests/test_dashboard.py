@@ -0,0 +1,87 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+from models import db, User, FeedbackTemplate, FeedbackRequest, Question, Response
+
+@contextmanager
+def count_queries(app):
+    """Count SQL statements executed against the app's database."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def add_requests(app, dev_user, count, start=0):
+    """Add requests from distinct creators and templates, each with a submitted response."""
+    with app.app_context():
+        for i in range(start, start + count):
+            creator = User(email=f"manager{i}@example.com", name=f"Manager {i}")
+            db.session.add(creator)
+            db.session.flush()
+            template = FeedbackTemplate(name=f"Template {i}", created_by_id=creator.id)
+            db.session.add(template)
+            db.session.flush()
+            question = Question(template_id=template.id, question_text="Rate them",
+                                question_type="rating", order_index=0)
+            db.session.add(question)
+            # Alternate which dashboard bucket the request lands in for the dev user
+            feedback_request = FeedbackRequest(
+                target_name=f"Person {i}",
+                target_email=dev_user.email if i % 2 else f"person{i}@example.com",
+                assigned_to_email=f"giver{i}@example.com" if i % 2 else dev_user.email,
+                template_id=template.id,
+                created_by_id=creator.id
+            )
+            db.session.add(feedback_request)
+            db.session.flush()
+            db.session.add(Response(feedback_request_id=feedback_request.id, question_id=question.id,
+                                    rating_value=4, is_draft=False, submitted_at=datetime.utcnow()))
+        db.session.commit()
+
+def dashboard_query_count(client):
+    with count_queries(client.application) as statements:
+        response = client.get('/dashboard')
+    assert response.status_code == 200
+    return len(statements)
+
+class TestDashboardQueries:
+    @pytest.mark.parametrize('is_admin', [True, False])
+    def test_query_count_independent_of_request_count(self, client, dev_user, is_admin):
+        """Test that the dashboard issues a constant number of queries."""
+        with client.application.app_context():
+            User.query.get(dev_user.id).is_admin = is_admin
+            db.session.commit()
+        
+        client.get('/dashboard')  # Log in first so the session is warm
+        add_requests(client.application, dev_user, 2)
+        small = dashboard_query_count(client)
+        add_requests(client.application, dev_user, 10, start=2)
+        large = dashboard_query_count(client)
+        
+        assert small == large
+
+    def test_submitted_counts_shown(self, client, dev_user):
+        """Test that per-request submitted counts still render."""
+        add_requests(client.application, dev_user, 3)
+        response = client.get('/dashboard')
+        
+        assert response.data.count(b'1 responses') == 3
+        assert b'Manager 1' in response.data or b'Person 1' in response.data
+
+    def test_totals_are_capped(self, client, app, dev_user):
+        """Test that bucket totals stop counting past DASHBOARD_COUNT_CAP."""
+        app.config['DASHBOARD_COUNT_CAP'] = 3
+        add_requests(app, dev_user, 3)
+        assert b'<h4>3</h4>' in client.get('/dashboard').data
+        
+        add_requests(app, dev_user, 2, start=3)
+        assert b'<h4>3+</h4>' in client.get('/dashboard').data
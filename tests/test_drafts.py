@@ -0,0 +1,130 @@
+import pytest
+import unittest.mock
+import json
+from models import db, FeedbackTemplate, Question, Response
+import app as app_module
+from app import save_draft_answers
+from tests.test_dashboard import count_queries
+
+CHAT = [{'role': 'user', 'content': 'They unblocked the launch'}]
+
+def template_questions(template):
+    return Question.query.filter_by(template_id=template.id).order_by(Question.order_index).all()
+
+def survey_answers(questions, rating='4', chat=CHAT):
+    rating_question, strengths, growth = questions
+    return {
+        rating_question.id: {'type': 'rating', 'value': rating},
+        strengths.id: {'type': 'discussion', 'chat_history': chat},
+        growth.id: {'type': 'discussion', 'chat_history': []}
+    }
+
+class TestSaveDraftAnswers:
+    def test_unchanged_answers_keep_rows_and_summaries(self, client, survey_request, discussion_template):
+        """Test that saving the same survey again doesn't rewrite rows or summaries."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.') as summarize:
+                client.post(f'/review/{survey_request.id}', json=survey_answers(questions))
+                ids_before = {r.question_id: r.id for r in Response.query}
+                
+                client.post(f'/review/{survey_request.id}', json=survey_answers(questions))
+            
+            assert {r.question_id: r.id for r in Response.query} == ids_before
+            assert summarize.call_count == 1
+
+    def test_changed_answers_update_in_place(self, client, survey_request, discussion_template):
+        """Test that only changed answers are rewritten, keeping their ids."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            new_chat = CHAT + [{'role': 'user', 'content': 'Also a great mentor'}]
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', side_effect=['First.', 'Second.']):
+                client.post(f'/review/{survey_request.id}', json=survey_answers(questions))
+                ids_before = {r.question_id: r.id for r in Response.query}
+                
+                client.post(f'/review/{survey_request.id}', json=survey_answers(questions, rating='2', chat=new_chat))
+            
+            responses = {r.question_id: r for r in Response.query}
+            assert {q: r.id for q, r in responses.items()} == ids_before
+            assert responses[questions[0].id].rating_value == 2
+            assert responses[questions[1].id].discussion_summary == 'Second.'
+            assert json.loads(responses[questions[1].id].chat_history) == new_chat
+            assert responses[questions[2].id].discussion_summary == 'No response provided'
+
+    def test_replace_drops_answers_no_longer_sent(self, app, survey_request, discussion_template):
+        """Test that the full review save removes drafts for omitted questions."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            save_draft_answers(survey_request.id, survey_answers(questions))
+            db.session.commit()
+            
+            save_draft_answers(survey_request.id, {questions[0].id: {'type': 'rating', 'value': '4'}}, replace=True)
+            db.session.commit()
+            
+            assert [r.question_id for r in Response.query] == [questions[0].id]
+
+    def test_changes_are_written_in_bulk(self, app, survey_request, discussion_template):
+        """Test that a save issues a constant number of statements."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            answers = survey_answers(questions)
+            
+            with count_queries(app) as statements:
+                needs_summary = save_draft_answers(survey_request.id, answers)
+                db.session.flush()
+            
+            # One SELECT of existing drafts and one INSERT
+            assert len(statements) == 2
+            assert list(needs_summary) == [questions[1].id]
+
+class TestAutosave:
+    def test_autosaves_one_answer(self, client, survey_request, discussion_template):
+        """Test that the survey page can save a single answer as it changes."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            
+            first = client.post(f'/api/drafts/{survey_request.id}/{questions[0].id}', json={'type': 'rating', 'value': '3'})
+            second = client.post(f'/api/drafts/{survey_request.id}/{questions[0].id}', json={'type': 'rating', 'value': '5'})
+            
+            assert first.get_json() == {'success': True}
+            assert second.status_code == 200
+            assert [r.rating_value for r in Response.query] == [5]
+
+    def test_autosaved_discussion_is_summarized_on_review(self, client, survey_request, discussion_template):
+        """Test that an autosaved chat still gets its summary when reviewed."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            client.post(f'/api/drafts/{survey_request.id}/{questions[1].id}', json={'type': 'discussion', 'chat_history': CHAT})
+            assert Response.query.one().discussion_summary is None
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.'):
+                client.post(f'/review/{survey_request.id}', json={
+                    questions[1].id: {'type': 'discussion', 'chat_history': CHAT}
+                })
+            
+            assert Response.query.one().discussion_summary == 'Organized summary.'
+
+    def test_rejects_question_from_another_template(self, client, survey_request, dev_user):
+        """Test that answers can only be saved for the request's own questions."""
+        with client.application.app_context():
+            other_template = FeedbackTemplate(name="Other Template", created_by_id=dev_user.id)
+            db.session.add(other_template)
+            db.session.flush()
+            other_question = Question(template_id=other_template.id, question_text="Anything else?",
+                                      question_type="rating", order_index=0)
+            db.session.add(other_question)
+            db.session.commit()
+            
+            response = client.post(f'/api/drafts/{survey_request.id}/{other_question.id}', json={'type': 'rating', 'value': '3'})
+            
+            assert response.status_code == 404
+
+    def test_rejects_invalid_answer(self, client, survey_request, discussion_template):
+        """Test that malformed answers are rejected."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            
+            response = client.post(f'/api/drafts/{survey_request.id}/{questions[0].id}', json={'type': 'rating', 'value': 'high'})
+            
+            assert response.status_code == 400
+            assert Response.query.count() == 0
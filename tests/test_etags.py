@@ -0,0 +1,174 @@
+import unittest.mock
+from models import db, Response, TargetGiverStats, User
+import app as app_module
+from tests.test_aggregates import add_requesters, add_submission
+from tests.test_dashboard import count_queries
+from tests.test_fragment_cache import rendered_templates
+
+def read_flashes(client):
+    """Drop flash messages left by earlier posts, as the browser's next page view would."""
+    with client.session_transaction() as session:
+        session.pop('_flashes', None)
+
+def revalidate(client, url):
+    """Fetch url, then request it again with the returned ETag."""
+    read_flashes(client)
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    return first, client.get(url, headers={'If-None-Match': first.headers['ETag']})
+
+class TestReportETags:
+    def test_repeat_report_view_is_not_modified(self, client, app, dev_user, discussion_template):
+        """Test that an unchanged report answers 304 after one query and no rendering."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        first = client.get(f'/report/{request_id}')
+
+        with rendered_templates(app) as rendered, count_queries(app) as statements:
+            second = client.get(f'/report/{request_id}', headers={'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 304
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert second.get_data() == b''
+        assert rendered == []
+        assert len(statements) == 1
+
+    def test_regenerated_summary_changes_etag(self, client, app, dev_user, discussion_template):
+        """Test that a regenerated summary is served instead of a 304."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        with app.app_context():
+            discussion = Response.query.filter_by(feedback_request_id=request_id).filter(
+                Response.discussion_summary.isnot(None)).one()
+            discussion.chat_history = '[{"role": "user", "content": "Always on time"}]'
+            db.session.commit()
+            discussion_id = discussion.id
+        read_flashes(client)
+        first = client.get(f'/report/{request_id}')
+
+        with unittest.mock.patch.object(app_module, 'generate_feedback_summary_with_custom_prompt', return_value='Regenerated.'):
+            client.post(f'/api/regenerate-summary/{discussion_id}', json={'custom_prompt': 'Be brief'})
+        read_flashes(client)
+        second = client.get(f'/report/{request_id}', headers={'If-None-Match': first.headers['ETag']})
+
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+        assert 'Regenerated.' in second.get_data(as_text=True)
+
+    def test_new_submission_changes_etag(self, client, app, dev_user, survey_request):
+        """Test that submitting answers invalidates the report's ETag."""
+        read_flashes(client)
+        first = client.get(f'/report/{survey_request.id}')
+        with app.app_context():
+            question_id = survey_request.template.questions[0].id
+            db.session.add(Response(feedback_request_id=survey_request.id, question_id=question_id, rating_value=5))
+            db.session.commit()
+        client.post(f'/submit/{survey_request.id}')
+        read_flashes(client)
+
+        second = client.get(f'/report/{survey_request.id}', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+
+    def test_etag_depends_on_viewer(self, client, app, dev_user, discussion_template):
+        """Test that another user's cached copy is not reused."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        first = client.get(f'/report/{request_id}')
+        with app.app_context():
+            admin = User(email='other-admin@example.com', name='Other Admin', is_admin=True)
+            db.session.add(admin)
+            db.session.commit()
+            with unittest.mock.patch('app.ensure_authenticated', return_value=admin):
+                second = client.get(f'/report/{request_id}', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+
+    def test_denied_report_is_not_cached(self, client, app, dev_user, discussion_template):
+        """Test that access is checked before the ETag is compared."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        etag = client.get(f'/report/{request_id}').headers['ETag']
+        with app.app_context():
+            member = User(email='member@example.com', name='Member')
+            db.session.add(member)
+            db.session.commit()
+            with unittest.mock.patch('app.ensure_authenticated', return_value=member):
+                response = client.get(f'/report/{request_id}', headers={'If-None-Match': etag})
+        assert response.status_code == 302
+
+class TestPageETags:
+    def test_share_page_is_not_modified(self, client, survey_request):
+        """Test that the share page revalidates with its ETag."""
+        _, second = revalidate(client, f'/share/{survey_request.id}')
+        assert second.status_code == 304
+
+    def test_missing_share_page_is_404(self, client):
+        assert client.get('/share/missing').status_code == 404
+
+    def test_aggregate_report_is_not_modified(self, client, dev_user, discussion_template):
+        """Test that an unchanged aggregate report answers 304."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        _, second = revalidate(client, '/aggregate-report?target_email=jane@example.com')
+        assert second.status_code == 304
+
+    def test_aggregate_report_changes_with_submissions(self, client, dev_user, discussion_template):
+        """Test that a new submission for the target changes the aggregate ETag."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        first = client.get('/aggregate-report?target_email=jane@example.com')
+        add_submission(client, dev_user, discussion_template, rating=2)
+        read_flashes(client)
+
+        second = client.get('/aggregate-report?target_email=jane@example.com',
+                            headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+
+    def test_aggregate_etag_ignores_feedback_the_viewer_cannot_see(self, client, app, dev_user, discussion_template):
+        """Test that another requester's submission leaves a requester's aggregate page, and its ETag, unchanged."""
+        alice, bob = add_requesters(app, 'alice@example.com', 'bob@example.com')
+        add_submission(client, alice, discussion_template, rating=5)
+        url = '/aggregate-report?target_email=jane@example.com'
+        read_flashes(client)
+        with app.app_context(), unittest.mock.patch('app.ensure_authenticated', return_value=alice):
+            first = client.get(url)
+        bob_request_id = add_submission(client, bob, discussion_template, rating=1)
+        read_flashes(client)
+        with app.app_context(), unittest.mock.patch('app.ensure_authenticated', return_value=alice):
+            second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        
+        assert second.status_code == 304
+        with app.app_context():
+            assert Response.query.filter_by(feedback_request_id=bob_request_id, is_draft=False).count() == 2
+    
+    def test_aggregate_etag_follows_stats_tables(self, client, app, dev_user, discussion_template):
+        """Test that changing the stats behind the headline numbers, e.g. by a rebuild, changes the ETag."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        first = client.get('/aggregate-report?target_email=jane@example.com')
+        with app.app_context():
+            TargetGiverStats.query.update({TargetGiverStats.session_count: 2})
+            db.session.commit()
+        
+        second = client.get('/aggregate-report?target_email=jane@example.com',
+                            headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+    
+    def test_aggregate_filters_change_etag(self, client, dev_user, discussion_template):
+        add_submission(client, dev_user, discussion_template, rating=4)
+        read_flashes(client)
+        first = client.get('/aggregate-report?target_email=jane@example.com')
+        second = client.get('/aggregate-report?target_email=jane@example.com&start_date=2024-03-01',
+                            headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+
+    def test_page_with_flash_message_has_no_etag(self, client, app, dev_user, discussion_template):
+        """Test that a page showing a one-off flash message is never answered with 304."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        with app.app_context():
+            member = User(email='member@example.com', name='Member')
+            db.session.add(member)
+            db.session.commit()
+            with unittest.mock.patch('app.ensure_authenticated', return_value=member):
+                response = client.get('/aggregate-report?target_email=jane@example.com')
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
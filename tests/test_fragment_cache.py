@@ -0,0 +1,82 @@
+import pytest
+import unittest.mock
+from contextlib import contextmanager
+from flask import template_rendered
+from models import db, Response
+from fragment_cache import FileBackend, MemoryBackend
+import app as app_module
+from tests.test_aggregates import add_submission
+
+@contextmanager
+def rendered_templates(app):
+    """Record the names of templates rendered while the block runs."""
+    names = []
+    
+    def record(sender, template, context, **extra):
+        names.append(template.name)
+    
+    template_rendered.connect(record, app)
+    try:
+        yield names
+    finally:
+        template_rendered.disconnect(record, app)
+
+class TestReportFragments:
+    def test_second_view_reuses_response_blocks(self, client, app, dev_user, discussion_template):
+        """Test that submitted responses are rendered once and then served from the cache."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        
+        with rendered_templates(app) as first:
+            client.get(f'/report/{request_id}')
+        with rendered_templates(app) as second:
+            page = client.get(f'/report/{request_id}').get_data(as_text=True)
+        
+        assert first.count('report_response.html') == 2
+        assert 'report_response.html' not in second
+        assert 'Reliable.' in page
+
+    def test_regenerate_summary_refreshes_block(self, client, app, dev_user, discussion_template):
+        """Test that a regenerated summary shows up on the next view."""
+        request_id = add_submission(client, dev_user, discussion_template, rating=4)
+        with app.app_context():
+            discussion = Response.query.filter_by(feedback_request_id=request_id).filter(
+                Response.discussion_summary.isnot(None)).one()
+            discussion.chat_history = '[{"role": "user", "content": "Always on time"}]'
+            db.session.commit()
+            discussion_id = discussion.id
+        client.get(f'/report/{request_id}')
+        client.get(f'/aggregate-report?target_email=jane@example.com')
+        
+        with unittest.mock.patch.object(app_module, 'generate_feedback_summary_with_custom_prompt', return_value='Regenerated.'):
+            client.post(f'/api/regenerate-summary/{discussion_id}', json={'custom_prompt': 'Be brief'})
+        
+        assert 'Regenerated.' in client.get(f'/report/{request_id}').get_data(as_text=True)
+        assert 'Regenerated.' in client.get('/aggregate-report?target_email=jane@example.com').get_data(as_text=True)
+
+    def test_aggregate_cards_are_cached(self, client, app, dev_user, discussion_template):
+        """Test that per-request cards on the aggregate report render once."""
+        add_submission(client, dev_user, discussion_template, rating=4)
+        client.get('/aggregate-report?target_email=jane@example.com')
+        
+        with rendered_templates(app) as names:
+            client.get('/aggregate-report?target_email=jane@example.com')
+        assert 'aggregate_report_request.html' not in names
+
+class TestBackends:
+    def test_memory_backend_is_bounded(self):
+        """Test least-recently-used eviction."""
+        backend = MemoryBackend(max_entries=2)
+        backend.set('a', '1', '<p>a</p>')
+        backend.set('b', '1', '<p>b</p>')
+        backend.get('a')
+        backend.set('c', '1', '<p>c</p>')
+        assert backend.get('b') is None
+        assert backend.get('a') == ('1', '<p>a</p>')
+
+    def test_file_backend_round_trip(self, tmp_path):
+        """Test that fragments survive in files and can be deleted."""
+        backend = FileBackend(str(tmp_path))
+        backend.set('report-response:1', '2024-01-01T00:00:00', '<p>multi\nline</p>')
+        assert FileBackend(str(tmp_path)).get('report-response:1') == ('2024-01-01T00:00:00', '<p>multi\nline</p>')
+        backend.delete('report-response:1')
+        assert backend.get('report-response:1') is None
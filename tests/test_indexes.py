@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime
+from models import db, FeedbackTemplate, FeedbackRequest, Question, Response
+
+def query_plan(query):
+    """Return SQLite's EXPLAIN QUERY PLAN details for an ORM query."""
+    compiled = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+def assert_uses_index(query, index_name):
+    plan = query_plan(query)
+    assert f'INDEX {index_name}' in plan, plan
+
+class TestIndexUsage:
+    def test_created_by_bucket_uses_index(self, app):
+        """Test the 'requests I created' dashboard page query."""
+        with app.app_context():
+            query = FeedbackRequest.query.filter(FeedbackRequest.created_by_id == 'user-id')\
+                .order_by(FeedbackRequest.created_at.desc(), FeedbackRequest.id.desc()).limit(25)
+            assert_uses_index(query, 'ix_feedback_request_created_by_created_at')
+
+    def test_about_me_bucket_uses_index(self, app):
+        """Test the 'feedback about me' dashboard query."""
+        with app.app_context():
+            query = FeedbackRequest.query.filter(FeedbackRequest.target_email == 'me@example.com')\
+                .filter(FeedbackRequest.created_by_id != 'user-id')\
+                .order_by(FeedbackRequest.created_at.desc(), FeedbackRequest.id.desc())
+            assert_uses_index(query, 'ix_feedback_request_target_email_created_at')
+
+    def test_assigned_bucket_uses_indexes_for_both_branches(self, app):
+        """Test that the email-or-legacy-id filter uses an index for each branch."""
+        with app.app_context():
+            query = FeedbackRequest.query.filter(
+                (FeedbackRequest.assigned_to_email == 'me@example.com') |
+                (FeedbackRequest.assigned_to_id == 'user-id')
+            )
+            plan = query_plan(query)
+            assert 'ix_feedback_request_assigned_email_created_at' in plan, plan
+            assert 'ix_feedback_request_assigned_to_id' in plan, plan
+
+    def test_aggregate_report_date_range_uses_index(self, app):
+        """Test the aggregate report's per-target date range query."""
+        with app.app_context():
+            query = FeedbackRequest.query.filter(
+                FeedbackRequest.target_email == 'target@example.com',
+                FeedbackRequest.created_at >= datetime(2024, 1, 1),
+                FeedbackRequest.created_at <= datetime(2024, 12, 31)
+            ).order_by(FeedbackRequest.created_at.desc())
+            assert_uses_index(query, 'ix_feedback_request_target_email_created_at')
+
+    def test_submitted_response_lookups_use_index(self, app):
+        """Test report and dashboard count lookups of submitted responses."""
+        with app.app_context():
+            report_query = Response.query.filter_by(feedback_request_id='request-id', is_draft=False)
+            assert_uses_index(report_query, 'ix_response_request_draft')
+            
+            count_query = db.session.query(Response.feedback_request_id, db.func.count(Response.id))\
+                .filter(Response.feedback_request_id.in_(['a', 'b']), Response.is_draft == False)\
+                .group_by(Response.feedback_request_id)
+            assert_uses_index(count_query, 'ix_response_request_draft')
+
+    def test_response_by_question_uses_index(self, app):
+        """Test per-question response lookups."""
+        with app.app_context():
+            assert_uses_index(Response.query.filter_by(question_id='question-id'), 'ix_response_question_id')
+
+    def test_survey_questions_use_index(self, app):
+        """Test the ordered question list used by the survey and chat."""
+        with app.app_context():
+            query = Question.query.filter_by(template_id='template-id').order_by(Question.order_index)
+            assert_uses_index(query, 'ix_question_template_order')
+
+    def test_template_list_uses_index(self, app):
+        """Test the template list keyset page."""
+        with app.app_context():
+            query = FeedbackTemplate.query.order_by(FeedbackTemplate.created_at.desc(), FeedbackTemplate.id.desc()).limit(24)
+            assert_uses_index(query, 'ix_feedback_template_created_at_id')
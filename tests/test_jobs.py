@@ -0,0 +1,208 @@
+import pytest
+import unittest.mock
+import json
+from datetime import datetime, timedelta
+from models import db, Job, Question, Response
+from jobs import JOB_HANDLERS, job_handler, enqueue_job, claim_next_job, run_job, run_worker
+
+CHAT_HISTORY = [
+    {"role": "user", "content": "They are very collaborative"},
+    {"role": "assistant", "content": "Can you give me a specific example?"},
+    {"role": "user", "content": "They helped coordinate the project launch"}
+]
+
+@pytest.fixture
+def flaky_handler():
+    """A handler that fails a set number of times before succeeding."""
+    calls = []
+    
+    @job_handler('flaky')
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) <= payload['failures']:
+            raise RuntimeError('Transient failure')
+        return {'calls': len(calls)}
+    
+    yield calls
+    JOB_HANDLERS.pop('flaky', None)
+
+def mock_summary_llm(mock_openai, content="Organized summary."):
+    mock_client = unittest.mock.Mock()
+    mock_openai.return_value = mock_client
+    # Summaries bound each call with with_options(timeout=...)
+    mock_client.with_options.return_value = mock_client
+    mock_response = unittest.mock.Mock()
+    mock_response.choices = [unittest.mock.Mock()]
+    mock_response.choices[0].message.content = content
+    mock_client.chat.completions.create.return_value = mock_response
+    return mock_client
+
+class TestJobQueue:
+    def test_enqueue_dedupes_queued_jobs_by_key(self, app, flaky_handler):
+        """Test that a queued job is reused for the same type and key."""
+        with app.app_context():
+            first = enqueue_job('flaky', {'failures': 0}, key='request-1')
+            second = enqueue_job('flaky', {'failures': 0}, key='request-1')
+            other = enqueue_job('flaky', {'failures': 0}, key='request-2')
+            
+            assert first.id == second.id
+            assert other.id != first.id
+
+    def test_unknown_job_type_rejected(self, app):
+        """Test that only registered job types can be queued."""
+        with app.app_context():
+            with pytest.raises(ValueError):
+                enqueue_job('does-not-exist', {})
+
+    def test_failed_job_retries_with_backoff(self, app, flaky_handler):
+        """Test that a failure requeues the job with a delay until it succeeds."""
+        with app.app_context():
+            job = enqueue_job('flaky', {'failures': 1})
+            
+            run_job(claim_next_job())
+            assert job.status == 'queued'
+            assert job.attempts == 1
+            assert job.run_after > datetime.utcnow()
+            assert claim_next_job() is None  # Still backing off
+            
+            job.run_after = datetime.utcnow()
+            db.session.commit()
+            run_job(claim_next_job())
+            assert job.status == 'succeeded'
+            assert json.loads(job.result) == {'calls': 2}
+
+    def test_job_fails_after_max_attempts(self, app, flaky_handler):
+        """Test that a job is marked failed once its attempts are used up."""
+        app.config['JOB_RETRY_BACKOFF'] = 0
+        with app.app_context():
+            job = enqueue_job('flaky', {'failures': 10})
+            processed = run_worker(app, once=True)
+            
+            assert processed == app.config['JOB_MAX_ATTEMPTS']
+            assert job.status == 'failed'
+            assert job.error == 'Transient failure'
+
+    def test_stale_running_job_is_reclaimed(self, app, flaky_handler):
+        """Test that a job abandoned by a dead worker is picked up again."""
+        with app.app_context():
+            job = enqueue_job('flaky', {'failures': 0})
+            claim_next_job()
+            assert claim_next_job() is None
+            
+            job.started_at = datetime.utcnow() - timedelta(seconds=app.config['JOB_LEASE_SECONDS'] + 1)
+            db.session.commit()
+            reclaimed = claim_next_job()
+            assert reclaimed.id == job.id
+            assert reclaimed.attempts == 2
+
+    def test_stale_job_out_of_attempts_fails(self, app, flaky_handler):
+        """Test that a job whose worker dies on its last attempt is failed rather than reclaimed."""
+        with app.app_context():
+            job = enqueue_job('flaky', {'failures': 0})
+            job.max_attempts = 1
+            db.session.commit()
+            claim_next_job()
+            
+            job.started_at = datetime.utcnow() - timedelta(seconds=app.config['JOB_LEASE_SECONDS'] + 1)
+            db.session.commit()
+            assert claim_next_job() is None
+            
+            db.session.refresh(job)
+            assert job.status == 'failed'
+            assert job.attempts == 1
+            assert job.finished_at is not None
+            assert 'lease expired' in job.error
+            assert flaky_handler == []
+
+class TestQueuedRoutes:
+    def test_review_post_enqueues_summaries(self, client, survey_request, discussion_template):
+        """Test that queued mode saves drafts and leaves summaries to the worker."""
+        client.application.config['JOB_QUEUE_ENABLED'] = True
+        with client.application.app_context():
+            question = Question.query.filter_by(template_id=discussion_template.id, question_type='discussion').first()
+            
+            response = client.post(f'/review/{survey_request.id}', json={
+                question.id: {'type': 'discussion', 'chat_history': CHAT_HISTORY}
+            })
+            job_id = response.get_json()['job_id']
+            
+            draft = Response.query.filter_by(feedback_request_id=survey_request.id, is_draft=True).one()
+            assert draft.discussion_summary is None
+            assert client.get(f'/api/jobs/{job_id}').get_json()['status'] == 'queued'
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_summary_llm(mock_openai)
+                run_worker(client.application, once=True)
+            
+            db.session.refresh(draft)
+            assert draft.discussion_summary == "Organized summary."
+            status = client.get(f'/api/jobs/{job_id}').get_json()
+            assert status['status'] == 'succeeded'
+            assert status['result'] == {'summarized': 1}
+
+    def test_regenerate_summary_enqueues_job(self, client, survey_request, discussion_template):
+        """Test that queued mode returns a job id and the worker applies the new summary."""
+        client.application.config['JOB_QUEUE_ENABLED'] = True
+        with client.application.app_context():
+            question = Question.query.filter_by(template_id=discussion_template.id, question_type='discussion').first()
+            draft = Response(feedback_request_id=survey_request.id, question_id=question.id,
+                             chat_history=json.dumps(CHAT_HISTORY), discussion_summary="Old summary.")
+            db.session.add(draft)
+            db.session.commit()
+            
+            response = client.post(f'/api/regenerate-summary/{draft.id}', json={'custom_prompt': 'Be brief'})
+            assert response.status_code == 202
+            job_id = response.get_json()['job_id']
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_summary_llm(mock_openai, "Brief summary.")
+                run_worker(client.application, once=True)
+            
+            assert client.get(f'/api/jobs/{job_id}').get_json()['result'] == {'new_summary': "Brief summary."}
+
+    def test_coaching_page_waits_for_worker(self, client, survey_request):
+        """Test that an uncached coaching guide is queued and the page polls for it."""
+        client.application.config['JOB_QUEUE_ENABLED'] = True
+        response = client.get(f'/coaching/{survey_request.id}')
+        
+        assert response.status_code == 200
+        assert b'coaching-pending' in response.data
+        with client.application.app_context():
+            assert Job.query.filter_by(job_type='coaching_guide', key=survey_request.id).count() == 1
+    
+    def test_coaching_fallback_is_shown_instead_of_requeued(self, client, survey_request):
+        """Test that a job that could only build the fallback guide isn't queued again on reload."""
+        client.application.config['JOB_QUEUE_ENABLED'] = True
+        client.get(f'/coaching/{survey_request.id}')
+        
+        with unittest.mock.patch('app.get_llm_client', return_value=None):
+            run_worker(client.application, once=True)
+        response = client.get(f'/coaching/{survey_request.id}')
+        
+        assert b'id="coaching-pending"' not in response.data
+        assert b'Personalized Coaching Guide' in response.data
+        with client.application.app_context():
+            assert Job.query.filter_by(job_type='coaching_guide', key=survey_request.id).count() == 1
+    
+    def test_failed_coaching_job_is_retried_later(self, client, survey_request):
+        """Test that a failed coaching job shows the fallback until the retry window passes."""
+        client.application.config['JOB_QUEUE_ENABLED'] = True
+        client.get(f'/coaching/{survey_request.id}')
+        with client.application.app_context():
+            job = Job.query.filter_by(job_type='coaching_guide', key=survey_request.id).one()
+            job.status = 'failed'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        
+        response = client.get(f'/coaching/{survey_request.id}')
+        assert b'id="coaching-pending"' not in response.data
+        assert b'Personalized Coaching Guide' in response.data
+        
+        with client.application.app_context():
+            job = Job.query.filter_by(job_type='coaching_guide', key=survey_request.id).one()
+            job.finished_at = datetime.utcnow() - timedelta(seconds=client.application.config['COACHING_RETRY_SECONDS'] + 1)
+            db.session.commit()
+        
+        assert b'id="coaching-pending"' in client.get(f'/coaching/{survey_request.id}').data
+        with client.application.app_context():
+            assert Job.query.filter_by(job_type='coaching_guide', key=survey_request.id).count() == 2
@@ -0,0 +1,47 @@
+import pytest
+import unittest.mock
+from llm import LLMClientRegistry, get_llm_client
+
+class TestLLMClientRegistry:
+    def test_registry_registered_on_app(self, app):
+        """Test that create_app registers the shared client registry."""
+        assert isinstance(app.extensions['llm_clients'], LLMClientRegistry)
+
+    def test_client_is_reused_across_calls(self, app):
+        """Test that repeated lookups return the same pooled client."""
+        with app.app_context():
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                first = get_llm_client()
+                second = get_llm_client()
+                
+                assert first is second
+                mock_openai.assert_called_once()
+
+    def test_pool_settings_from_config(self, app):
+        """Test that pool size and timeouts come from the app config."""
+        app.config.update({
+            'OPENAI_POOL_MAX_CONNECTIONS': 7,
+            'OPENAI_POOL_MAX_KEEPALIVE': 3,
+            'OPENAI_TIMEOUT': 12.0,
+            'OPENAI_CONNECT_TIMEOUT': 2.0
+        })
+        registry = LLMClientRegistry(app)
+        http_client = registry.build_http_client()
+        
+        pool = http_client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert http_client.timeout.read == 12.0
+        assert http_client.timeout.connect == 2.0
+        http_client.close()
+
+    def test_new_client_per_worker_process(self, app):
+        """Test that a forked worker gets its own client instead of the parent's."""
+        registry = app.extensions['llm_clients']
+        with unittest.mock.patch('openai.OpenAI', side_effect=lambda **kwargs: unittest.mock.Mock()):
+            with unittest.mock.patch('os.getpid', return_value=1000):
+                parent_client = registry.get_client()
+            with unittest.mock.patch('os.getpid', return_value=1001):
+                worker_client = registry.get_client()
+        
+        assert parent_client is not worker_client
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta
+from models import db, FeedbackTemplate, FeedbackRequest
+from pagination import encode_cursor, decode_cursor, page_size, keyset_page
+
+@pytest.fixture
+def many_requests(app, dev_user, discussion_template):
+    """Thirty requests created by the dev user, several sharing a timestamp."""
+    with app.app_context():
+        base = datetime(2024, 1, 1)
+        for i in range(30):
+            db.session.add(FeedbackRequest(
+                target_name=f"Person {i:02d}",
+                target_email=f"person{i}@example.com",
+                assigned_to_email=f"giver{i}@example.com",
+                template_id=discussion_template.id,
+                created_by_id=dev_user.id,
+                created_at=base + timedelta(days=i // 3)  # Ties exercise the id tie-breaker
+            ))
+        db.session.commit()
+
+class TestCursors:
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the position it encodes."""
+        created_at = datetime(2024, 5, 17, 12, 30, 15, 123456)
+        assert decode_cursor(encode_cursor(created_at, 'abc-123')) == (created_at, 'abc-123')
+
+    def test_malformed_cursor_rejected(self):
+        """Test that garbage cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor('not-a-cursor')
+
+    def test_page_size_clamped(self):
+        """Test that page sizes fall back to the default and respect the maximum."""
+        assert page_size(None, 25, 100) == 25
+        assert page_size('abc', 25, 100) == 25
+        assert page_size('500', 25, 100) == 100
+        assert page_size('0', 25, 100) == 1
+
+    def test_keyset_pages_cover_every_row_once(self, app, many_requests):
+        """Test that walking the cursors visits each row exactly once, newest first."""
+        with app.app_context():
+            seen = []
+            cursor = None
+            while True:
+                items, cursor = keyset_page(FeedbackRequest.query, FeedbackRequest, cursor, limit=7)
+                seen.extend(items)
+                if not cursor:
+                    break
+            
+            expected = FeedbackRequest.query.order_by(FeedbackRequest.created_at.desc(), FeedbackRequest.id.desc()).all()
+            assert [r.id for r in seen] == [r.id for r in expected]
+
+class TestPaginatedRoutes:
+    def test_dashboard_first_page_and_load_more(self, client, many_requests):
+        """Test that the dashboard shows one page and the endpoint serves the rest."""
+        client.application.config['DASHBOARD_PAGE_SIZE'] = 10
+        response = client.get('/dashboard')
+        assert response.data.count(b'<tr>') == 10 + 1  # Rows plus the header row
+        assert b'load-more' in response.data
+        
+        with client.application.app_context():
+            first_page, cursor = keyset_page(FeedbackRequest.query, FeedbackRequest, limit=10)
+        
+        rows = 0
+        while cursor:
+            data = client.get(f'/api/dashboard/created_by_me?cursor={cursor}').get_json()
+            rows += data['html'].count('<tr>')
+            cursor = data['next_cursor']
+        assert rows == 20
+
+    def test_dashboard_totals_count_all_requests(self, client, many_requests):
+        """Test that the section badge shows the total, not the page size."""
+        client.application.config['DASHBOARD_PAGE_SIZE'] = 5
+        response = client.get('/dashboard')
+        assert b'<h4>30</h4>' in response.data
+
+    def test_invalid_cursor_returns_400(self, client, dev_user):
+        """Test that the load-more endpoints reject malformed cursors."""
+        assert client.get('/api/dashboard/created_by_me?cursor=bogus').status_code == 400
+        assert client.get('/api/templates?cursor=bogus').status_code == 400
+
+    def test_unknown_dashboard_role_returns_404(self, client, dev_user):
+        """Test that only the known dashboard sections can be paged."""
+        assert client.get('/api/dashboard/everything').status_code == 404
+
+    def test_template_list_load_more(self, client, dev_user):
+        """Test that templates are listed a page at a time."""
+        client.application.config['TEMPLATES_PAGE_SIZE'] = 4
+        with client.application.app_context():
+            for i in range(6):
+                db.session.add(FeedbackTemplate(name=f"Template {i}", created_by_id=dev_user.id,
+                                                created_at=datetime(2024, 1, 1) + timedelta(days=i)))
+            db.session.commit()
+        
+        response = client.get('/templates')
+        assert b'Template 5' in response.data
+        assert b'Template 1' not in response.data
+        assert b'load-more-templates' in response.data
+        
+        with client.application.app_context():
+            _, cursor = keyset_page(FeedbackTemplate.query, FeedbackTemplate, limit=4)
+        data = client.get(f'/api/templates?cursor={cursor}').get_json()
+        assert 'Template 1' in data['html'] and 'Template 0' in data['html']
+        assert data['next_cursor'] is None
@@ -0,0 +1,86 @@
+import pytest
+import unittest.mock
+import json
+from models import db, Question, Response
+from app import build_prior_context, get_prior_context, invalidate_prior_context
+from tests.test_dashboard import count_queries
+
+def template_questions(template):
+    return Question.query.filter_by(template_id=template.id).order_by(Question.order_index).all()
+
+def add_draft_answers(feedback_request, questions):
+    rating, strengths, growth = questions
+    db.session.add_all([
+        Response(feedback_request_id=feedback_request.id, question_id=rating.id, rating_value=4, is_draft=True),
+        Response(feedback_request_id=feedback_request.id, question_id=strengths.id,
+                 discussion_summary="Clear, calm communicator", is_draft=True),
+        Response(feedback_request_id=feedback_request.id, question_id=growth.id,
+                 discussion_summary="Could delegate more", is_draft=True)
+    ])
+    db.session.commit()
+
+class TestPriorContext:
+    def test_includes_only_earlier_draft_answers_in_order(self, app, survey_request, discussion_template):
+        """Test that context lists earlier answers in question order."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            add_draft_answers(survey_request, questions)
+            
+            context = build_prior_context(survey_request.id, questions[2])
+            
+            assert "Previous questions and responses" in context
+            assert context.index("4/5") < context.index("Clear, calm communicator")
+            assert "Could delegate more" not in context
+            assert build_prior_context(survey_request.id, questions[0]) == ""
+
+    def test_ignores_submitted_responses(self, app, survey_request, discussion_template):
+        """Test that submitted answers are not used as chat context."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            db.session.add(Response(feedback_request_id=survey_request.id, question_id=questions[0].id,
+                                    rating_value=2, is_draft=False))
+            db.session.commit()
+            
+            assert build_prior_context(survey_request.id, questions[2]) == ""
+
+    def test_builds_context_with_one_query(self, app, survey_request, discussion_template):
+        """Test that context costs one query regardless of prior question count."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            add_draft_answers(survey_request, questions)
+            question = db.session.get(Question, questions[2].id)
+            
+            with count_queries(app) as statements:
+                build_prior_context(survey_request.id, question)
+            
+            assert len(statements) == 1
+
+    def test_memoized_until_invalidated(self, app, survey_request, discussion_template):
+        """Test that repeated turns reuse the context until drafts change."""
+        with app.app_context():
+            questions = template_questions(discussion_template)
+            add_draft_answers(survey_request, questions)
+            
+            first = get_prior_context(survey_request.id, questions[2])
+            with count_queries(app) as statements:
+                assert get_prior_context(survey_request.id, questions[2]) == first
+            assert statements == []
+            
+            invalidate_prior_context(survey_request.id)
+            with count_queries(app) as statements:
+                get_prior_context(survey_request.id, questions[2])
+            assert len(statements) == 1
+
+    def test_review_save_refreshes_chat_context(self, client, survey_request, discussion_template):
+        """Test that saving drafts on review invalidates the memoized context."""
+        with client.application.app_context():
+            questions = template_questions(discussion_template)
+            assert get_prior_context(survey_request.id, questions[2]) == ""
+            
+            with unittest.mock.patch('openai.OpenAI'):
+                response = client.post(f'/review/{survey_request.id}', json={
+                    questions[0].id: {'type': 'rating', 'value': '5'}
+                })
+            assert response.status_code == 200
+            
+            assert "5/5" in get_prior_context(survey_request.id, questions[2])
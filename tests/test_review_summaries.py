@@ -0,0 +1,91 @@
+import pytest
+import unittest.mock
+import threading
+import time
+from models import Question, Response
+import app as app_module
+from app import generate_feedback_summaries
+
+CHAT_HISTORY = [
+    {"role": "user", "content": "They are very collaborative"},
+    {"role": "assistant", "content": "Can you give me a specific example?"},
+    {"role": "user", "content": "They helped coordinate the project launch"}
+]
+
+class TestConcurrentSummaries:
+    def test_summaries_run_with_bounded_concurrency(self, app):
+        """Test that summaries run in parallel but never exceed max_workers."""
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+        
+        def slow_summary(question_text, chat_history, is_supervisor_feedback=False, timeout=None):
+            with lock:
+                in_flight.append(question_text)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.remove(question_text)
+            return f"Summary of {question_text}"
+        
+        discussions = {f"q{i}": (f"Question {i}", CHAT_HISTORY, False) for i in range(6)}
+        with app.app_context():
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', side_effect=slow_summary):
+                summaries = generate_feedback_summaries(discussions, max_workers=3, timeout=5)
+        
+        assert summaries == {f"q{i}": f"Summary of Question {i}" for i in range(6)}
+        assert max(peak) == 3
+
+    def test_timed_out_summary_falls_back(self, app):
+        """Test that a call exceeding the timeout falls back to the user's messages."""
+        def stuck_summary(question_text, chat_history, is_supervisor_feedback=False, timeout=None):
+            time.sleep(0.5)
+            return "Too late"
+        
+        with app.app_context():
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', side_effect=stuck_summary):
+                summaries = generate_feedback_summaries({'q1': ("Question", CHAT_HISTORY, False)}, timeout=0.05)
+        
+        assert summaries['q1'] == "They are very collaborative They helped coordinate the project launch"
+
+    def test_timeout_is_enforced_on_the_llm_call(self, app):
+        """Test that each summary call is cut off by the client itself, so abandoned threads stop."""
+        with app.app_context():
+            with unittest.mock.patch.object(app_module, 'get_llm_client') as get_client:
+                bounded = get_client.return_value.with_options.return_value
+                bounded.chat.completions.create.return_value.choices = [unittest.mock.Mock()]
+                bounded.chat.completions.create.return_value.choices[0].message.content = "Organized."
+                summaries = generate_feedback_summaries({'q1': ("Question", CHAT_HISTORY, False)}, timeout=7)
+        
+        assert summaries == {'q1': "Organized."}
+        get_client.return_value.with_options.assert_called_once_with(timeout=7, max_retries=0)
+        get_client.return_value.chat.completions.create.assert_not_called()
+
+    def test_review_post_saves_all_summaries(self, client, survey_request, discussion_template):
+        """Test that the review POST stores every generated summary in one save."""
+        with client.application.app_context():
+            questions = Question.query.filter_by(template_id=discussion_template.id).order_by(Question.order_index).all()
+            rating_question, first_discussion, second_discussion = questions
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = unittest.mock.Mock()
+                mock_openai.return_value = mock_client
+                mock_client.with_options.return_value = mock_client
+                mock_response = unittest.mock.Mock()
+                mock_response.choices = [unittest.mock.Mock()]
+                mock_response.choices[0].message.content = "Organized summary."
+                mock_client.chat.completions.create.return_value = mock_response
+                
+                response = client.post(f'/review/{survey_request.id}', json={
+                    rating_question.id: {'type': 'rating', 'value': '4'},
+                    first_discussion.id: {'type': 'discussion', 'chat_history': CHAT_HISTORY},
+                    second_discussion.id: {'type': 'discussion', 'chat_history': CHAT_HISTORY}
+                })
+                
+                assert response.get_json() == {'success': True}
+                assert mock_client.chat.completions.create.call_count == 2
+            
+            drafts = {r.question_id: r for r in Response.query.filter_by(feedback_request_id=survey_request.id, is_draft=True)}
+            assert drafts[rating_question.id].rating_value == 4
+            assert drafts[first_discussion.id].discussion_summary == "Organized summary."
+            assert drafts[second_discussion.id].discussion_summary == "Organized summary."
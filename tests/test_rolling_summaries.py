@@ -0,0 +1,116 @@
+import pytest
+import unittest.mock
+from models import db, Job, Response, DiscussionSummary
+from chat_sessions import conversation_key, record_turn
+from jobs import run_worker
+import app as app_module
+from app import update_rolling_summary, schedule_rolling_summary
+from tests.test_chat_streaming import discussion_question
+from tests.test_chat_sessions import mock_completion
+
+def record_discussion(feedback_request, question):
+    key = conversation_key('survey', feedback_request.id, question.id)
+    record_turn(key, 0, 'They unblocked the launch', 'Can you share an example?')
+    return [
+        {'role': 'user', 'content': 'They unblocked the launch'},
+        {'role': 'assistant', 'content': 'Can you share an example?'}
+    ]
+
+class TestRollingSummaries:
+    def test_update_stores_summary_once_per_transcript(self, app, survey_request, discussion_template):
+        """Test that an unchanged transcript is not summarized again."""
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            record_discussion(survey_request, question)
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.') as summarize:
+                assert update_rolling_summary(survey_request.id, question.id) == 'Organized summary.'
+                assert update_rolling_summary(survey_request.id, question.id) == 'Organized summary.'
+            
+            assert summarize.call_count == 1
+            assert DiscussionSummary.query.count() == 1
+
+    def test_fallback_summary_is_not_stored(self, app, survey_request, discussion_template):
+        """Test that a failed LLM call leaves the summary for review to generate."""
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            record_discussion(survey_request, question)
+            
+            with unittest.mock.patch('openai.OpenAI', side_effect=Exception("API Error")):
+                assert update_rolling_summary(survey_request.id, question.id) is None
+            
+            assert DiscussionSummary.query.count() == 0
+
+    def test_chat_turn_schedules_update(self, client, survey_request, discussion_template):
+        """Test that each recorded chat turn refreshes the summary in the background."""
+        client.application.config['ROLLING_SUMMARIES_ENABLED'] = True
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_completion(mock_openai, "Can you share an example?")
+                with unittest.mock.patch.object(app_module, 'schedule_rolling_summary') as schedule:
+                    client.post(f'/api/chat/{question.id}', json={
+                        'message': 'They unblocked the launch', 'seq': 0, 'feedback_request_id': survey_request.id
+                    })
+            
+            schedule.assert_called_once_with(survey_request.id, question.id)
+
+    def test_executor_materializes_summary(self, app, survey_request, discussion_template):
+        """Test that the in-process executor runs the update with an app context."""
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            record_discussion(survey_request, question)
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.'):
+                schedule_rolling_summary(survey_request.id, question.id).result(timeout=5)
+            
+            assert DiscussionSummary.query.one().summary == 'Organized summary.'
+
+    def test_job_queue_materializes_summary(self, app, survey_request, discussion_template):
+        """Test that with the job queue on, a worker refreshes the summary."""
+        app.config['JOB_QUEUE_ENABLED'] = True
+        with app.app_context():
+            question = discussion_question(discussion_template)
+            record_discussion(survey_request, question)
+            
+            schedule_rolling_summary(survey_request.id, question.id)
+            assert Job.query.filter_by(job_type='rolling_summary').count() == 1
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.'):
+                run_worker(app, once=True)
+            
+            assert DiscussionSummary.query.one().summary == 'Organized summary.'
+
+    def test_review_reuses_matching_summary(self, client, survey_request, discussion_template):
+        """Test that review persists a materialized summary without calling the LLM."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            chat_history = record_discussion(survey_request, question)
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.'):
+                update_rolling_summary(survey_request.id, question.id)
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                response = client.post(f'/review/{survey_request.id}', json={
+                    question.id: {'type': 'discussion', 'chat_history': chat_history}
+                })
+            
+            assert response.status_code == 200
+            mock_openai.return_value.chat.completions.create.assert_not_called()
+            assert Response.query.one().discussion_summary == 'Organized summary.'
+
+    def test_review_regenerates_stale_summary(self, client, survey_request, discussion_template):
+        """Test that a summary of a different transcript is not reused."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            chat_history = record_discussion(survey_request, question)
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Old summary.'):
+                update_rolling_summary(survey_request.id, question.id)
+            
+            chat_history.append({'role': 'user', 'content': 'Also great at mentoring'})
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='New summary.'):
+                client.post(f'/review/{survey_request.id}', json={
+                    question.id: {'type': 'discussion', 'chat_history': chat_history}
+                })
+            
+            assert Response.query.one().discussion_summary == 'New summary.'
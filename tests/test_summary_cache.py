@@ -0,0 +1,102 @@
+import pytest
+import unittest.mock
+from datetime import datetime, timedelta
+from models import db, Response, SummaryCache
+from summary_cache import summary_cache_stats, get_cached_summaries, store_summaries, summary_cache_cli
+import app as app_module
+from app import generate_feedback_summaries, discussion_hash
+from tests.test_chat_streaming import discussion_question
+
+CHAT = [{'role': 'user', 'content': 'They unblocked the launch'}]
+
+class TestSummaryCache:
+    def test_unchanged_discussion_reuses_summary(self, client, survey_request, discussion_template):
+        """Test that a discussion saved again after its draft was dropped reuses the summary."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            payload = {question.id: {'type': 'discussion', 'chat_history': CHAT}}
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary', return_value='Organized summary.') as summarize:
+                client.post(f'/review/{survey_request.id}', json=payload)
+                client.post(f'/review/{survey_request.id}', json={})
+                client.post(f'/review/{survey_request.id}', json=payload)
+            
+            assert summarize.call_count == 1
+            assert Response.query.one().discussion_summary == 'Organized summary.'
+            assert SummaryCache.query.one().hits == 1
+
+    def test_counts_hits_and_misses(self, app):
+        """Test the per-process hit and miss counters."""
+        summary_cache_stats.reset()
+        with app.app_context():
+            store_summaries({'a' * 64: 'Cached.'}, max_entries=10)
+            
+            assert get_cached_summaries(['a' * 64, 'b' * 64]) == {'a' * 64: 'Cached.'}
+            assert summary_cache_stats.snapshot() == {'hits': 1, 'misses': 1}
+
+    def test_key_includes_prompt_version(self, app):
+        """Test that bumping the prompt version stops reusing summaries."""
+        with app.app_context():
+            before = discussion_hash('Strengths?', CHAT, False)
+            with unittest.mock.patch.object(app_module, 'SUMMARY_PROMPT_VERSION', '2'):
+                assert discussion_hash('Strengths?', CHAT, False) != before
+            assert discussion_hash('Strengths?', CHAT, True) != before
+
+    def test_fallback_summaries_are_not_cached(self, client, survey_request, discussion_template):
+        """Test that a failed LLM call is retried next time instead of cached."""
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            
+            with unittest.mock.patch('openai.OpenAI', side_effect=Exception("API Error")):
+                client.post(f'/review/{survey_request.id}', json={
+                    question.id: {'type': 'discussion', 'chat_history': CHAT}
+                })
+            
+            assert SummaryCache.query.count() == 0
+
+    def test_least_recently_used_entries_are_evicted(self, app):
+        """Test that the cache stays within max_entries, keeping recent entries."""
+        with app.app_context():
+            store_summaries({'a' * 64: 'A'}, max_entries=2)
+            store_summaries({'b' * 64: 'B'}, max_entries=2)
+            SummaryCache.query.filter_by(content_hash='a' * 64).update({'last_used_at': datetime.utcnow() + timedelta(minutes=1)})
+            db.session.commit()
+            
+            store_summaries({'c' * 64: 'C'}, max_entries=2)
+            
+            assert {row.content_hash[0] for row in SummaryCache.query} == {'a', 'c'}
+
+    def test_generate_summaries_serves_hits_without_llm(self, app):
+        """Test that cached discussions skip the worker pool."""
+        with app.app_context():
+            discussions = {'q1': ('Strengths?', CHAT, False)}
+            store_summaries({discussion_hash(*discussions['q1']): 'Cached.'}, max_entries=10)
+            
+            with unittest.mock.patch.object(app_module, 'generate_feedback_summary') as summarize:
+                assert generate_feedback_summaries(discussions) == {'q1': 'Cached.'}
+            summarize.assert_not_called()
+
+class TestSummaryCacheCli:
+    def test_purge_all(self, app):
+        """Test that purge empties the cache."""
+        with app.app_context():
+            store_summaries({'a' * 64: 'A', 'b' * 64: 'B'}, max_entries=10)
+        
+        result = app.test_cli_runner().invoke(summary_cache_cli, ['purge'])
+        
+        assert 'Purged 2 cached summaries.' in result.output
+        with app.app_context():
+            assert SummaryCache.query.count() == 0
+
+    def test_purge_older_than(self, app):
+        """Test that purge can keep recently used entries."""
+        with app.app_context():
+            store_summaries({'a' * 64: 'A', 'b' * 64: 'B'}, max_entries=10)
+            SummaryCache.query.filter_by(content_hash='a' * 64).update({'last_used_at': datetime.utcnow() - timedelta(days=30)})
+            db.session.commit()
+        
+        result = app.test_cli_runner().invoke(summary_cache_cli, ['purge', '--older-than', '7'])
+        
+        assert 'Purged 1 cached summaries.' in result.output
+        with app.app_context():
+            assert [row.summary for row in SummaryCache.query] == ['B']
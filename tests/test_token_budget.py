@@ -0,0 +1,136 @@
+import pytest
+import unittest.mock
+from models import ChatSummary
+from chat_sessions import conversation_key, record_turn, load_summary
+from token_budget import count_tokens, messages_tokens, compact_history, TokenMetrics, token_metrics
+from tests.test_chat_streaming import discussion_question
+from tests.test_chat_sessions import mock_completion, sent_messages
+
+SYSTEM = [{'role': 'system', 'content': 'You are an interviewer.'}]
+
+def make_history(turns, words=50):
+    history = []
+    for i in range(turns):
+        history.append({'role': 'user', 'content': f"answer {i} " + "detail " * words})
+        history.append({'role': 'assistant', 'content': f"question {i}?"})
+    return history
+
+class TestCompactHistory:
+    def test_counts_tokens(self):
+        """Test that token counts grow with text and ignore empty content."""
+        assert count_tokens('') == 0
+        assert count_tokens('word ' * 100) > count_tokens('word ' * 10) > 0
+
+    def test_history_within_budget_is_unchanged(self):
+        """Test that short chats are sent verbatim without summarizing."""
+        history = make_history(2)
+        summarize = unittest.mock.Mock()
+        
+        result, state, stats = compact_history(SYSTEM, history, 'hi', budget=10000, keep_recent=2, summarize=summarize, state=None)
+        
+        assert result == history
+        assert state is None
+        assert stats['compacted'] is False
+        summarize.assert_not_called()
+
+    def test_older_turns_are_summarized(self):
+        """Test that over-budget chats keep recent turns and summarize the rest."""
+        history = make_history(6)
+        summarize = unittest.mock.Mock(return_value='- earlier points')
+        
+        result, state, stats = compact_history(SYSTEM, history, 'hi', budget=200, keep_recent=4, summarize=summarize, state=None)
+        
+        assert result[0]['role'] == 'system'
+        assert '- earlier points' in result[0]['content']
+        assert result[1:] == history[-4:]
+        assert state == ('- earlier points', 8)
+        summarize.assert_called_once_with(None, history[:8])
+        assert stats['sent_tokens'] < stats['full_tokens']
+        assert stats['sent_tokens'] == messages_tokens(SYSTEM + result) + messages_tokens([{'content': 'hi'}])
+
+    def test_summary_is_updated_incrementally(self):
+        """Test that only messages evicted since the last turn are summarized."""
+        history = make_history(7)
+        summarize = unittest.mock.Mock(return_value='- updated')
+        
+        result, state, _ = compact_history(SYSTEM, history, 'hi', budget=200, keep_recent=4,
+                                           summarize=summarize, state=('- earlier points', 8))
+        
+        summarize.assert_called_once_with('- earlier points', history[8:10])
+        assert state == ('- updated', 10)
+
+    def test_current_summary_is_reused(self):
+        """Test that no summarize call is made when nothing new was evicted."""
+        history = make_history(6)
+        summarize = unittest.mock.Mock()
+        
+        result, state, _ = compact_history(SYSTEM, history, 'hi', budget=200, keep_recent=4,
+                                           summarize=summarize, state=('- earlier points', 8))
+        
+        summarize.assert_not_called()
+        assert state == ('- earlier points', 8)
+
+    def test_rewound_conversation_restarts_summary(self):
+        """Test that a summary covering more than the history is rebuilt."""
+        history = make_history(4)
+        summarize = unittest.mock.Mock(return_value='- fresh')
+        
+        _, state, _ = compact_history(SYSTEM, history, 'hi', budget=200, keep_recent=4,
+                                      summarize=summarize, state=('- stale', 12))
+        
+        summarize.assert_called_once_with(None, history[:4])
+        assert state == ('- fresh', 4)
+
+    def test_metrics_accumulate_per_endpoint(self):
+        """Test that saved tokens are tracked per endpoint."""
+        metrics = TokenMetrics()
+        metrics.record('chat', 500, 200, True)
+        metrics.record('chat', 100, 100, False)
+        
+        assert metrics.snapshot() == {
+            'chat': {'requests': 2, 'compacted': 1, 'prompt_tokens': 300, 'tokens_saved': 300}
+        }
+
+class TestChatCompaction:
+    def test_long_survey_chat_is_compacted_and_summary_stored(self, client, survey_request, discussion_template):
+        """Test that a long server-side chat sends a summary and persists it."""
+        client.application.config['CHAT_TOKEN_BUDGET'] = 300
+        client.application.config['CHAT_KEEP_RECENT_MESSAGES'] = 2
+        with client.application.app_context():
+            question = discussion_question(discussion_template)
+            key = conversation_key('survey', survey_request.id, question.id)
+            for i, message in enumerate(make_history(4)[::2]):
+                record_turn(key, i * 2, message['content'], f"question {i}?")
+            
+            with unittest.mock.patch('openai.OpenAI') as mock_openai:
+                mock_client = mock_completion(mock_openai, "- summary of answers")
+                response = client.post(f'/api/chat/{question.id}', json={
+                    'message': 'One more thing', 'seq': 8, 'feedback_request_id': survey_request.id
+                })
+            
+            assert response.status_code == 200
+            chat_messages = sent_messages(mock_client)
+            assert 'Summary of the earlier conversation' in chat_messages[1]['content']
+            assert [m['content'] for m in chat_messages[2:]] == ['answer 3 ' + 'detail ' * 50, 'question 3?', 'One more thing']
+            assert load_summary(key) == ('- summary of answers', 6)
+
+    def test_summary_falls_back_when_openai_fails(self, app):
+        """Test the extractive summary used without the API."""
+        from app import fallback_chat_summary
+        
+        summary = fallback_chat_summary('- earlier', [
+            {'role': 'user', 'content': 'They mentor juniors'},
+            {'role': 'assistant', 'content': 'Any examples?'}
+        ])
+        
+        assert summary == '- earlier\n- They mentor juniors'
+
+    def test_metrics_endpoint_requires_admin(self, client, dev_user):
+        """Test that token metrics are served to admins."""
+        token_metrics.reset()
+        token_metrics.record('chat', 500, 200, True)
+        
+        response = client.get('/api/metrics/tokens')
+        
+        assert response.status_code == 200
+        assert response.get_json()['chat']['tokens_saved'] == 300
@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime, timedelta
+from models import db, User
+from auth import UserCache, load_user, record_login, user_cache
+from tests.test_dashboard import count_queries
+
+class TestUserLoader:
+    def test_cached_user_loads_without_queries(self, app, dev_user):
+        """Test that a warm cache attaches the user to the session without a query."""
+        with app.app_context():
+            user_id = dev_user.id
+            db.session.expunge_all()
+            load_user(user_id)
+            db.session.expunge_all()
+            
+            with count_queries(app) as statements:
+                user = load_user(user_id)
+                assert user.email == 'dev@example.com'
+                assert user.is_admin
+                assert user in db.session
+            assert statements == []
+
+    def test_permission_changes_invalidate_cache(self, app, dev_user):
+        """Test that updating a user drops their cached row."""
+        with app.app_context():
+            load_user(dev_user.id)
+            user = db.session.get(User, dev_user.id)
+            user.is_admin = False
+            db.session.commit()
+            db.session.expunge_all()
+            
+            assert user_cache.get(dev_user.id) is None
+            assert load_user(dev_user.id).is_admin is False
+
+    def test_unknown_user_is_not_cached(self, app):
+        """Test that missing users return None."""
+        with app.app_context():
+            assert load_user('missing') is None
+            assert user_cache.get('missing') is None
+
+class TestUserCache:
+    def test_entries_expire_and_are_bounded(self, app, dev_user):
+        """Test the TTL and least-recently-used eviction."""
+        with app.app_context():
+            other = User(email='other@example.com', name='Other')
+            db.session.add(other)
+            db.session.commit()
+            
+            cache = UserCache(ttl=60, max_entries=1)
+            cache.put(dev_user)
+            cache.put(other)
+            assert cache.get(dev_user.id) is None
+            assert cache.get(other.id)['email'] == 'other@example.com'
+            
+            expired = UserCache(ttl=0)
+            expired.put(dev_user)
+            assert expired.get(dev_user.id) is None
+
+class TestLastLogin:
+    def test_writes_are_coalesced(self, app, dev_user):
+        """Test that last_login is written at most once per interval."""
+        with app.app_context():
+            user = db.session.get(User, dev_user.id)
+            user.last_login = None
+            db.session.commit()
+            
+            assert record_login(user) is True
+            with count_queries(app) as statements:
+                assert record_login(user) is False
+            assert not [s for s in statements if s.startswith('UPDATE')]
+            
+            user.last_login = datetime.utcnow() - timedelta(seconds=app.config['LAST_LOGIN_INTERVAL'] + 1)
+            assert record_login(user) is True
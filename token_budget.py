@@ -0,0 +1,90 @@
+import math
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+# Tokens the chat format adds around each message
+MESSAGE_OVERHEAD = 4
+
+_encoding = None
+
+def count_tokens(text):
+    """Count the tokens in a string, estimating ~4 characters per token without tiktoken."""
+    global _encoding
+    if not text:
+        return 0
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+def message_tokens(message):
+    """Count the tokens a chat message adds to a prompt."""
+    return MESSAGE_OVERHEAD + count_tokens(message['content'])
+
+def messages_tokens(messages):
+    return sum(message_tokens(m) for m in messages)
+
+class TokenMetrics:
+    """Per-endpoint counters of prompt tokens sent and saved by compaction."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, full_tokens, sent_tokens, compacted):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'compacted': 0, 'prompt_tokens': 0, 'tokens_saved': 0
+            })
+            stats['requests'] += 1
+            stats['compacted'] += int(compacted)
+            stats['prompt_tokens'] += sent_tokens
+            stats['tokens_saved'] += max(full_tokens - sent_tokens, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+token_metrics = TokenMetrics()
+
+def compact_history(prompt_messages, history, user_message, budget, keep_recent, summarize, state=None):
+    """Fit a chat history into a prompt token budget.
+
+    prompt_messages (the system prompt) and the last keep_recent history
+    messages are always kept verbatim. When the full prompt is over budget,
+    older messages are rolled into a summary. state is the previous
+    (summary, covered) pair for this conversation, where covered is how many
+    history messages the summary already includes, so only newly evicted
+    messages are passed to summarize(previous_summary, messages).
+
+    Returns (history_messages, state, stats): the history to send, the new
+    summary state, and a dict of full/sent token counts.
+    """
+    fixed_tokens = messages_tokens(prompt_messages) + message_tokens({'content': user_message})
+    full_tokens = fixed_tokens + messages_tokens(history)
+    if full_tokens <= budget or len(history) <= keep_recent:
+        return history, state, {'full_tokens': full_tokens, 'sent_tokens': full_tokens, 'compacted': False}
+
+    older = history[:len(history) - keep_recent]
+    recent = history[len(history) - keep_recent:]
+
+    summary, covered = state or (None, 0)
+    if covered > len(older):
+        # The conversation was rewound past the summary; start it over
+        summary, covered = None, 0
+    if covered < len(older):
+        summary = summarize(summary, older[covered:])
+        covered = len(older)
+
+    compacted = [{'role': 'system', 'content': f"Summary of the earlier conversation:\n{summary}"}] + recent
+    sent_tokens = fixed_tokens + messages_tokens(compacted)
+    return compacted, (summary, covered), {'full_tokens': full_tokens, 'sent_tokens': sent_tokens, 'compacted': True}
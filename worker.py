@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+"""Background worker for Candidly.
+
+Runs queued LLM jobs (review summaries, coaching guides, summary regeneration)
+so web workers don't block on completions. Start one or more alongside the
+web server when JOB_QUEUE_ENABLED is set.
+"""
+
+import argparse
+from app import create_app
+from jobs import run_worker
+
+def main():
+    """Parse arguments and start processing jobs."""
+    parser = argparse.ArgumentParser(description='Run queued Candidly background jobs.')
+    parser.add_argument('--once', action='store_true', help='Drain runnable jobs and exit')
+    parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to wait when the queue is empty')
+    args = parser.parse_args()
+    
+    app = create_app()
+    print("👷 Candidly worker started" + (" (draining once)" if args.once else ""))
+    try:
+        processed = run_worker(app, poll_interval=args.poll_interval, once=args.once)
+        print(f"✅ Processed {processed} job(s)")
+    except KeyboardInterrupt:
+        print("\n👋 Worker stopped")
+
+if __name__ == '__main__':
+    main()